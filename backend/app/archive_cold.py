@@ -0,0 +1,68 @@
+"""Move cold documents out of the hot collections (see app.services.archive).
+
+Each run archives every collection in ARCHIVE_POLICIES, in the shared and
+every dedicated tenant database, in batches, pausing
+between batches so the primary keeps serving traffic. Safe to stop and re-run
+at any point. With --interval it keeps running (Procfile `archive` process).
+
+Usage: python -m app.archive_cold [--batch-size N] [--pause-ms 200] [--interval SECONDS] [--dry-run]
+"""
+import argparse
+import asyncio
+import logging
+import sys
+import time
+from app.core.config import settings
+from app.db.mongodb import MongoDB
+from app.db.tenancy import tenant_databases
+from app.services.archive import ARCHIVE_POLICIES, archive_batch, count_cold_documents
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def archive_collection(database, collection_name: str, batch_size: int, pause_ms: int) -> int:
+    archived = 0
+    while True:
+        started = time.monotonic()
+        stubbed = await archive_batch(database, collection_name, batch_size,
+                                      compress=settings.ARCHIVE_COMPRESSION)
+        if not stubbed:
+            return archived
+        archived += stubbed
+
+        # Throttle: rest at least as long as the batch took, plus the fixed pause
+        elapsed = time.monotonic() - started
+        await asyncio.sleep(elapsed + pause_ms / 1000)
+
+
+async def main(batch_size: int, pause_ms: int, interval: int = 0, dry_run: bool = False) -> int:
+    await MongoDB.connect_to_mongo()
+    try:
+        while True:
+            for name, database, _ in await tenant_databases():
+                for collection_name, policy in ARCHIVE_POLICIES.items():
+                    if dry_run:
+                        cold = await count_cold_documents(database, collection_name)
+                        logger.info(f"{name}.{collection_name}: {cold} {policy['description']} to archive")
+                        continue
+                    archived = await archive_collection(database, collection_name, batch_size, pause_ms)
+                    logger.info(f"{name}.{collection_name}: archived {archived} {policy['description']}")
+            if not interval:
+                return 0
+            await asyncio.sleep(interval)
+    except Exception as e:
+        logger.error(f"Archival failed: {str(e)}", exc_info=True)
+        return 1
+    finally:
+        await MongoDB.close_mongo_connection()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Archive cold interview links and interviews")
+    parser.add_argument("--batch-size", type=int, default=settings.ARCHIVE_BATCH_SIZE, help="Documents per batch")
+    parser.add_argument("--pause-ms", type=int, default=200, help="Extra pause between batches")
+    parser.add_argument("--interval", type=int, default=0, help="Seconds between runs; run once when omitted")
+    parser.add_argument("--dry-run", action="store_true", help="Only count the documents that would be archived")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args.batch_size, args.pause_ms, args.interval, args.dry_run)))
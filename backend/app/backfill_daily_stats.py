@@ -0,0 +1,40 @@
+"""Rebuild the hr_daily_stats rollup from interview_links and interviews.
+
+The rollup is kept current by increments on every link and interview write;
+run this to build it from history or to repair it, in the shared and every
+dedicated tenant database.
+
+Usage: python -m app.backfill_daily_stats [--hr HR_ID]
+"""
+import argparse
+import asyncio
+import logging
+import sys
+from bson import ObjectId
+from app.db.mongodb import MongoDB
+from app.db.tenancy import tenant_databases
+from app.services.daily_stats import rebuild_daily_stats
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def main(hr_id: str = None) -> int:
+    await MongoDB.connect_to_mongo()
+    try:
+        for name, database, _ in await tenant_databases():
+            written = await rebuild_daily_stats(database, ObjectId(hr_id) if hr_id else None)
+            logger.info(f"{name}: rebuilt {written} daily stats document(s)")
+        return 0
+    except Exception as e:
+        logger.error(f"Backfill failed: {str(e)}", exc_info=True)
+        return 1
+    finally:
+        await MongoDB.close_mongo_connection()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild the HR daily stats rollup")
+    parser.add_argument("--hr", help="Only rebuild this HR user's days")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(hr_id=args.hr)))
@@ -0,0 +1,45 @@
+"""Backfill organization_id on every tenant-owned document.
+
+Migration 8 runs the same backfill and installs validators that only warn.
+Re-run this after the deploy that stamps organization_id on new writes to
+pick up documents written in between; with --enforce the validators start
+rejecting writes without organization_id once nothing is missing.
+
+Usage: python -m app.backfill_organizations [--enforce]
+"""
+import argparse
+import asyncio
+import logging
+import sys
+from app.db.mongodb import MongoDB
+from app.services.organization import backfill_organization_ids, set_organization_validators
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def main(enforce: bool = False) -> int:
+    await MongoDB.connect_to_mongo()
+    try:
+        missing = await backfill_organization_ids(MongoDB.shared_database)
+        remaining = sum(missing.values())
+        if not enforce:
+            return 0
+        if remaining:
+            logger.error(f"{remaining} document(s) still lack organization_id; not enforcing")
+            return 1
+        await set_organization_validators(MongoDB.shared_database, "error")
+        logger.info("Writes without organization_id are now rejected")
+        return 0
+    except Exception as e:
+        logger.error(f"Organization backfill failed: {str(e)}", exc_info=True)
+        return 1
+    finally:
+        await MongoDB.close_mongo_connection()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill organization_id on tenant-owned documents")
+    parser.add_argument("--enforce", action="store_true", help="Reject writes without organization_id afterwards")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(enforce=args.enforce)))
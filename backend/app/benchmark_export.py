@@ -0,0 +1,97 @@
+"""Check that the report export streams in constant memory.
+
+Seeds one HR tenant per size into `<DATABASE_NAME>_bench` (see
+app.benchmark_reports), drains the export stream the endpoint returns, and
+reports time to first chunk, throughput and the peak Python heap while
+streaming. Fails when the peak at the largest size exceeds --max-growth
+times the peak at the smallest. The bench database is dropped afterwards
+unless --keep.
+
+Usage: python -m app.benchmark_export [--sizes 10000,100000,1000000] [--format csv|json] [--compress] [--keep]
+"""
+import argparse
+import asyncio
+import logging
+import sys
+import time
+import tracemalloc
+from app.core.config import settings
+from app.db.mongodb import MongoDB
+from app.db.migrations import apply_migrations
+from app.benchmark_reports import seed_tenant
+from app.services.export import csv_chunks, gzip_chunks, json_chunks
+from app.services.reports import stream_hr_reports
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def drain_export(hr_id: str, export_format: str, compress: bool) -> dict:
+    """Stream one export to nowhere, measuring it like a client would"""
+    tracemalloc.start()
+    started = time.perf_counter()
+    first_chunk_ms = None
+    total_bytes = 0
+    try:
+        reports = await stream_hr_reports(hr_id, "30days", "all", "all", analytics=True)
+        chunks = csv_chunks(reports) if export_format == "csv" else json_chunks(reports, {})
+        if compress:
+            chunks = gzip_chunks(chunks)
+        async for chunk in chunks:
+            if first_chunk_ms is None:
+                first_chunk_ms = (time.perf_counter() - started) * 1000
+            total_bytes += len(chunk)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {
+        "first_chunk_ms": first_chunk_ms,
+        "total_ms": (time.perf_counter() - started) * 1000,
+        "bytes": total_bytes,
+        "peak": peak
+    }
+
+
+async def main(sizes: list, export_format: str, compress: bool, max_growth: float, keep: bool) -> int:
+    await MongoDB.connect_to_mongo()
+    bench_name = f"{settings.DATABASE_NAME}_bench"
+    MongoDB.shared_database = MongoDB.client[bench_name]
+    try:
+        await apply_migrations(MongoDB.database)
+        peaks = []
+        for size in sorted(sizes):
+            hr_id = str(await seed_tenant(MongoDB.database, size))
+            result = await drain_export(hr_id, export_format, compress)
+            peaks.append(result["peak"])
+            logger.info(
+                f"{size:>8} links  first chunk {result['first_chunk_ms']:8.1f} ms"
+                f"  total {result['total_ms'] / 1000:7.1f} s ({size / result['total_ms'] * 1000:8.0f} rows/s)"
+                f"  {result['bytes'] / 2 ** 20:8.1f} MiB out  peak heap {result['peak'] / 2 ** 20:6.1f} MiB"
+            )
+
+        growth = peaks[-1] / peaks[0]
+        if growth > max_growth:
+            logger.error(f"Peak heap grew {growth:.1f}x from {min(sizes)} to {max(sizes)} links")
+            return 1
+        logger.info(f"Peak heap grew {growth:.2f}x from {min(sizes)} to {max(sizes)} links")
+        return 0
+    except Exception as e:
+        logger.error(f"Benchmark failed: {str(e)}", exc_info=True)
+        return 1
+    finally:
+        if not keep:
+            await MongoDB.client.drop_database(bench_name)
+        await MongoDB.close_mongo_connection()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the streaming report export")
+    parser.add_argument("--sizes", default="10000,100000,1000000", help="Comma-separated link counts, one tenant each")
+    parser.add_argument("--format", choices=["csv", "json"], default="csv", help="Export format")
+    parser.add_argument("--compress", action="store_true", help="Gzip the stream like ?compress=true")
+    parser.add_argument("--max-growth", type=float, default=2.0,
+                        help="Largest allowed ratio of peak heap between the largest and smallest size")
+    parser.add_argument("--keep", action="store_true", help="Keep the bench database afterwards")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main([int(s) for s in args.sizes.split(",")], args.format, args.compress,
+                              args.max_growth, args.keep)))
@@ -0,0 +1,115 @@
+"""Time the HR report against a seeded throwaway database.
+
+Seeds one HR tenant per size into `<DATABASE_NAME>_bench`, applies the schema
+migrations there, and reports the median latency of `get_hr_reports` and
+`get_report_stats`. The bench database is dropped afterwards unless --keep.
+
+Usage: python -m app.benchmark_reports [--sizes 1000,10000] [--runs 5] [--keep]
+"""
+import argparse
+import asyncio
+import logging
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from bson import ObjectId
+from app.core.config import settings
+from app.db.mongodb import MongoDB
+from app.db.migrations import apply_migrations
+from app.services.reports import get_hr_reports, get_report_stats
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+SEED_BATCH_SIZE = 5000
+POSITIONS = ["Backend Engineer", "Frontend Engineer", "Data Scientist", "Product Manager"]
+
+
+async def seed_tenant(database, link_count: int) -> ObjectId:
+    """Insert `link_count` links for a new HR user; about 70% are completed with an interview"""
+    hr_id = ObjectId()
+    now = datetime.utcnow()
+
+    for start in range(0, link_count, SEED_BATCH_SIZE):
+        links, interviews = [], []
+        for _ in range(start, min(start + SEED_BATCH_SIZE, link_count)):
+            created_at = now - timedelta(minutes=random.randint(0, 60 * 24 * 25))
+            completed = random.random() < 0.7
+            link = {
+                "_id": ObjectId(),
+                "hr_id": hr_id,
+                "candidate_name": "Bench Candidate",
+                "candidate_email": "bench@example.com",
+                "position": random.choice(POSITIONS),
+                "topic": "System design",
+                "token": ObjectId().binary.hex(),
+                "expires_at": created_at + timedelta(days=7),
+                "completed": completed,
+                "sent_count": 1,
+                "created_at": created_at,
+                "updated_at": created_at
+            }
+            links.append(link)
+            if completed:
+                interviews.append({
+                    "link_id": link["_id"],
+                    "hr_id": hr_id,
+                    "position": link["position"],
+                    "topic": link["topic"],
+                    "duration": random.randint(600, 3600),
+                    "knowledge_score": random.uniform(40, 100),
+                    "communication_score": random.uniform(40, 100),
+                    "confidence_score": random.uniform(40, 100),
+                    "responses": [{"question": "q", "response": "r" * 500}] * 5,
+                    "created_at": created_at
+                })
+        await database.interview_links.insert_many(links, ordered=False)
+        if interviews:
+            await database.interviews.insert_many(interviews, ordered=False)
+
+    return hr_id
+
+
+async def time_call(func, *args, runs: int) -> float:
+    """Median wall time of `runs` calls, in milliseconds"""
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        await func(*args)
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+async def main(sizes: list, runs: int, keep: bool) -> int:
+    await MongoDB.connect_to_mongo()
+    bench_name = f"{settings.DATABASE_NAME}_bench"
+    MongoDB.shared_database = MongoDB.client[bench_name]
+    try:
+        await apply_migrations(MongoDB.database)
+        for size in sizes:
+            hr_id = str(await seed_tenant(MongoDB.database, size))
+            reports_ms = await time_call(get_hr_reports, hr_id, "30days", "all", "all", runs=runs)
+            stats_ms = await time_call(get_report_stats, hr_id, "30days", "all", "all", runs=runs)
+            logger.info(
+                f"{size:>7} links  reports {reports_ms:8.1f} ms ({reports_ms / size * 1000:6.1f} us/link)"
+                f"  stats {stats_ms:8.1f} ms"
+            )
+        return 0
+    except Exception as e:
+        logger.error(f"Benchmark failed: {str(e)}", exc_info=True)
+        return 1
+    finally:
+        if not keep:
+            await MongoDB.client.drop_database(bench_name)
+        await MongoDB.close_mongo_connection()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the HR report query")
+    parser.add_argument("--sizes", default="100,1000,10000", help="Comma-separated link counts, one tenant each")
+    parser.add_argument("--runs", type=int, default=5, help="Timed runs per size")
+    parser.add_argument("--keep", action="store_true", help="Keep the bench database afterwards")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main([int(s) for s in args.sizes.split(",")], args.runs, args.keep)))
@@ -5,6 +5,7 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from app.core.config import settings
 from app.core.security import verify_password
+from app.db.tenancy import bind_tenant, organization_id_of
 from app.services.user import get_user_by_email
 from app.schemas.user import User
 import logging
@@ -45,6 +46,8 @@ async def get_current_user(token: str = Depends(oauth2_scheme)) -> User:
         if not user:
             raise credentials_exception
 
+        # Everything the request reads or writes after this is scoped to the user's organization
+        await bind_tenant(organization_id_of(user))
         return user
     except JWTError:
         raise credentials_exception
\ No newline at end of file
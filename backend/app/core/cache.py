@@ -1,7 +1,9 @@
+from collections import OrderedDict
 from functools import wraps
 import json
+import time
 from typing import Any, Callable
-import aioredis
+from redis import asyncio as aioredis
 import logging
 from app.core.config import settings
 
@@ -19,7 +21,11 @@ class Cache:
     async def init_redis(self):
         if not self._redis:
             try:
-                self._redis = await aioredis.from_url(settings.REDIS_URL)
+                self._redis = aioredis.from_url(
+                    settings.REDIS_URL,
+                    max_connections=settings.REDIS_MAX_CONNECTIONS
+                )
+                await self._redis.ping()
                 logger.info("Redis connection established")
             except Exception as e:
                 logger.error(f"Failed to connect to Redis: {str(e)}")
@@ -28,6 +34,7 @@ class Cache:
     async def close(self):
         if self._redis:
             await self._redis.close()
+            self._redis = None
             logger.info("Redis connection closed")
 
     async def get(self, key: str) -> Any:
@@ -40,12 +47,13 @@ class Cache:
             logger.error(f"Cache get error: {str(e)}")
             return None
 
-    async def set(self, key: str, value: Any, expire: int = None) -> bool:
+    async def set(self, key: str, value: Any, expire: int = None, nx: bool = False) -> bool:
+        """Store a value; with `nx` the key is only written if it is absent."""
         if not self._redis:
             return False
         try:
-            await self._redis.set(key, json.dumps(value), ex=expire or settings.CACHE_TTL)
-            return True
+            result = await self._redis.set(key, json.dumps(value), ex=expire or settings.CACHE_TTL, nx=nx)
+            return bool(result)
         except Exception as e:
             logger.error(f"Cache set error: {str(e)}")
             return False
@@ -62,6 +70,37 @@ class Cache:
 
 cache = Cache()
 
+
+class NegativeCache:
+    """Bounded in-process set of keys known not to exist, each kept for `ttl` seconds.
+
+    The oldest entries are evicted first, so memory stays constant no matter
+    how many distinct keys are probed.
+    """
+
+    def __init__(self, max_size: int, ttl: int):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+
+    def contains(self, key: str) -> bool:
+        expires_at = self._entries.get(key)
+        if expires_at is None:
+            return False
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return False
+        return True
+
+    def add(self, key: str):
+        self._entries[key] = time.monotonic() + self.ttl
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def discard(self, key: str):
+        self._entries.pop(key, None)
+
 def cached(prefix: str = "", expire: int = None):
     def decorator(func: Callable):
         @wraps(func)
@@ -14,6 +14,11 @@ class Settings(BaseSettings):
     MONGODB_URL: str = "mongodb://localhost:27017"
     DATABASE_NAME: str = "ai_interviewer"
 
+    # Interview link tokens: signed tokens embed the link id and expiry and are
+    # verified without a database lookup; opaque legacy tokens keep working
+    SIGNED_INTERVIEW_TOKENS: bool = True
+    INTERVIEW_TOKEN_SECRET: str = ""  # Falls back to SECRET_KEY
+
     # Frontend URL for interview links
     FRONTEND_URL: str = os.getenv("FRONTEND_URL", "https://hiresphere-pi.vercel.app")
 
@@ -24,6 +29,9 @@ class Settings(BaseSettings):
     MONGODB_CONNECT_TIMEOUT_MS: int = 2000
     MONGODB_SERVER_SELECTION_TIMEOUT_MS: int = 2000
 
+    # Compare the recorded schema version with the code on worker startup
+    SCHEMA_CHECK_ON_STARTUP: bool = True
+
     # Interview settings
     DEFAULT_QUESTION_COUNT: int = 5
     MIN_QUESTION_COUNT: int = 3
@@ -42,6 +50,16 @@ class Settings(BaseSettings):
     RATE_LIMIT_BURST: int = int(os.getenv("RATE_LIMIT_BURST", "10"))
     RATE_LIMIT_STORAGE: str = "memory"  # Options: memory, redis
 
+    # Public interview token abuse shield: clients whose lookups mostly miss
+    # get a progressively lower per-minute limit on the public routes
+    PUBLIC_TOKEN_MIN_MISSES: int = 10
+    PUBLIC_TOKEN_MISS_RATIO: float = 0.5
+    PUBLIC_TOKEN_PENALTY_PER_MINUTE: int = 8
+    PUBLIC_TOKEN_PENALTY_SECONDS: int = 900
+    PUBLIC_TOKEN_SHIELD_MAX_CLIENTS: int = 10000
+    NEGATIVE_TOKEN_CACHE_SIZE: int = 10000
+    NEGATIVE_TOKEN_CACHE_TTL: int = 300  # seconds
+
     # Redis settings (for rate limiting and caching)
     REDIS_URL: str = os.getenv("REDIS_URL", "redis://localhost:6379")
     REDIS_MAX_CONNECTIONS: int = 100
@@ -49,6 +67,54 @@ class Settings(BaseSettings):
     # Cache settings
     CACHE_TTL: int = 300  # 5 minutes
     CACHE_ENABLED: bool = True
+    LINK_CACHE_TTL: int = 60  # seconds, public interview link metadata keyed by token
+    ETAG_TIME_BUCKET_SECONDS: int = 60  # Revalidation window for payloads with time-derived fields
+
+    # List pagination (keyset cursors, newest first); requests with neither
+    # limit nor cursor get the whole list, as before pagination existed
+    DEFAULT_PAGE_SIZE: int = 50
+    MAX_PAGE_SIZE: int = 200
+
+    # Search: words are indexed by every prefix up to this length and as a
+    # whole, so longer query words must be complete words
+    SEARCH_PREFIX_MAX_LENGTH: int = 12
+
+    # Hot/cold tiering: cold documents move to "<collection>_archive" and
+    # leave a stub behind (python -m app.archive_cold)
+    ARCHIVE_EXPIRED_LINKS_AFTER_DAYS: int = 30
+    ARCHIVE_INTERVIEWS_AFTER_DAYS: int = 365
+    ARCHIVE_BATCH_SIZE: int = 500
+    ARCHIVE_COMPRESSION: bool = True  # zlib-compress archived documents
+
+    # Analytics read profile: heavy reports read from secondaries within a
+    # staleness bound and time budget, falling back to their last result
+    ANALYTICS_READ_FROM_SECONDARIES: bool = True
+    ANALYTICS_MAX_STALENESS_SECONDS: int = 120  # At least 90; -1 for no bound
+    ANALYTICS_MAX_TIME_MS: int = 5000
+    ANALYTICS_EXPORT_MAX_TIME_MS: int = 30000
+    ANALYTICS_BATCH_SIZE: int = 200
+    ANALYTICS_CACHE_TTL: int = 86400  # seconds the last complete result is kept as a fallback
+
+    # Seconds an organization's dedicated database routing is cached per worker
+    TENANT_ROUTING_CACHE_TTL: int = 60
+
+    # Interview analysis persists per-response results in batches: after this
+    # many results, or this many seconds after the first unsaved one
+    ANALYSIS_FLUSH_EVERY: int = 5
+    ANALYSIS_FLUSH_INTERVAL: float = 10
+
+    # Endpoints are cancelled after this many seconds, or as soon as the client
+    # disconnects; Mongo and LLM calls get the remaining time (0 disables)
+    REQUEST_DEADLINE_SECONDS: float = 28  # Just under the 30s router timeout
+
+    # Per-request Mongo command profiling: counts go out in Server-Timing and
+    # X-DB-* headers; requests over a threshold are logged at the sample rate
+    # (keep 1.0 in development, lower it in production)
+    DB_PROFILER_ENABLED: bool = True
+    DB_PROFILER_HEADERS: bool = True
+    DB_PROFILER_COMMAND_THRESHOLD: int = 30
+    DB_PROFILER_REPEAT_THRESHOLD: int = 5  # Identical query shapes in one request
+    DB_PROFILER_SAMPLE_RATE: float = 1.0
 
     # LLM timeout settings
     LLM_REQUEST_TIMEOUT: int = 120  # seconds
@@ -0,0 +1,84 @@
+import asyncio
+import logging
+import time
+from contextvars import ContextVar
+from typing import Callable, Optional
+import pymongo
+from fastapi import HTTPException, Request, Response
+from fastapi.routing import APIRoute
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Monotonic deadline of the current request; None outside a request
+_request_deadline: ContextVar[Optional[float]] = ContextVar("request_deadline", default=None)
+
+# Non-standard status used by proxies for "client closed request"
+CLIENT_CLOSED_REQUEST = 499
+
+
+def remaining_seconds(default: float) -> float:
+    """Time left for an outbound call: `default`, capped by the request deadline"""
+    deadline = _request_deadline.get()
+    if deadline is None:
+        return default
+    return max(min(default, deadline - time.monotonic()), 0.001)
+
+
+async def _wait_for_disconnect(request: Request):
+    while True:
+        message = await request.receive()
+        if message["type"] == "http.disconnect":
+            return
+
+
+class DeadlineRoute(APIRoute):
+    """Runs each endpoint under a deadline and stops it when the client goes away.
+
+    The deadline is visible to every Mongo operation through pymongo.timeout,
+    which sends the remaining time as maxTimeMS, and to outbound calls through
+    `remaining_seconds`. Background tasks and streamed bodies run after the
+    endpoint returns and are not limited.
+    """
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+
+        async def deadline_handler(request: Request) -> Response:
+            seconds = settings.REQUEST_DEADLINE_SECONDS
+            if not seconds:
+                return await handler(request)
+
+            # Buffer the body first so the disconnect watcher can own receive()
+            await request.body()
+
+            token = _request_deadline.set(time.monotonic() + seconds)
+            try:
+                # The task copies the context, so both deadlines go with it
+                with pymongo.timeout(seconds):
+                    work = asyncio.ensure_future(handler(request))
+            finally:
+                _request_deadline.reset(token)
+            disconnect = asyncio.ensure_future(_wait_for_disconnect(request))
+
+            try:
+                done, _ = await asyncio.wait(
+                    {work, disconnect}, timeout=seconds, return_when=asyncio.FIRST_COMPLETED
+                )
+            except asyncio.CancelledError:
+                work.cancel()
+                raise
+            finally:
+                disconnect.cancel()
+            if work in done:
+                return work.result()
+
+            work.cancel()
+            await asyncio.gather(work, return_exceptions=True)
+            if disconnect in done:
+                logger.info(f"Client disconnected, cancelled {request.method} {request.url.path}")
+                return Response(status_code=CLIENT_CLOSED_REQUEST)
+            logger.warning(f"Deadline of {seconds}s exceeded, cancelled {request.method} {request.url.path}")
+            raise HTTPException(status_code=504, detail="The request took too long to complete")
+
+        return deadline_handler
@@ -0,0 +1,36 @@
+import hashlib
+import time
+from fastapi import Request, Response
+from app.core.config import settings
+
+
+def compute_etag(*parts, time_sensitive: bool = False) -> str:
+    """Build a weak ETag from the given version parts.
+
+    Payloads with fields derived from the current time (such as `is_expired`)
+    also include a coarse time bucket so they are revalidated periodically.
+    """
+    if time_sensitive:
+        parts = parts + (int(time.time()) // settings.ETAG_TIME_BUCKET_SECONDS,)
+    digest = hashlib.sha1(":".join(str(part) for part in parts).encode()).hexdigest()
+    return f'W/"{digest}"'
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates or etag.removeprefix("W/") in candidates
+
+
+def not_modified_response(etag: str) -> Response:
+    return Response(
+        status_code=304,
+        headers={"ETag": etag, "Cache-Control": "private, no-cache"}
+    )
+
+
+def set_etag_headers(response: Response, etag: str):
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "private, no-cache"
@@ -0,0 +1,129 @@
+import base64
+from datetime import datetime, timedelta
+from typing import Optional
+from bson import ObjectId
+from bson.errors import InvalidId
+from fastapi import HTTPException, Response, status
+from app.core.config import settings
+from app.db.mongodb import db
+
+# Lists are ordered newest first; _id breaks ties between equal timestamps
+KEYSET_SORT = [("created_at", -1), ("_id", -1)]
+
+EPOCH = datetime(1970, 1, 1)
+
+
+def encode_cursor(doc: dict) -> str:
+    """Opaque cursor pointing just after `doc` in KEYSET_SORT order"""
+    # created_at is a naive UTC datetime with millisecond precision, as stored in Mongo
+    millis = (doc["created_at"] - EPOCH) // timedelta(milliseconds=1)
+    raw = f"{millis}:{doc['_id']}"
+    return base64.urlsafe_b64encode(raw.encode()).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> tuple:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        millis, object_id = base64.urlsafe_b64decode(padded.encode()).decode().split(":")
+        return EPOCH + timedelta(milliseconds=int(millis)), ObjectId(object_id)
+    except (ValueError, InvalidId, UnicodeDecodeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+
+
+def keyset_filter(cursor: Optional[str]) -> dict:
+    """Filter selecting the documents that follow `cursor`"""
+    if not cursor:
+        return {}
+    created_at, object_id = decode_cursor(cursor)
+    return {
+        "$or": [
+            {"created_at": {"$lt": created_at}},
+            {"created_at": created_at, "_id": {"$lt": object_id}}
+        ]
+    }
+
+
+def apply_keyset(query: dict, cursor: Optional[str]) -> dict:
+    after = keyset_filter(cursor)
+    return {"$and": [query, after]} if after else query
+
+
+def _page_limit(limit: Optional[int], cursor: Optional[str]) -> Optional[int]:
+    """None means the whole list: clients that predate pagination send neither"""
+    if limit is None and cursor:
+        return settings.DEFAULT_PAGE_SIZE
+    return limit
+
+
+def _single_page(docs: list, include_total: bool) -> dict:
+    return {"items": docs, "next_cursor": None, "total": len(docs) if include_total else None}
+
+
+async def paginate(collection, query: dict, limit: Optional[int], cursor: Optional[str] = None,
+                   projection: Optional[dict] = None, include_total: bool = False) -> dict:
+    """Fetch one page of `query` in KEYSET_SORT order.
+
+    One extra document is read to tell whether another page exists, so the
+    cost of a page is independent of its position in the collection. Without
+    `limit` and `cursor` the whole list is returned as a single page.
+    """
+    limit = _page_limit(limit, cursor)
+    if limit is None:
+        docs = await db.execute_with_retry(
+            lambda: collection.find(query, projection).sort(KEYSET_SORT).to_list(length=None)
+        )
+        return _single_page(docs, include_total)
+
+    docs = await db.execute_with_retry(
+        lambda: collection.find(apply_keyset(query, cursor), projection)
+        .sort(KEYSET_SORT).limit(limit + 1).to_list(length=limit + 1)
+    )
+    has_more = len(docs) > limit
+    docs = docs[:limit]
+
+    return {
+        "items": docs,
+        "next_cursor": encode_cursor(docs[-1]) if has_more else None,
+        "total": await db.execute_with_retry(lambda: collection.count_documents(query)) if include_total else None
+    }
+
+
+async def paginate_aggregate(collection, query: dict, limit: Optional[int], cursor: Optional[str] = None,
+                             stages: Optional[list] = None, include_total: bool = False) -> dict:
+    """Like `paginate`, but runs `stages` on the page before returning it.
+
+    The page is cut before `stages` run, so joins only touch `limit + 1`
+    documents. `stages` must keep one output per input and must not drop
+    `created_at` or `_id`, which the next cursor is built from.
+    """
+    limit = _page_limit(limit, cursor)
+    if limit is None:
+        pipeline = [{"$match": query}, {"$sort": dict(KEYSET_SORT)}, *(stages or [])]
+        docs = await db.execute_with_retry(lambda: collection.aggregate(pipeline).to_list(length=None))
+        return _single_page(docs, include_total)
+
+    pipeline = [
+        {"$match": apply_keyset(query, cursor)},
+        {"$sort": dict(KEYSET_SORT)},
+        {"$limit": limit + 1},
+        *(stages or [])
+    ]
+    docs = await db.execute_with_retry(lambda: collection.aggregate(pipeline).to_list(length=limit + 1))
+    has_more = len(docs) > limit
+    docs = docs[:limit]
+
+    return {
+        "items": docs,
+        "next_cursor": encode_cursor(docs[-1]) if has_more else None,
+        "total": await db.execute_with_retry(lambda: collection.count_documents(query)) if include_total else None
+    }
+
+
+def set_pagination_headers(response: Response, page: dict):
+    if page["next_cursor"]:
+        response.headers["X-Next-Cursor"] = page["next_cursor"]
+    if page["total"] is not None:
+        response.headers["X-Total-Count"] = str(page["total"])
@@ -1,13 +1,21 @@
 from fastapi import HTTPException, Request
 import time
 import asyncio
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
 import logging
 from app.core.config import settings
 from app.core.cache import cache
 
 logger = logging.getLogger(__name__)
 
+# Clients whose address is unknown (no peer, e.g. some test or ASGI servers) share one bucket
+UNKNOWN_CLIENT = "unknown"
+
+
+def client_address(request: Request) -> str:
+    """The client's IP; behind the proxy uvicorn takes it from X-Forwarded-For (see Procfile)"""
+    return request.client.host if request.client else UNKNOWN_CLIENT
+
 
 class RateLimiter:
     def __init__(self):
@@ -22,7 +30,7 @@ class RateLimiter:
 
     async def _check_rate_limit_redis(self, request: Request):
         try:
-            client_ip = request.client.host
+            client_ip = client_address(request)
             key = f"rate_limit:{client_ip}"
 
             async with cache._redis.pipeline() as pipe:
@@ -49,7 +57,7 @@ class RateLimiter:
 
     async def _check_rate_limit_memory(self, request: Request):
         async with self.lock:
-            client_ip = request.client.host
+            client_ip = client_address(request)
             current_time = time.time()
 
             # Remove old requests
@@ -69,4 +77,67 @@ class RateLimiter:
             self.requests[client_ip].append(current_time)
 
 
-rate_limiter = RateLimiter()
\ No newline at end of file
+rate_limiter = RateLimiter()
+
+
+class PublicTokenShield:
+    """Per-client rate limit for the unauthenticated token routes.
+
+    Each client gets a fixed one-minute window counting requests and token
+    lookup misses. Once a window is mostly misses the client is put on a
+    penalty limit for PUBLIC_TOKEN_PENALTY_SECONDS, halved on every repeat
+    offence. Client state is kept in a bounded LRU map.
+    """
+
+    def __init__(self, max_clients: int):
+        self.max_clients = max_clients
+        self.clients = OrderedDict()
+
+    def _state(self, client_ip: str, now: float) -> dict:
+        state = self.clients.get(client_ip)
+        if state is None:
+            state = {"window_start": now, "requests": 0, "hits": 0, "misses": 0,
+                     "flagged": False, "penalty_level": 0, "penalty_until": 0.0}
+            self.clients[client_ip] = state
+            while len(self.clients) > self.max_clients:
+                self.clients.popitem(last=False)
+        self.clients.move_to_end(client_ip)
+
+        if now - state["window_start"] >= 60:
+            if now >= state["penalty_until"]:
+                state["penalty_level"] = 0
+            state.update(window_start=now, requests=0, hits=0, misses=0, flagged=False)
+        return state
+
+    def _limit(self, state: dict, now: float) -> int:
+        if state["penalty_level"] and now < state["penalty_until"]:
+            return max(1, settings.PUBLIC_TOKEN_PENALTY_PER_MINUTE >> (state["penalty_level"] - 1))
+        return settings.RATE_LIMIT_PER_MINUTE
+
+    async def check(self, request: Request):
+        now = time.monotonic()
+        state = self._state(client_address(request), now)
+        if state["requests"] >= self._limit(state, now):
+            raise HTTPException(
+                status_code=429,
+                detail="Too many requests"
+            )
+        state["requests"] += 1
+
+    def record(self, request: Request, found: bool):
+        now = time.monotonic()
+        state = self._state(client_address(request), now)
+        state["hits" if found else "misses"] += 1
+
+        # Escalate at most once per window
+        misses = state["misses"]
+        if (not state["flagged"] and misses >= settings.PUBLIC_TOKEN_MIN_MISSES
+                and misses / (misses + state["hits"]) >= settings.PUBLIC_TOKEN_MISS_RATIO):
+            state["flagged"] = True
+            state["penalty_level"] = min(state["penalty_level"] + 1, 4)
+            state["penalty_until"] = now + settings.PUBLIC_TOKEN_PENALTY_SECONDS
+            logger.warning(f"Public token lookups from {client_address(request)} are mostly misses, "
+                           f"penalty level {state['penalty_level']}")
+
+
+public_token_shield = PublicTokenShield(settings.PUBLIC_TOKEN_SHIELD_MAX_CLIENTS)
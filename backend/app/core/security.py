@@ -1,9 +1,52 @@
+import base64
+import hashlib
+import hmac
+import re
+from datetime import datetime, timezone
+from typing import Optional, Tuple
+from bson import ObjectId
 from passlib.context import CryptContext
+from app.core.config import settings
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Opaque tokens issued by secrets.token_urlsafe(16) before signed tokens existed
+LEGACY_LINK_TOKEN_PATTERN = re.compile(r"^[A-Za-z0-9_-]{22}$")
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
\ No newline at end of file
+    return pwd_context.hash(password)
+
+def _sign_link_token(payload: str) -> str:
+    key = (settings.INTERVIEW_TOKEN_SECRET or settings.SECRET_KEY).encode()
+    digest = hmac.new(key, payload.encode(), hashlib.sha256).digest()[:16]
+    return base64.urlsafe_b64encode(digest).rstrip(b"=").decode()
+
+def create_interview_link_token(link_id: str, expires_at: datetime) -> str:
+    """Create a `<link id>.<expiry>.<hmac>` token that can be checked without the database.
+
+    Changing a link's expiry re-issues its token (see update_interview_link).
+    """
+    # Naive datetimes are UTC, as stored in Mongo; aware ones are converted
+    if expires_at.tzinfo is None:
+        expires_at = expires_at.replace(tzinfo=timezone.utc)
+    payload = f"{link_id}.{int(expires_at.astimezone(timezone.utc).timestamp()):x}"
+    return f"{payload}.{_sign_link_token(payload)}"
+
+def is_signed_interview_link_token(token: str) -> bool:
+    return "." in token
+
+def verify_interview_link_token(token: str) -> Optional[Tuple[str, datetime]]:
+    """Return the link id and naive UTC expiry of a signed token, or None if it is malformed or forged."""
+    parts = token.split(".")
+    if len(parts) != 3 or not ObjectId.is_valid(parts[0]):
+        return None
+    payload = f"{parts[0]}.{parts[1]}"
+    if not hmac.compare_digest(_sign_link_token(payload), parts[2]):
+        return None
+    try:
+        return parts[0], datetime.utcfromtimestamp(int(parts[1], 16))
+    except (ValueError, OverflowError):
+        return None
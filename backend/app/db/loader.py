@@ -0,0 +1,101 @@
+import asyncio
+from contextvars import ContextVar
+from typing import Optional
+from bson import ObjectId
+from app.db.mongodb import db
+
+# Loaders of the current request, keyed by collection name; None outside a request
+_request_loaders: ContextVar[Optional[dict]] = ContextVar("request_loaders", default=None)
+
+
+class DataLoader:
+    """Batches by-id lookups on one collection.
+
+    Every `load` made in the same event-loop tick is answered by a single
+    `$in` query. Results, including misses, are memoized for the rest of the
+    request, so callers get a shallow copy they are free to mutate.
+    """
+
+    def __init__(self, collection_name: str):
+        self.collection_name = collection_name
+        self._results = {}
+        self._pending = {}
+
+    async def load(self, object_id) -> Optional[dict]:
+        object_id = ObjectId(object_id)
+        future = self._results.get(object_id)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._results[object_id] = future
+            if not self._pending:
+                loop.call_soon(lambda: asyncio.ensure_future(self._dispatch()))
+            self._pending[object_id] = future
+
+        doc = await asyncio.shield(future)
+        return dict(doc) if doc is not None else None
+
+    async def load_many(self, object_ids) -> list:
+        return await asyncio.gather(*(self.load(object_id) for object_id in object_ids))
+
+    def forget(self, object_id):
+        """Drop a memoized document after it was written"""
+        self._results.pop(ObjectId(object_id), None)
+
+    async def _dispatch(self):
+        batch, self._pending = self._pending, {}
+        try:
+            docs = await db.execute_with_retry(
+                lambda: db.database[self.collection_name].find({"_id": {"$in": list(batch)}}).to_list(length=None)
+            )
+            found = {doc["_id"]: doc for doc in docs}
+            for object_id, future in batch.items():
+                future.set_result(found.get(object_id))
+        except Exception as e:
+            for object_id, future in batch.items():
+                # Failed lookups are not memoized; a later load retries
+                self._results.pop(object_id, None)
+                future.set_exception(e)
+
+
+def get_loader(collection_name: str) -> Optional[DataLoader]:
+    loaders = _request_loaders.get()
+    if loaders is None:
+        return None
+    if collection_name not in loaders:
+        loaders[collection_name] = DataLoader(collection_name)
+    return loaders[collection_name]
+
+
+async def load_by_id(collection_name: str, object_id) -> Optional[dict]:
+    """Fetch a document by _id, batched and memoized when inside a request"""
+    loader = get_loader(collection_name)
+    if loader is None:
+        return await db.execute_with_retry(
+            lambda: db.database[collection_name].find_one({"_id": ObjectId(object_id)})
+        )
+    return await loader.load(object_id)
+
+
+def forget_loaded(collection_name: str, object_id):
+    loader = get_loader(collection_name)
+    if loader is not None:
+        loader.forget(object_id)
+
+
+class DataLoaderMiddleware:
+    """Gives every HTTP request its own set of loaders"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = _request_loaders.set({})
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _request_loaders.reset(token)
@@ -0,0 +1,237 @@
+from datetime import datetime, timedelta
+import logging
+from pymongo import IndexModel, ReturnDocument
+from pymongo.errors import DuplicateKeyError, OperationFailure
+from app.services.archive import backfill_question_stats
+from app.services.daily_stats import rebuild_daily_stats
+from app.services.hr_stats import reconcile_hr_counters
+from app.services.link_routes import route_database_links
+from app.services.organization import backfill_organization_ids, set_organization_validators
+from app.services.search import SEARCH_FIELDS, backfill_search_prefixes, search_indexes
+
+logger = logging.getLogger(__name__)
+
+# Applied versions are recorded as {_id: <version>} documents; the lock is {_id: "lock"}
+MIGRATIONS_COLLECTION = "schema_migrations"
+LOCK_TTL = timedelta(minutes=30)
+
+MIGRATIONS = []
+
+
+def migration(version: int, description: str):
+    """Register a schema migration. Versions must be unique and increasing."""
+    def decorator(func):
+        MIGRATIONS.append({"version": version, "description": description, "apply": func})
+        MIGRATIONS.sort(key=lambda m: m["version"])
+        return func
+    return decorator
+
+
+@migration(1, "Baseline indexes")
+async def create_baseline_indexes(database):
+    await database.users.create_indexes([
+        IndexModel("email", unique=True),
+        IndexModel([("organization_id", 1), ("role", 1)]),
+        IndexModel([("created_by", 1), ("role", 1)]),
+    ])
+    await database.organizations.create_indexes([IndexModel("name")])
+    await database.interviews.create_indexes([
+        IndexModel([("user_id", 1), ("created_at", -1)]),
+        IndexModel([("organization_id", 1), ("created_at", -1)]),
+    ])
+    await database.candidates.create_indexes([
+        IndexModel([("hr_id", 1), ("created_at", -1)]),
+        IndexModel([("organization_id", 1), ("created_at", -1)]),
+    ])
+    await database.interview_links.create_indexes([
+        IndexModel("token", unique=True),
+        IndexModel([("hr_id", 1), ("created_at", -1)]),
+        IndexModel([("organization_id", 1), ("created_at", -1)]),
+    ])
+    await database.subscriptions.create_indexes([IndexModel([("organization_id", 1), ("status", 1)])])
+
+
+@migration(2, "Hot-path indexes for reports, dashboards and subscriptions")
+async def create_hot_path_indexes(database):
+    await database.interviews.create_indexes([
+        IndexModel("link_id"),
+        IndexModel([("hr_id", 1), ("completed", 1), ("created_at", -1)]),
+        IndexModel("candidate_id"),
+    ])
+    await database.subscriptions.create_indexes([IndexModel([("user_id", 1), ("status", 1)])])
+    await database.activity_logs.create_indexes([IndexModel([("created_at", -1)])])
+
+
+async def _drop_index_if_exists(collection, name: str):
+    try:
+        await collection.drop_index(name)
+    except OperationFailure as e:
+        if e.code != 27:  # IndexNotFound
+            raise
+
+
+@migration(3, "Keyset pagination indexes with an _id tiebreaker")
+async def create_keyset_indexes(database):
+    await database.candidates.create_indexes([IndexModel([("hr_id", 1), ("created_at", -1), ("_id", -1)])])
+    await database.interview_links.create_indexes([IndexModel([("hr_id", 1), ("created_at", -1), ("_id", -1)])])
+    await database.interviews.create_indexes([IndexModel([("user_id", 1), ("created_at", -1), ("_id", -1)])])
+    await database.users.create_indexes([IndexModel([("role", 1), ("created_at", -1), ("_id", -1)])])
+    await database.subscriptions.create_indexes([IndexModel([("created_at", -1), ("_id", -1)])])
+
+    # The new indexes cover every query the old (owner, created_at) ones served
+    await _drop_index_if_exists(database.candidates, "hr_id_1_created_at_-1")
+    await _drop_index_if_exists(database.interview_links, "hr_id_1_created_at_-1")
+    await _drop_index_if_exists(database.interviews, "user_id_1_created_at_-1")
+
+
+@migration(4, "Index admin-scoped HR listings")
+async def create_scoped_hr_listing_index(database):
+    await database.users.create_indexes([
+        IndexModel([("created_by", 1), ("role", 1), ("created_at", -1), ("_id", -1)])
+    ])
+
+    # HR listings are always scoped to the creating admin now
+    await _drop_index_if_exists(database.users, "created_by_1_role_1")
+    await _drop_index_if_exists(database.users, "role_1_created_at_-1__id_-1")
+
+
+@migration(5, "Backfill per-HR headline counters")
+async def backfill_hr_counters(database):
+    repaired = await reconcile_hr_counters(database)
+    logger.info(f"Backfilled counters for {repaired} HR stats document(s)")
+
+
+@migration(6, "Backfill the hr_daily_stats rollup")
+async def backfill_daily_stats(database):
+    written = await rebuild_daily_stats(database)
+    logger.info(f"Backfilled {written} daily stats document(s)")
+
+
+@migration(7, "Index the cold-document scans of the archiver")
+async def create_archive_indexes(database):
+    # Stubs carry archived_at, so the scans only walk documents still in the hot tier
+    await database.interview_links.create_indexes([
+        IndexModel([("archived_at", 1), ("completed", 1), ("expires_at", 1)])
+    ])
+    await database.interviews.create_indexes([IndexModel([("archived_at", 1), ("created_at", 1)])])
+
+
+@migration(8, "Backfill organization_id on tenant-owned documents")
+async def backfill_organizations(database):
+    # organization_id is the shard key prefix; the validators only warn until
+    # `python -m app.backfill_organizations --enforce` confirms nothing is missing
+    await backfill_organization_ids(database)
+    await set_organization_validators(database, "warn")
+
+
+@migration(9, "Search indexes for candidates and interview links")
+async def create_search_indexes(database):
+    for collection_name in SEARCH_FIELDS:
+        updated = await backfill_search_prefixes(database, collection_name)
+        logger.info(f"Backfilled search prefixes on {updated} {collection_name} document(s)")
+        await database[collection_name].create_indexes(search_indexes(collection_name))
+
+
+@migration(10, "Route the link tokens of organizations on dedicated databases")
+async def route_dedicated_link_tokens(database):
+    # Only the shared database lists organizations; dedicated ones have none to route
+    async for organization in database.organizations.find({"database": {"$type": "string"}}, {"database": 1}):
+        name = organization["database"]
+        routed = await route_database_links(database, database.client[name], name,
+                                            {"organization_id": organization["_id"]})
+        logger.info(f"Routed {routed} link token(s) of organization {organization['_id']} to {name}")
+
+
+@migration(11, "Index the per-organization subscription listing")
+async def create_organization_subscription_index(database):
+    await database.subscriptions.create_indexes([
+        IndexModel([("organization_id", 1), ("created_at", -1), ("_id", -1)])
+    ])
+
+
+@migration(12, "Replace the unused completed-interviews index with the dashboard's")
+async def replace_completed_interviews_index(database):
+    # Interviews have no `completed` field; reports read the rollups instead
+    await _drop_index_if_exists(database.interviews, "hr_id_1_completed_1_created_at_-1")
+    await database.interviews.create_indexes([
+        IndexModel([("organization_id", 1), ("hr_id", 1), ("created_at", -1)])
+    ])
+
+
+@migration(13, "Keep question stats on archived interview stubs")
+async def backfill_archived_question_stats(database):
+    updated = await backfill_question_stats(database)
+    logger.info(f"Backfilled question stats on {updated} archived interview(s)")
+
+
+def latest_schema_version() -> int:
+    return MIGRATIONS[-1]["version"] if MIGRATIONS else 0
+
+
+async def get_applied_versions(database) -> set:
+    cursor = database[MIGRATIONS_COLLECTION].find({"_id": {"$type": "int"}}, {"_id": 1})
+    return {doc["_id"] async for doc in cursor}
+
+
+async def get_schema_version(database) -> int:
+    latest = await database[MIGRATIONS_COLLECTION].find_one(
+        {"_id": {"$type": "int"}},
+        {"_id": 1},
+        sort=[("_id", -1)]
+    )
+    return latest["_id"] if latest else 0
+
+
+async def _acquire_lock(database) -> bool:
+    now = datetime.utcnow()
+    try:
+        lock = await database[MIGRATIONS_COLLECTION].find_one_and_update(
+            {"_id": "lock", "expires_at": {"$lt": now}},
+            {"$set": {"expires_at": now + LOCK_TTL, "acquired_at": now}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        return lock is not None
+    except DuplicateKeyError:
+        # The lock document exists and has not expired
+        return False
+
+
+async def _release_lock(database):
+    await database[MIGRATIONS_COLLECTION].delete_one({"_id": "lock"})
+
+
+async def apply_migrations(database) -> list:
+    """Apply every pending migration in order and return the versions applied."""
+    if not await _acquire_lock(database):
+        raise Exception("Another migration run holds the lock")
+
+    applied_now = []
+    try:
+        applied = await get_applied_versions(database)
+        for entry in MIGRATIONS:
+            if entry["version"] in applied:
+                continue
+            logger.info(f"Applying migration {entry['version']}: {entry['description']}")
+            await entry["apply"](database)
+            await database[MIGRATIONS_COLLECTION].insert_one({
+                "_id": entry["version"],
+                "description": entry["description"],
+                "applied_at": datetime.utcnow()
+            })
+            applied_now.append(entry["version"])
+    finally:
+        await _release_lock(database)
+
+    return applied_now
+
+
+async def check_schema_version(database) -> bool:
+    """Cheap startup check: one indexed read comparing the recorded version with the code."""
+    current = await get_schema_version(database)
+    latest = latest_schema_version()
+    if current < latest:
+        logger.warning(
+            f"Database schema is at version {current}, code expects {latest}; run `python -m app.migrate`")
+        return False
+    return True
@@ -1,22 +1,119 @@
-from motor.motor_asyncio import AsyncIOMotorClient
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
 from app.core.config import settings
+from app.db.profiler import command_profiler
 import logging
+from contextvars import ContextVar
 from typing import Optional
 import asyncio
-from pymongo.errors import ConnectionFailure, ServerSelectionTimeoutError, NetworkTimeout
+from pymongo import monitoring
+from pymongo.errors import ConnectionFailure, ServerSelectionTimeoutError, NetworkTimeout, OperationFailure, \
+    PyMongoError
 
 logger = logging.getLogger(__name__)
 
+RETRYABLE_ERROR_LABELS = ("RetryableWriteError", "RetryableReadError", "TransientTransactionError")
+
+
+class ConnectionHealth(monitoring.ServerHeartbeatListener, monitoring.TopologyListener):
+    """Tracks whether a writable server is known, from the driver's own monitoring.
+
+    The monitors heartbeat every server in the background (heartbeatFrequencyMS),
+    so health is known without sending anything on the request path. Callbacks
+    run on the driver's monitor threads and only assign plain attributes.
+    """
+
+    def __init__(self):
+        self.healthy = False
+        self.last_heartbeat_failure = None
+
+    def opened(self, event):
+        pass
+
+    def closed(self, event):
+        self.healthy = False
+
+    def description_changed(self, event):
+        healthy = event.new_description.has_writable_server()
+        if healthy != self.healthy:
+            logger.info(f"MongoDB {'has' if healthy else 'lost'} a writable server "
+                        f"({event.new_description.topology_type_name})")
+        self.healthy = healthy
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        self.last_heartbeat_failure = str(event.reply)
+        logger.warning(f"MongoDB heartbeat to {event.connection_id} failed: {event.reply}")
+
+
+connection_health = ConnectionHealth()
+
+# Dedicated database of the current request's tenant, set by app.db.tenancy.bind_tenant
+routed_database: ContextVar[Optional[str]] = ContextVar("routed_database", default=None)
+
+# Collections that are never tenant-owned and always stay in the shared database
+GLOBAL_COLLECTIONS = {
+    "users", "organizations", "settings", "subscription_plans", "activity_logs", "schema_migrations",
+    "interview_link_routes"
+}
+
+
+class TenantRoutedDatabase:
+    """The shared database with tenant collections redirected to a dedicated one"""
+
+    def __init__(self, shared: AsyncIOMotorDatabase, dedicated: AsyncIOMotorDatabase):
+        self._shared = shared
+        self._dedicated = dedicated
+
+    def _route(self, name: str) -> AsyncIOMotorDatabase:
+        return self._shared if name in GLOBAL_COLLECTIONS else self._dedicated
+
+    def __getitem__(self, name: str):
+        return self._route(name)[name]
+
+    def __getattr__(self, name: str):
+        if name.startswith("_") or hasattr(AsyncIOMotorDatabase, name):
+            return getattr(self._shared, name)
+        return self._route(name)[name]
+
+    def get_collection(self, name: str, **kwargs):
+        return self._route(name).get_collection(name, **kwargs)
+
+
+class _DatabaseRouter:
+    """`db.database`: the shared database, routed per tenant inside a bound request.
+
+    Class-level access (`MongoDB.database`, used by the CLIs) is never routed.
+    """
+
+    def __get__(self, obj, owner):
+        shared = owner.shared_database
+        name = routed_database.get()
+        if obj is None or shared is None or not name:
+            return shared
+        return TenantRoutedDatabase(shared, owner.client[name])
+
 
 class MongoDB:
     client: Optional[AsyncIOMotorClient] = None
-    database = None
+    shared_database = None
+    database = _DatabaseRouter()
     _connect_lock = asyncio.Lock()
     _max_retries = 3
     _retry_delay = 1  # seconds
+    _transactions_supported = True
 
     @classmethod
-    async def connect_to_mongo(cls):
+    async def connect_to_mongo(cls, verify: bool = True):
+        """Create the client; with `verify`, ping the server before returning.
+
+        Indexes and other schema changes are applied by `python -m app.migrate`,
+        not on connect.
+        """
         if cls.client is not None:
             return
 
@@ -41,16 +138,15 @@ class MongoDB:
                         heartbeatFrequencyMS=15000,  # Increased from 10000ms to 15000ms
                         retryWrites=True,
                         retryReads=True,
+                        event_listeners=[connection_health, command_profiler],
                     )
 
                     # Test the connection
-                    await cls.client.admin.command('ping')
+                    if verify:
+                        await cls.client.admin.command('ping')
 
-                    cls.database = cls.client[settings.DATABASE_NAME]
+                    cls.shared_database = cls.client[settings.DATABASE_NAME]
                     logger.info("Connected to MongoDB successfully")
-
-                    # Create indexes
-                    await cls.create_indexes()
                     return
                 except (ConnectionFailure, ServerSelectionTimeoutError, NetworkTimeout) as e:
                     retries += 1
@@ -70,7 +166,7 @@ class MongoDB:
             if cls.client is not None:
                 cls.client.close()
                 cls.client = None
-                cls.database = None
+                cls.shared_database = None
                 logger.info("MongoDB connection closed")
         except Exception as e:
             logger.error(f"Error closing MongoDB connection: {str(e)}")
@@ -82,62 +178,75 @@ class MongoDB:
         return cls.database
 
     @classmethod
-    async def create_indexes(cls):
-        try:
-            # Create indexes for frequently queried collections
-            await cls.database.users.create_index("email", unique=True)
-            await cls.database.users.create_index([("organization_id", 1), ("role", 1)])
-            await cls.database.users.create_index([("created_by", 1), ("role", 1)])
-
-            await cls.database.organizations.create_index("name")
-
-            await cls.database.interviews.create_index([("user_id", 1), ("created_at", -1)])
-            await cls.database.interviews.create_index([("organization_id", 1), ("created_at", -1)])
-
-            await cls.database.candidates.create_index([("hr_id", 1), ("created_at", -1)])
-            await cls.database.candidates.create_index([("organization_id", 1), ("created_at", -1)])
-
-            await cls.database.interview_links.create_index("token", unique=True)
-            await cls.database.interview_links.create_index([("hr_id", 1), ("created_at", -1)])
-            await cls.database.interview_links.create_index([("organization_id", 1), ("created_at", -1)])
-
-            await cls.database.subscriptions.create_index([("organization_id", 1), ("status", 1)])
-
-            logger.info("MongoDB indexes created successfully")
-        except Exception as e:
-            logger.error(f"Failed to create MongoDB indexes: {str(e)}")
-            raise
+    async def run_in_transaction(cls, callback):
+        """Run `await callback(session)` in a transaction and return its result.
+
+        `with_transaction` retries the whole callback on TransientTransactionError
+        and the commit on UnknownTransactionCommitResult. Standalone servers have
+        no transactions; there the callback runs once with session=None, so it
+        must order its writes to be safe without one.
+        """
+        if cls._transactions_supported:
+            try:
+                async with await cls.client.start_session() as session:
+                    return await session.with_transaction(callback)
+            except OperationFailure as e:
+                if e.code != 20:  # IllegalOperation: transactions need a replica set
+                    raise
+                logger.warning("Transactions are not supported by this deployment, running without")
+                cls._transactions_supported = False
+        return await callback(None)
 
     @classmethod
     async def ensure_connected(cls):
-        """Ensure database connection is active, reconnect if necessary"""
+        """Make sure a client exists; only ping when the monitors saw no usable server"""
         if cls.client is None:
             await cls.connect_to_mongo()
             return
 
+        if connection_health.healthy:
+            return
         try:
-            # Test connection with ping
             await cls.client.admin.command('ping')
-        except (ConnectionFailure, ServerSelectionTimeoutError, NetworkTimeout):
-            logger.warning("MongoDB connection lost, attempting to reconnect...")
-            cls.client = None
-            await cls.connect_to_mongo()
+        except (ConnectionFailure, ServerSelectionTimeoutError, NetworkTimeout) as e:
+            logger.warning(f"MongoDB is unreachable: {str(e)}")
+            raise
 
     @classmethod
-    async def execute_with_retry(cls, operation):
-        """Execute a database operation with retry logic"""
+    async def execute_with_retry(cls, operation, idempotent: bool = True):
+        """Run `await operation()`, retrying errors that are safe to retry.
+
+        The driver already retries a read or write once (retryReads,
+        retryWrites); this covers longer outages such as an election. Reads
+        and idempotent writes retry on network errors and retryable error
+        labels. Other writes only retry when the server reports that nothing
+        was written. Operations whose deadline ran out are never retried.
+        """
         retries = 0
-        while retries < cls._max_retries:
+        while True:
             try:
                 await cls.ensure_connected()
                 return await operation()
-            except (ConnectionFailure, ServerSelectionTimeoutError, NetworkTimeout) as e:
+            except PyMongoError as e:
                 retries += 1
-                if retries >= cls._max_retries:
-                    logger.error(f"Operation failed after {cls._max_retries} attempts: {str(e)}")
+                if retries >= cls._max_retries or not is_retryable_error(e, idempotent):
+                    if retries > 1:
+                        logger.error(f"Operation failed after {retries} attempts: {str(e)}")
                     raise
-                logger.warning(f"Operation attempt {retries} failed, retrying in {cls._retry_delay} seconds...")
+                logger.warning(f"Operation attempt {retries} failed, retrying in {cls._retry_delay * retries} seconds...")
                 await asyncio.sleep(cls._retry_delay * retries)
 
 
+def is_retryable_error(error: PyMongoError, idempotent: bool = True) -> bool:
+    if getattr(error, "timeout", False):
+        return False
+    if error.has_error_label("NoWritesPerformed"):
+        return True
+    if not idempotent:
+        return False
+    return isinstance(error, ConnectionFailure) or any(
+        error.has_error_label(label) for label in RETRYABLE_ERROR_LABELS
+    )
+
+
 db = MongoDB()
\ No newline at end of file
@@ -0,0 +1,158 @@
+import json
+import logging
+import random
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Optional
+from pymongo import monitoring
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Continuations and housekeeping: counted, but never a repeated query
+UNSHAPED_COMMANDS = {"getMore", "killCursors", "endSessions", "commitTransaction", "abortTransaction"}
+
+# Parts of a command that make up its shape; values are replaced by "?"
+SHAPE_FIELDS = ("filter", "sort", "projection", "pipeline", "query", "updates", "deletes", "key")
+
+
+def query_shape(value):
+    """`value` with every literal replaced by "?", so equal shapes compare equal"""
+    if isinstance(value, dict):
+        return {key: query_shape(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        shapes = []
+        for item in value:
+            shape = query_shape(item)
+            if shape not in shapes:
+                shapes.append(shape)
+        return shapes
+    return "?"
+
+
+def command_shape(event) -> Optional[str]:
+    if event.command_name in UNSHAPED_COMMANDS:
+        return None
+    command = event.command
+    shape = {field: query_shape(command[field]) for field in SHAPE_FIELDS if field in command}
+    return f"{event.command_name} {command.get(event.command_name)} {json.dumps(shape, sort_keys=True)}"
+
+
+class RequestProfile:
+    """Mongo commands issued on behalf of one request.
+
+    Commands run on Motor's executor threads, which copy the request context,
+    so several threads may record into the same profile at once.
+    """
+
+    def __init__(self):
+        self.commands = 0
+        self.duration_micros = 0
+        self.shapes = Counter()
+        self._lock = threading.Lock()
+
+    def record_started(self, shape: Optional[str]):
+        with self._lock:
+            self.commands += 1
+            if shape:
+                self.shapes[shape] += 1
+
+    def record_finished(self, duration_micros: int):
+        with self._lock:
+            self.duration_micros += duration_micros
+
+    @property
+    def duration_ms(self) -> float:
+        return self.duration_micros / 1000
+
+    @property
+    def repeated(self) -> int:
+        """Commands that repeated an identical shape issued earlier in the request"""
+        return sum(count - 1 for count in self.shapes.values())
+
+    def is_offender(self) -> bool:
+        most_repeated = max(self.shapes.values(), default=0)
+        return (self.commands >= settings.DB_PROFILER_COMMAND_THRESHOLD
+                or most_repeated >= settings.DB_PROFILER_REPEAT_THRESHOLD)
+
+
+_request_profile: ContextVar[Optional[RequestProfile]] = ContextVar("request_profile", default=None)
+
+
+class CommandProfiler(monitoring.CommandListener):
+    """Attributes every command to the profile of the request that issued it"""
+
+    def started(self, event):
+        profile = _request_profile.get()
+        if profile is not None:
+            profile.record_started(command_shape(event))
+
+    def succeeded(self, event):
+        profile = _request_profile.get()
+        if profile is not None:
+            profile.record_finished(event.duration_micros)
+
+    def failed(self, event):
+        profile = _request_profile.get()
+        if profile is not None:
+            profile.record_finished(event.duration_micros)
+
+
+command_profiler = CommandProfiler()
+
+
+def current_profile() -> Optional[RequestProfile]:
+    return _request_profile.get()
+
+
+def _profile_headers(profile: RequestProfile) -> list:
+    return [
+        (b"server-timing", f'db;dur={profile.duration_ms:.1f};desc="{profile.commands} commands"'.encode()),
+        (b"x-db-commands", str(profile.commands).encode()),
+        (b"x-db-repeated-commands", str(profile.repeated).encode()),
+    ]
+
+
+def _log_offender(scope, profile: RequestProfile, elapsed: float):
+    top = ", ".join(f"{count}x {shape}" for shape, count in profile.shapes.most_common(3) if count > 1)
+    logger.warning(
+        f"{scope['method']} {scope['path']} issued {profile.commands} Mongo commands "
+        f"({profile.duration_ms:.1f}ms of {elapsed * 1000:.0f}ms in the database)"
+        + (f"; repeated: {top}" if top else "")
+    )
+
+
+class CommandProfilerMiddleware:
+    """Counts the Mongo commands of every HTTP request.
+
+    The counts go out in Server-Timing and X-DB-* response headers. Requests
+    over the command or repeat thresholds are logged, sampled at
+    DB_PROFILER_SAMPLE_RATE. Commands issued by background tasks count
+    towards the request that scheduled them but miss its headers.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.DB_PROFILER_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile()
+        token = _request_profile.set(profile)
+        started = time.monotonic()
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start" and settings.DB_PROFILER_HEADERS:
+                message["headers"] = [*message.get("headers", []), *_profile_headers(profile)]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            _request_profile.reset(token)
+            if profile.is_offender() and random.random() < settings.DB_PROFILER_SAMPLE_RATE:
+                _log_offender(scope, profile, time.monotonic() - started)
@@ -0,0 +1,200 @@
+from datetime import datetime, timedelta
+from bson import ObjectId
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Plan stages that mean a query is not served by an index
+REJECTED_STAGES = {"COLLSCAN", "SORT"}
+
+_id = ObjectId()
+_since = datetime.utcnow() - timedelta(days=30)
+_after = {"$or": [{"created_at": {"$lt": _since}}, {"created_at": _since, "_id": {"$lt": _id}}]}
+
+# The application's hot query shapes. Values are placeholders: only the shape
+# matters to the planner. Every entry must be answered by an index without an
+# in-memory sort; run `python -m app.verify_indexes` after changing queries.
+QUERY_SHAPES = [
+    {
+        "name": "candidates by HR, newest first",
+        "collection": "candidates",
+        "filter": {"hr_id": _id},
+        "sort": {"created_at": -1, "_id": -1}
+    },
+    {
+        "name": "candidates by HR, page after a cursor",
+        "collection": "candidates",
+        "filter": {"$and": [{"hr_id": _id}, _after]},
+        "sort": {"created_at": -1, "_id": -1}
+    },
+    {
+        "name": "interview links by HR, newest first",
+        "collection": "interview_links",
+        "filter": {"hr_id": _id},
+        "sort": {"created_at": -1, "_id": -1}
+    },
+    {
+        "name": "interview links by HR, page after a cursor",
+        "collection": "interview_links",
+        "filter": {"$and": [{"hr_id": _id}, _after]},
+        "sort": {"created_at": -1, "_id": -1}
+    },
+    {
+        "name": "interview link by token",
+        "collection": "interview_links",
+        "filter": {"token": "token"}
+    },
+    {
+        "name": "HR report links in a date window",
+        "collection": "interview_links",
+        "filter": {"hr_id": _id, "created_at": {"$gte": _since}, "completed": True},
+        "sort": {"created_at": -1}
+    },
+    {
+        "name": "interview by link",
+        "collection": "interviews",
+        "filter": {"link_id": _id}
+    },
+    {
+        "name": "recent HR interviews (dashboard)",
+        "collection": "interviews",
+        "filter": {"organization_id": _id, "hr_id": _id},
+        "sort": {"created_at": -1}
+    },
+    {
+        "name": "interviews by candidate ($lookup from candidates)",
+        "collection": "interviews",
+        "filter": {"candidate_id": _id}
+    },
+    {
+        "name": "user interview history, newest first",
+        "collection": "interviews",
+        "filter": {"user_id": str(_id)},
+        "sort": {"created_at": -1, "_id": -1}
+    },
+    {
+        "name": "user interview history, page after a cursor",
+        "collection": "interviews",
+        "filter": {"$and": [{"user_id": str(_id)}, _after]},
+        "sort": {"created_at": -1, "_id": -1}
+    },
+    {
+        "name": "all subscriptions, newest first",
+        "collection": "subscriptions",
+        "filter": {},
+        "sort": {"created_at": -1, "_id": -1}
+    },
+    {
+        "name": "subscription by user",
+        "collection": "subscriptions",
+        "filter": {"user_id": _id}
+    },
+    {
+        "name": "active subscription by user",
+        "collection": "subscriptions",
+        "filter": {"user_id": _id, "status": "active"}
+    },
+    {
+        "name": "user by email",
+        "collection": "users",
+        "filter": {"email": "user@example.com"}
+    },
+    {
+        "name": "HR accounts created by an admin",
+        "collection": "users",
+        "filter": {"created_by": _id, "role": "hr"}
+    },
+    {
+        "name": "HR accounts created by an admin, newest first",
+        "collection": "users",
+        "filter": {"created_by": _id, "role": "hr"},
+        "sort": {"created_at": -1, "_id": -1}
+    },
+    {
+        "name": "HR accounts created by an admin, page after a cursor",
+        "collection": "users",
+        "filter": {"$and": [{"created_by": _id, "role": "hr"}, _after]},
+        "sort": {"created_at": -1, "_id": -1}
+    },
+    {
+        "name": "candidate search by word prefix, newest first",
+        "collection": "candidates",
+        "filter": {"organization_id": _id, "hr_id": _id, "search_prefixes": "jo"},
+        "sort": {"created_at": -1, "_id": -1}
+    },
+    {
+        "name": "candidate search by word prefix, page after a cursor",
+        "collection": "candidates",
+        "filter": {"$and": [{"organization_id": _id, "search_prefixes": {"$all": ["jo", "sm"]}}, _after]},
+        "sort": {"created_at": -1, "_id": -1}
+    },
+    {
+        "name": "interview link search by word prefix, newest first",
+        "collection": "interview_links",
+        "filter": {"organization_id": _id, "hr_id": _id, "search_prefixes": "jo"},
+        "sort": {"created_at": -1, "_id": -1}
+    },
+    # Text-mode search sorts its matches in memory and is not listed here
+    {
+        "name": "cold interview links (archiver)",
+        "collection": "interview_links",
+        "filter": {"archived_at": None, "completed": {"$ne": True}, "expires_at": {"$lt": _since}}
+    },
+    {
+        "name": "cold interviews (archiver)",
+        "collection": "interviews",
+        "filter": {"archived_at": None, "created_at": {"$lt": _since}}
+    },
+    {
+        "name": "organization subscriptions, newest first",
+        "collection": "subscriptions",
+        "filter": {"organization_id": _id},
+        "sort": {"created_at": -1, "_id": -1}
+    },
+    {
+        "name": "recent activity logs",
+        "collection": "activity_logs",
+        "filter": {"created_at": {"$gte": _since}},
+        "sort": {"created_at": -1}
+    },
+]
+
+
+def find_rejected_stages(plan) -> list:
+    """Collect the rejected stages of a winning plan, walking nested input stages"""
+    found = []
+    if isinstance(plan, dict):
+        if plan.get("stage") in REJECTED_STAGES:
+            found.append(plan["stage"])
+        for key, value in plan.items():
+            if key != "rejectedPlans":
+                found.extend(find_rejected_stages(value))
+    elif isinstance(plan, list):
+        for item in plan:
+            found.extend(find_rejected_stages(item))
+    return found
+
+
+async def explain_query_shape(database, shape: dict) -> dict:
+    command = {"find": shape["collection"], "filter": shape["filter"]}
+    if shape.get("sort"):
+        command["sort"] = shape["sort"]
+    # Run on the database holding the collection, which for a tenant-routed
+    # database is the dedicated one rather than the shared one
+    owner = database[shape["collection"]].database
+    explain = await owner.command({"explain": command, "verbosity": "queryPlanner"})
+    return explain["queryPlanner"]["winningPlan"]
+
+
+async def verify_query_shapes(database) -> list:
+    """Explain every registered shape and return the ones that fall back to scans or sorts"""
+    failures = []
+    for shape in QUERY_SHAPES:
+        plan = await explain_query_shape(database, shape)
+        stages = find_rejected_stages(plan)
+        if stages:
+            logger.error(f"{shape['name']}: {', '.join(sorted(set(stages)))}")
+            failures.append({"name": shape["name"], "stages": stages})
+        else:
+            logger.info(f"{shape['name']}: ok")
+    return failures
@@ -0,0 +1,84 @@
+import time
+from contextvars import ContextVar
+from typing import Optional
+from bson import ObjectId
+from app.core.config import settings
+from app.db.mongodb import TenantRoutedDatabase, db, routed_database
+
+# Every document in these collections carries the owning organization_id,
+# the intended shard key prefix. A user's organization is their
+# organization_id, or their own _id for accounts that never joined one.
+TENANT_COLLECTIONS = ("candidates", "interview_links", "interviews", "subscriptions")
+
+# Organization of the current request; None outside a request and in CLIs
+_current_organization: ContextVar[Optional[ObjectId]] = ContextVar("current_organization", default=None)
+
+# organization_id -> (dedicated database name or None, expires at)
+_database_names = {}
+
+
+def organization_id_of(user) -> ObjectId:
+    return ObjectId(user.organization_id or user.id)
+
+
+async def dedicated_database_name(organization_id) -> Optional[str]:
+    """The dedicated database of an organization, cached for TENANT_ROUTING_CACHE_TTL"""
+    organization_id = ObjectId(organization_id)
+    cached = _database_names.get(organization_id)
+    if cached and cached[1] > time.monotonic():
+        return cached[0]
+    organization = await db.database.organizations.find_one({"_id": organization_id}, {"database": 1})
+    name = (organization or {}).get("database")
+    _database_names[organization_id] = (name, time.monotonic() + settings.TENANT_ROUTING_CACHE_TTL)
+    return name
+
+
+async def tenant_databases() -> list:
+    """(name, database, user filter) for the shared and every dedicated database.
+
+    For the maintenance CLIs: each database routes tenant collections like a
+    request of its tenants would, and the user filter selects the users
+    whose tenant data lives there.
+    """
+    shared = db.shared_database
+    organizations = {}
+    async for organization in shared.organizations.find({"database": {"$type": "string"}}, {"database": 1}):
+        organizations.setdefault(organization["database"], []).append(organization["_id"])
+
+    moved = [organization_id for ids in organizations.values() for organization_id in ids]
+    targets = [(shared.name, shared, {"organization_id": {"$nin": moved}})]
+    for name, organization_ids in organizations.items():
+        targets.append((
+            name,
+            TenantRoutedDatabase(shared, db.client[name]),
+            {"organization_id": {"$in": organization_ids}}
+        ))
+    return targets
+
+
+async def bind_tenant(organization_id):
+    """Scope the rest of the current request to an organization.
+
+    Tenant queries get its organization_id, and when it has a dedicated
+    database, `db.database` routes tenant collections there.
+    """
+    if not organization_id:
+        return
+    organization_id = ObjectId(organization_id)
+    _current_organization.set(organization_id)
+    routed_database.set(await dedicated_database_name(organization_id))
+
+
+def current_organization_id() -> Optional[ObjectId]:
+    return _current_organization.get()
+
+
+def tenant_fields() -> dict:
+    """Fields stamped on every new tenant-owned document"""
+    organization_id = _current_organization.get()
+    return {"organization_id": organization_id} if organization_id else {}
+
+
+def tenant_filter(query: dict) -> dict:
+    """`query` scoped to the current organization, so it targets a single shard"""
+    return {**tenant_fields(), **query}
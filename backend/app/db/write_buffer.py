@@ -0,0 +1,73 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class CoalescedUpdate:
+    """Collects `$set` fields for one document and writes them together.
+
+    Staged fields are flushed in a single update once `max_pending` results
+    were staged, or `max_delay` seconds after the first unflushed one, so
+    readers still see progress while a slow producer runs. `drain` hands
+    what is left to a caller that folds it into its own final write.
+    `on_write` is awaited after every write that landed.
+    """
+
+    def __init__(self, collection, filter: dict, max_pending: int, max_delay: float,
+                 on_write: Optional[Callable[[], Awaitable]] = None):
+        self.collection = collection
+        self.filter = filter
+        self.max_pending = max_pending
+        self.max_delay = max_delay
+        self.on_write = on_write
+        self.writes = 0
+        self._fields = {}
+        self._pending = 0
+        self._timer = None
+        self._lock = asyncio.Lock()
+
+    async def set(self, fields: dict):
+        self._fields.update(fields)
+        self._pending += 1
+        if self._pending >= self.max_pending:
+            await self.flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(
+                self.max_delay, lambda: asyncio.ensure_future(self._flush_on_timer())
+            )
+
+    async def flush(self):
+        fields = self._take()
+        if not fields:
+            return
+        async with self._lock:
+            try:
+                await self.collection.update_one(self.filter, {"$set": fields})
+                self.writes += 1
+            except Exception:
+                # Keep the fields for the next write; newer values win
+                self._fields = {**fields, **self._fields}
+                raise
+        if self.on_write:
+            await self.on_write()
+
+    async def drain(self) -> dict:
+        """Take the unflushed fields, after any flush in progress has landed"""
+        async with self._lock:
+            return self._take()
+
+    def _take(self) -> dict:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        fields, self._fields, self._pending = self._fields, {}, 0
+        return fields
+
+    async def _flush_on_timer(self):
+        self._timer = None
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.warning(f"Deferred flush failed, retrying with the next write: {str(e)}")
@@ -0,0 +1,50 @@
+"""Apply pending schema migrations. Runs once per deploy (Procfile release phase).
+
+Each dedicated tenant database keeps its own schema_migrations and is migrated
+after the shared one.
+
+Usage: python -m app.migrate [--status]
+"""
+import argparse
+import asyncio
+import logging
+import sys
+from app.db.mongodb import MongoDB
+from app.db.tenancy import tenant_databases
+from app.db.migrations import MIGRATIONS, apply_migrations, get_applied_versions
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def main(status_only: bool = False) -> int:
+    await MongoDB.connect_to_mongo()
+    try:
+        for name, _, _ in await tenant_databases():
+            # Unrouted, so schema_migrations is this database's own
+            database = MongoDB.client[name]
+            if status_only:
+                applied = await get_applied_versions(database)
+                for entry in MIGRATIONS:
+                    state = "applied" if entry["version"] in applied else "pending"
+                    logger.info(f"{name}: {entry['version']:>4}  {state:<8} {entry['description']}")
+                continue
+
+            applied_now = await apply_migrations(database)
+            if applied_now:
+                logger.info(f"{name}: applied migrations: {', '.join(str(v) for v in applied_now)}")
+            else:
+                logger.info(f"{name}: database schema is up to date")
+        return 0
+    except Exception as e:
+        logger.error(f"Migration failed: {str(e)}", exc_info=True)
+        return 1
+    finally:
+        await MongoDB.close_mongo_connection()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Apply pending schema migrations")
+    parser.add_argument("--status", action="store_true", help="List migrations and whether they are applied")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(status_only=args.status)))
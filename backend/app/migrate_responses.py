@@ -0,0 +1,65 @@
+"""Convert interview responses from index-keyed objects to arrays (schema version 2).
+
+Runs online: documents are converted in small batches in _id order, pausing
+between batches so the migration never saturates the primary. Safe to stop
+and re-run at any point; converted documents are skipped. Covers the shared
+and every dedicated tenant database.
+
+Usage: python -m app.migrate_responses [--batch-size 500] [--pause-ms 200] [--max-batches N]
+"""
+import argparse
+import asyncio
+import logging
+import sys
+import time
+from app.db.mongodb import MongoDB
+from app.db.tenancy import tenant_databases
+from app.services.interview import migrate_responses_batch, unmigrated_interviews_query
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def migrate_database(name: str, database, batch_size: int, pause_ms: int, max_batches: int) -> int:
+    remaining = await database.interviews.count_documents(unmigrated_interviews_query())
+    logger.info(f"{name}: {remaining} interview(s) to convert")
+
+    converted, batches, last_id = 0, 0, None
+    while True:
+        started = time.monotonic()
+        modified, last_id = await migrate_responses_batch(database, last_id, batch_size)
+        if last_id is None:
+            break
+        converted += modified
+        batches += 1
+        logger.info(f"{name}: batch {batches}: converted {modified}, {converted} in total")
+        if max_batches and batches >= max_batches:
+            break
+
+        # Throttle: rest at least as long as the batch took, plus the fixed pause
+        elapsed = time.monotonic() - started
+        await asyncio.sleep(elapsed + pause_ms / 1000)
+    return converted
+
+
+async def main(batch_size: int, pause_ms: int, max_batches: int = 0) -> int:
+    await MongoDB.connect_to_mongo()
+    try:
+        for name, database, _ in await tenant_databases():
+            converted = await migrate_database(name, database, batch_size, pause_ms, max_batches)
+            logger.info(f"{name}: converted {converted} interview(s)")
+        return 0
+    except Exception as e:
+        logger.error(f"Response migration failed: {str(e)}", exc_info=True)
+        return 1
+    finally:
+        await MongoDB.close_mongo_connection()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert interview responses to arrays")
+    parser.add_argument("--batch-size", type=int, default=500, help="Interviews per batch")
+    parser.add_argument("--pause-ms", type=int, default=200, help="Extra pause between batches")
+    parser.add_argument("--max-batches", type=int, default=0, help="Stop after this many batches per database (0: no limit)")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args.batch_size, args.pause_ms, args.max_batches)))
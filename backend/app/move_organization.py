@@ -0,0 +1,114 @@
+"""Move one organization's data into a dedicated database on the same cluster.
+
+Large tenants get their own database so their collections can be sized,
+backed up and sharded on their own. Steps:
+
+1. Create the target's indexes and copy the tenant's documents into it.
+2. Route the tenant's link tokens, and record the database on the
+   organization, so `db.database` routes the tenant's requests there once
+   each process's routing cache expires.
+3. Wait out the cache TTL, copy and route whatever was written in the meantime.
+4. Delete the tenant's documents from the shared database.
+
+Run it in a maintenance window for the tenant: writes landing in the shared
+database after step 3 are lost with step 4.
+
+Usage: python -m app.move_organization --organization ID --database NAME [--dry-run]
+"""
+import argparse
+import asyncio
+import logging
+import sys
+from bson import ObjectId
+from pymongo import ReplaceOne
+from app.core.config import settings
+from app.db.migrations import apply_migrations
+from app.db.mongodb import MongoDB
+from app.db.tenancy import TENANT_COLLECTIONS
+from app.services.archive import ARCHIVE_POLICIES, archive_collection_name
+from app.services.link_routes import route_database_links
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 1000
+
+
+async def tenant_queries(organization_id: ObjectId) -> dict:
+    """Filter selecting the tenant's documents, per collection to move"""
+    hr_ids = await MongoDB.shared_database.users.distinct("_id", {"organization_id": organization_id})
+    queries = {name: {"organization_id": organization_id} for name in TENANT_COLLECTIONS}
+    # Per-HR rollups and archived documents are keyed by their HR, not the organization
+    queries["hr_stats"] = {"_id": {"$in": hr_ids}}
+    queries["hr_daily_stats"] = {"hr_id": {"$in": hr_ids}}
+    for collection_name in ARCHIVE_POLICIES:
+        queries[archive_collection_name(collection_name)] = {
+            "$or": [{"organization_id": organization_id}, {"hr_id": {"$in": hr_ids}}]
+        }
+    return queries
+
+
+async def copy_documents(source, target, query: dict) -> int:
+    copied = 0
+    batch = []
+    async for doc in source.find(query):
+        batch.append(ReplaceOne({"_id": doc["_id"]}, doc, upsert=True))
+        if len(batch) >= BATCH_SIZE:
+            await target.bulk_write(batch, ordered=False)
+            copied += len(batch)
+            batch = []
+    if batch:
+        await target.bulk_write(batch, ordered=False)
+        copied += len(batch)
+    return copied
+
+
+async def main(organization: str, database_name: str, dry_run: bool = False) -> int:
+    await MongoDB.connect_to_mongo()
+    try:
+        organization_id = ObjectId(organization)
+        shared = MongoDB.shared_database
+        target = MongoDB.client[database_name]
+        queries = await tenant_queries(organization_id)
+
+        if dry_run:
+            for collection_name, query in queries.items():
+                count = await shared[collection_name].count_documents(query)
+                logger.info(f"{collection_name}: {count} document(s) to move")
+            return 0
+
+        await apply_migrations(target)
+        for collection_name, query in queries.items():
+            copied = await copy_documents(shared[collection_name], target[collection_name], query)
+            logger.info(f"{collection_name}: copied {copied} document(s)")
+        routed = await route_database_links(shared, target, database_name, queries["interview_links"])
+        logger.info(f"Routed {routed} link token(s)")
+
+        await shared.organizations.update_one(
+            {"_id": organization_id},
+            {"$set": {"database": database_name}},
+            upsert=True
+        )
+        logger.info(f"Routing set, waiting {settings.TENANT_ROUTING_CACHE_TTL}s for every process to pick it up")
+        await asyncio.sleep(settings.TENANT_ROUTING_CACHE_TTL)
+
+        for collection_name, query in queries.items():
+            copied = await copy_documents(shared[collection_name], target[collection_name], query)
+            result = await shared[collection_name].delete_many(query)
+            logger.info(f"{collection_name}: caught up {copied}, removed {result.deleted_count} from the shared database")
+        await route_database_links(shared, target, database_name, queries["interview_links"])
+        return 0
+    except Exception as e:
+        logger.error(f"Moving organization {organization} failed: {str(e)}", exc_info=True)
+        return 1
+    finally:
+        await MongoDB.close_mongo_connection()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Move an organization into a dedicated database")
+    parser.add_argument("--organization", required=True, help="Organization id")
+    parser.add_argument("--database", required=True, help="Name of the dedicated database")
+    parser.add_argument("--dry-run", action="store_true", help="Only count the documents that would move")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args.organization, args.database, args.dry_run)))
@@ -0,0 +1,43 @@
+"""Recompute the per-HR headline counters from the source collections.
+
+Counters are maintained with $inc on every write; this repairs any drift and
+prunes expired buckets, in the shared and every dedicated tenant database.
+With --interval it keeps running and reconciles
+periodically (Procfile `reconcile` process).
+
+Usage: python -m app.reconcile_stats [--interval SECONDS]
+"""
+import argparse
+import asyncio
+import logging
+import sys
+from app.db.mongodb import MongoDB
+from app.db.tenancy import tenant_databases
+from app.services.hr_stats import reconcile_hr_counters
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def main(interval: int = 0) -> int:
+    await MongoDB.connect_to_mongo()
+    try:
+        while True:
+            for name, database, user_filter in await tenant_databases():
+                repaired = await reconcile_hr_counters(database, user_filter)
+                logger.info(f"{name}: reconciled HR counters, {repaired} document(s) changed")
+            if not interval:
+                return 0
+            await asyncio.sleep(interval)
+    except Exception as e:
+        logger.error(f"Reconciliation failed: {str(e)}", exc_info=True)
+        return 1
+    finally:
+        await MongoDB.close_mongo_connection()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Reconcile per-HR headline counters")
+    parser.add_argument("--interval", type=int, default=0, help="Seconds between runs; run once when omitted")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(interval=args.interval)))
@@ -1,16 +1,17 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+import asyncio
 import logging
 from datetime import datetime, timedelta
 from app.core.auth import get_current_user
+from app.core.deadline import DeadlineRoute
 from app.schemas.user import User
-from app.db.mongodb import db
-from bson import ObjectId
+from app.services.analytics import run_analytics
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-router = APIRouter()
+router = APIRouter(route_class=DeadlineRoute)
 
 
 @router.get("/stats")
@@ -27,78 +28,79 @@ async def get_dashboard_stats(current_user: User = Depends(get_current_user)):
         now = datetime.utcnow()
         thirty_days_ago = now - timedelta(days=30)
 
-        # Get total HR users
-        total_hr = await db.database.users.count_documents({
-            "role": "hr"
-        })
-
-        # Get active subscriptions
-        active_subscriptions = await db.database.subscriptions.count_documents({
-            "status": "active"
-        })
-
-        # Calculate total revenue
-        pipeline = [
-            {
-                "$match": {
-                    "status": "active"
+        # Read-only aggregates run under the analytics profile, concurrently
+        pipelines = {
+            "total_hr": ("users", [{"$match": {"role": "hr"}}, {"$count": "count"}]),
+            "active_subscriptions": ("subscriptions", [{"$match": {"status": "active"}}, {"$count": "count"}]),
+            "revenue": ("subscriptions", [
+                {
+                    "$match": {
+                        "status": "active"
+                    }
+                },
+                {
+                    "$group": {
+                        "_id": None,
+                        "total": {"$sum": "$amount"}
+                    }
                 }
-            },
-            {
-                "$group": {
-                    "_id": None,
-                    "total": {"$sum": "$amount"}
+            ]),
+            "recent_activity": ("activity_logs", [
+                {
+                    "$match": {
+                        "created_at": {"$gte": thirty_days_ago}
+                    }
+                },
+                # Sort and limit on the indexed field before joining users
+                {
+                    "$sort": {"created_at": -1}
+                },
+                {
+                    "$limit": 10
+                },
+                {
+                    "$lookup": {
+                        "from": "users",
+                        "localField": "user_id",
+                        "foreignField": "_id",
+                        "as": "user"
+                    }
+                },
+                {
+                    "$unwind": "$user"
+                },
+                {
+                    "$project": {
+                        "date": "$created_at",
+                        "hrName": "$user.full_name",
+                        "hrEmail": "$user.email",
+                        "action": "$action",
+                        "details": "$details"
+                    }
                 }
-            }
-        ]
-
-        revenue_result = await db.database.subscriptions.aggregate(pipeline).to_list(length=1)
-        total_revenue = revenue_result[0]["total"] if revenue_result else 0
+            ])
+        }
+        outcomes = dict(zip(pipelines, await asyncio.gather(*(
+            run_analytics(collection, pipeline, f"admin_dashboard:{current_user.id}:{name}")
+            for name, (collection, pipeline) in pipelines.items()
+        ))))
 
-        # Get recent activity
-        pipeline = [
-            {
-                "$match": {
-                    "created_at": {"$gte": thirty_days_ago}
-                }
-            },
-            {
-                "$lookup": {
-                    "from": "users",
-                    "localField": "user_id",
-                    "foreignField": "_id",
-                    "as": "user"
-                }
-            },
-            {
-                "$unwind": "$user"
-            },
-            {
-                "$project": {
-                    "date": "$created_at",
-                    "hrName": "$user.full_name",
-                    "hrEmail": "$user.email",
-                    "action": "$action",
-                    "details": "$details"
-                }
-            },
-            {
-                "$sort": {"date": -1}
-            },
-            {
-                "$limit": 10
-            }
-        ]
+        def first_value(name: str, field: str):
+            results = outcomes[name]["results"]
+            return results[0][field] if results else 0
 
-        recent_activity = await db.database.activity_logs.aggregate(pipeline).to_list(length=None)
+        sources = {outcome["source"] for outcome in outcomes.values()}
 
         return {
-            "totalHR": total_hr,
-            "activeSubscriptions": active_subscriptions,
-            "totalRevenue": total_revenue,
-            "recentActivity": recent_activity
+            "totalHR": first_value("total_hr", "count"),
+            "activeSubscriptions": first_value("active_subscriptions", "count"),
+            "totalRevenue": first_value("revenue", "total"),
+            "recentActivity": outcomes["recent_activity"]["results"],
+            "source": "live" if sources == {"live"} else "partial" if "partial" in sources else "cached"
         }
 
+    except HTTPException as he:
+        raise he
     except Exception as e:
         logger.error(f"Failed to fetch dashboard stats: {str(e)}", exc_info=True)
         raise HTTPException(
@@ -1,13 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from typing import Optional
 from app.core.auth import get_current_user
+from app.core.deadline import DeadlineRoute
+from app.core.config import settings
+from app.core.pagination import paginate, set_pagination_headers
 from app.schemas.user import User, UserCreate, UserUpdate
 from app.services.user import create_user, update_user, delete_user, get_user_by_id
 from app.db.mongodb import db
+from app.db.tenancy import tenant_filter
+from app.services.hr_stats import COUNTERS_FIELD, CANDIDATES_COUNTER
 from bson import ObjectId
 import logging
 from datetime import datetime
-router = APIRouter()
+router = APIRouter(route_class=DeadlineRoute)
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -51,7 +56,13 @@ async def check_subscription_limits(admin_id: str):
 
 
 @router.get("/")
-async def get_hr_users(current_user: User = Depends(get_current_user)):
+async def get_hr_users(
+        response: Response,
+        limit: Optional[int] = Query(None, ge=1, le=settings.MAX_PAGE_SIZE),
+        cursor: Optional[str] = None,
+        include_total: bool = False,
+        current_user: User = Depends(get_current_user)
+):
     try:
         # Check if user is admin
         if not hasattr(current_user, 'role') or current_user.role != 'admin':
@@ -60,21 +71,34 @@ async def get_hr_users(current_user: User = Depends(get_current_user)):
                 detail="Not authorized to access this resource"
             )
 
-        # Get all HR users
-        cursor = db.database.users.find({"role": "hr"})
+        # Users live in the shared database while subscriptions and hr_stats
+        # follow the tenant, so the page is joined with one routed query each
+        # instead of a $lookup that would only see the shared database
+        page = await paginate(
+            db.database.users,
+            {"created_by": ObjectId(current_user.id), "role": "hr"},
+            limit,
+            cursor,
+            projection={"full_name": 1, "email": 1, "company_name": 1, "status": 1, "created_at": 1},
+            include_total=include_total
+        )
+        hr_ids = [user["_id"] for user in page["items"]]
+        subscriptions = {
+            doc["_id"]: doc
+            async for doc in db.database.subscriptions.aggregate([
+                {"$match": tenant_filter({"user_id": {"$in": hr_ids}})},
+                {"$sort": {"created_at": -1}},
+                {"$group": {"_id": "$user_id", "plan": {"$first": "$plan"}, "status": {"$first": "$status"}}}
+            ])
+        }
+        candidate_counts = {
+            doc["_id"]: doc.get(COUNTERS_FIELD, {}).get("candidates", 0)
+            async for doc in db.database.hr_stats.find({"_id": {"$in": hr_ids}}, {CANDIDATES_COUNTER: 1})
+        }
         hr_users = []
 
-        async for user in cursor:
-            # Get subscription info
-            subscription = await db.database.subscriptions.find_one({
-                "user_id": user["_id"]
-            })
-
-            # Get candidate count
-            candidate_count = await db.database.candidates.count_documents({
-                "hr_id": user["_id"]
-            })
-
+        for user in page["items"]:
+            subscription = subscriptions.get(user["_id"])
             hr_users.append({
                 "_id": str(user["_id"]),
                 "full_name": user["full_name"],
@@ -83,12 +107,15 @@ async def get_hr_users(current_user: User = Depends(get_current_user)):
                 "status": user.get("status", "active"),
                 "subscription_plan": subscription["plan"] if subscription else None,
                 "subscription_status": subscription["status"] if subscription else None,
-                "candidate_count": candidate_count,
+                "candidate_count": candidate_counts.get(user["_id"], 0),
                 "created_at": user["created_at"]
             })
 
+        set_pagination_headers(response, page)
         return hr_users
 
+    except HTTPException as he:
+        raise he
     except Exception as e:
         logger.error(f"Failed to fetch HR users: {str(e)}", exc_info=True)
         raise HTTPException(
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 import logging
 from app.core.auth import get_current_user
+from app.core.deadline import DeadlineRoute
 from app.schemas.user import User
 from app.db.mongodb import db
 
@@ -8,7 +9,7 @@ from app.db.mongodb import db
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-router = APIRouter()
+router = APIRouter(route_class=DeadlineRoute)
 
 
 @router.get("/")
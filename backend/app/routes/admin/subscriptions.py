@@ -1,7 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from typing import Optional
 import logging
 from datetime import datetime, timedelta
 from app.core.auth import get_current_user
+from app.core.deadline import DeadlineRoute
+from app.db.tenancy import tenant_fields, tenant_filter
+from app.core.config import settings
+from app.core.pagination import paginate, set_pagination_headers
 from app.schemas.user import User
 from app.schemas.subscription import SubscriptionCreate, SubscriptionUpdate, PaymentMethodUpdate
 from app.db.mongodb import db
@@ -11,7 +16,7 @@ from bson import ObjectId
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-router = APIRouter()
+router = APIRouter(route_class=DeadlineRoute)
 
 
 @router.post("/purchase")
@@ -43,6 +48,7 @@ async def purchase_subscription(
         # Create subscription
         subscription_data = {
             "user_id": ObjectId(current_user.id),
+            **tenant_fields(),
             "plan": subscription_in.plan,
             "status": "active",
             "features": {
@@ -74,7 +80,13 @@ async def purchase_subscription(
 
 
 @router.get("/")
-async def get_all_subscriptions(current_user: User = Depends(get_current_user)):
+async def get_all_subscriptions(
+        response: Response,
+        limit: Optional[int] = Query(None, ge=1, le=settings.MAX_PAGE_SIZE),
+        cursor: Optional[str] = None,
+        include_total: bool = False,
+        current_user: User = Depends(get_current_user)
+):
     try:
         # Check if user is admin
         if not hasattr(current_user, 'role') or current_user.role != 'admin':
@@ -83,44 +95,49 @@ async def get_all_subscriptions(current_user: User = Depends(get_current_user)):
                 detail="Not authorized to access this resource"
             )
 
-        # Get all subscriptions with user details
-        pipeline = [
-            {
-                "$lookup": {
-                    "from": "users",
-                    "localField": "user_id",
-                    "foreignField": "_id",
-                    "as": "user"
-                }
+        # Get one page of the organization's subscriptions, then join the page's users in one query
+        page = await paginate(
+            db.database.subscriptions,
+            tenant_filter({}),
+            limit,
+            cursor,
+            projection={
+                "user_id": 1,
+                "plan": 1,
+                "status": 1,
+                "amount": 1,
+                "payment_method": 1,
+                "last_payment_amount": 1,
+                "next_payment_date": 1,
+                "created_at": 1,
+                "updated_at": 1
             },
-            {
-                "$unwind": "$user"
-            },
-            {
-                "$project": {
-                    "_id": 1,
-                    "hr_name": "$user.full_name",
-                    "company_name": "$user.company_name",
-                    "plan": 1,
-                    "status": 1,
-                    "amount": 1,
-                    "payment_method": 1,
-                    "last_payment_amount": 1,
-                    "next_payment_date": 1,
-                    "created_at": 1,
-                    "updated_at": 1
-                }
-            }
-        ]
-
-        subscriptions = await db.database.subscriptions.aggregate(pipeline).to_list(length=None)
+            include_total=include_total
+        )
+        users = {
+            user["_id"]: user
+            async for user in db.database.users.find(
+                {"_id": {"$in": [sub["user_id"] for sub in page["items"]]}},
+                {"full_name": 1, "company_name": 1}
+            )
+        }
 
-        # Convert ObjectId to string
-        for subscription in subscriptions:
+        subscriptions = []
+        for subscription in page["items"]:
+            # Subscriptions whose user no longer exists are skipped
+            user = users.get(subscription.pop("user_id"))
+            if not user:
+                continue
             subscription["_id"] = str(subscription["_id"])
-        print(subscriptions)
+            subscription["hr_name"] = user.get("full_name")
+            subscription["company_name"] = user.get("company_name")
+            subscriptions.append(subscription)
+
+        set_pagination_headers(response, page)
         return subscriptions
 
+    except HTTPException as he:
+        raise he
     except Exception as e:
         logger.error(f"Failed to fetch subscriptions: {str(e)}", exc_info=True)
         raise HTTPException(
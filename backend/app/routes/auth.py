@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from app.core.deadline import DeadlineRoute
 from fastapi.security import OAuth2PasswordRequestForm
 from app.core.auth import authenticate_user, create_access_token, get_current_user
 from app.schemas.user import UserCreate, User
@@ -11,7 +12,7 @@ import logging
 # Configure logging
 logger = logging.getLogger(__name__)
 
-router = APIRouter()
+router = APIRouter(route_class=DeadlineRoute)
 
 
 @router.post("/register", response_model=User)
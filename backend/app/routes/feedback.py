@@ -1,11 +1,17 @@
 import logging
 import asyncio
 from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
-from typing import List, Dict
+from typing import List, Dict, Optional
 from app.core.auth import get_current_user
+from app.core.deadline import DeadlineRoute
 from app.services.openai import analyze_response
-from app.services.interview import get_interview
+from app.services.interview import get_interview, get_response_status_counts, normalize_responses
+from app.services.daily_stats import record_interview_analyzed
+from app.services.hr_stats import bump_collection_versions
+from app.services.archive import restore_archived
 from app.db.mongodb import db
+from app.db.write_buffer import CoalescedUpdate
+from app.db.tenancy import bind_tenant, organization_id_of
 from bson import ObjectId
 from app.schemas.user import User
 from datetime import datetime
@@ -15,7 +21,7 @@ from app.core.config import settings
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-router = APIRouter()
+router = APIRouter(route_class=DeadlineRoute)
 
 
 @router.post("/{interview_id}/submit")
@@ -43,6 +49,10 @@ async def submit_feedback(
             logger.error(f"Unauthorized access attempt by user {current_user.id} for interview {interview_id}")
             raise HTTPException(status_code=403, detail="Not authorized to access this interview")
 
+        # Responses are written field by field, so an archived interview comes back first
+        if interview.get("archived_at"):
+            await restore_archived("interviews", interview_id)
+
         # Log the start of analysis
         logger.info("Starting response analysis")
         start_time = datetime.now()
@@ -100,16 +110,20 @@ async def analyze_interview(
             raise HTTPException(status_code=403, detail="Not authorized to access this interview")
 
         # Check if responses exist
-        responses = interview.get("responses", {})
-        if not responses:
+        responses = normalize_responses(interview.get("responses"))
+        if not any(responses):
             logger.error(f"No responses found for interview {interview_id}")
             raise HTTPException(status_code=400, detail="No responses to analyze")
 
+        if interview.get("archived_at"):
+            await restore_archived("interviews", interview_id)
+
         # Start background task for analysis
         background_tasks.add_task(
             process_interview_analysis,
             interview_id=interview_id,
-            responses=responses
+            responses=responses,
+            organization_id=organization_id_of(current_user)
         )
 
         return {
@@ -128,16 +142,39 @@ async def analyze_interview(
         )
 
 
-async def process_interview_analysis(interview_id: str, responses: Dict):
+async def process_interview_analysis(interview_id: str, responses: List[Optional[Dict]], organization_id=None):
     """Background task to process all responses and generate overall feedback"""
+    # Background tasks run outside the request context, so the tenant is bound again
+    await bind_tenant(organization_id)
+
+    # Analysis results and scores show in the HR's reports, whose ETags follow the interviews version
+    owner = await db.database.interviews.find_one({"_id": ObjectId(interview_id)}, {"hr_id": 1}) or {}
+
+    async def bump_interviews_version():
+        if not owner.get("hr_id"):
+            return
+        try:
+            await bump_collection_versions(str(owner["hr_id"]), "interviews")
+        except Exception as e:
+            # A stale ETag only delays revalidation; it must not fail the analysis
+            logger.warning(f"Failed to bump interviews version for {interview_id}: {str(e)}")
+
+    # Per-response results are batched into a few writes; the rest rides on the final update
+    results = CoalescedUpdate(
+        db.database.interviews,
+        {"_id": ObjectId(interview_id)},
+        max_pending=settings.ANALYSIS_FLUSH_EVERY,
+        max_delay=settings.ANALYSIS_FLUSH_INTERVAL,
+        on_write=bump_interviews_version
+    )
     try:
         logger.info(f"Starting background analysis for interview {interview_id}")
 
         all_analyses = []
 
-        # Process each response
-        for idx, response_data in responses.items():
-            if response_data.get("analysis_status") == "pending":
+        # Process each response; unanswered questions leave empty slots
+        for idx, response_data in enumerate(responses):
+            if response_data and response_data.get("analysis_status") == "pending":
                 logger.info(f"Analyzing response for question {idx}")
 
                 try:
@@ -149,34 +186,25 @@ async def process_interview_analysis(interview_id: str, responses: Dict):
                     )
 
                     # Update the response with analysis
-                    await db.database.interviews.update_one(
-                        {"_id": ObjectId(interview_id)},
-                        {"$set": {
-                            f"responses.{idx}.analysis": analysis,
-                            f"responses.{idx}.analysis_status": "completed"
-                        }}
-                    )
+                    await results.set({
+                        f"responses.{idx}.analysis": analysis,
+                        f"responses.{idx}.analysis_status": "completed"
+                    })
 
                     all_analyses.append(analysis)
                     logger.info(f"Analysis completed for question {idx}")
 
                 except asyncio.TimeoutError:
                     logger.error(f"Analysis timeout for question {idx}")
-                    await db.database.interviews.update_one(
-                        {"_id": ObjectId(interview_id)},
-                        {"$set": {
-                            f"responses.{idx}.analysis_status": "timeout"
-                        }}
-                    )
+                    await results.set({
+                        f"responses.{idx}.analysis_status": "timeout"
+                    })
                 except Exception as e:
                     logger.error(f"Analysis failed for question {idx}: {str(e)}")
-                    await db.database.interviews.update_one(
-                        {"_id": ObjectId(interview_id)},
-                        {"$set": {
-                            f"responses.{idx}.analysis_status": "failed",
-                            f"responses.{idx}.analysis_error": str(e)
-                        }}
-                    )
+                    await results.set({
+                        f"responses.{idx}.analysis_status": "failed",
+                        f"responses.{idx}.analysis_error": str(e)
+                    })
 
         # Calculate overall scores
         if all_analyses:
@@ -212,38 +240,56 @@ Based on your responses, focus on improving:
 
             # Update the interview with overall scores and feedback
             logger.info("Updating interview with overall scores and feedback")
-            await db.database.interviews.update_one(
+            scores = {
+                "knowledge_score": round(knowledge_score, 1),
+                "communication_score": round(communication_score, 1),
+                "confidence_score": round(confidence_score, 1)
+            }
+            previous = await db.database.interviews.find_one_and_update(
                 {"_id": ObjectId(interview_id)},
                 {"$set": {
-                    "knowledge_score": round(knowledge_score, 1),
-                    "communication_score": round(communication_score, 1),
-                    "confidence_score": round(confidence_score, 1),
+                    **await results.drain(),
+                    **scores,
                     "feedback": overall_feedback,
                     "analysis_status": "completed",
                     "analyzed_at": datetime.utcnow()
-                }}
+                }},
+                projection={
+                    "hr_id": 1,
+                    "position": 1,
+                    "created_at": 1,
+                    "knowledge_score": 1,
+                    "communication_score": 1,
+                    "confidence_score": 1
+                }
             )
+            await record_interview_analyzed(previous, scores)
+            await bump_interviews_version()
 
-            logger.info(f"Interview analysis completed for {interview_id}")
+            logger.info(f"Interview analysis completed for {interview_id} in {results.writes + 1} write(s)")
         else:
             logger.warning(f"No analyses were completed for interview {interview_id}")
             await db.database.interviews.update_one(
                 {"_id": ObjectId(interview_id)},
                 {"$set": {
+                    **await results.drain(),
                     "analysis_status": "failed",
                     "analysis_error": "No analyses were completed"
                 }}
             )
+            await bump_interviews_version()
 
     except Exception as e:
         logger.error(f"Error in background analysis task: {str(e)}", exc_info=True)
         await db.database.interviews.update_one(
             {"_id": ObjectId(interview_id)},
             {"$set": {
+                **await results.drain(),
                 "analysis_status": "failed",
                 "analysis_error": str(e)
             }}
         )
+        await bump_interviews_version()
 
 
 @router.get("/{interview_id}")
@@ -273,7 +319,7 @@ async def get_feedback(
             "communication_score": interview.get("communication_score"),
             "confidence_score": interview.get("confidence_score"),
             "feedback": interview.get("feedback"),
-            "responses": interview.get("responses", {}),
+            "responses": normalize_responses(interview.get("responses")),
             "analysis_status": interview.get("analysis_status", "unknown"),
             "analyzed_at": interview.get("analyzed_at")
         }
@@ -296,34 +342,31 @@ async def get_analysis_status(
     try:
         logger.info(f"Checking analysis status for interview {interview_id}")
 
-        # Get the interview
-        interview = await get_interview(interview_id)
-        if not interview:
+        # Count responses by status on the server; this endpoint is polled,
+        # so the responses themselves are never loaded
+        counts = await get_response_status_counts(interview_id)
+        if not counts:
             logger.error(f"Interview not found: {interview_id}")
             raise HTTPException(status_code=404, detail="Interview not found")
 
         # Verify user owns this interview
-        if interview["user_id"] != str(current_user.id):
+        if counts.get("user_id") != str(current_user.id):
             logger.error(f"Unauthorized access attempt by user {current_user.id} for interview {interview_id}")
             raise HTTPException(status_code=403, detail="Not authorized to access this interview")
 
-        # Get analysis status
-        analysis_status = interview.get("analysis_status", "unknown")
-        responses = interview.get("responses", {})
-
-        # Count responses by status
+        analysis_status = counts.get("analysis_status", "unknown")
         response_counts = {
-            "total": len(responses),
-            "pending": sum(1 for r in responses.values() if r.get("analysis_status") == "pending"),
-            "completed": sum(1 for r in responses.values() if r.get("analysis_status") == "completed"),
-            "failed": sum(1 for r in responses.values() if r.get("analysis_status") in ["failed", "timeout"])
+            "total": counts["total"],
+            "pending": counts["pending"],
+            "completed": counts["completed"],
+            "failed": counts["failed"]
         }
 
         return {
             "interview_id": interview_id,
             "analysis_status": analysis_status,
             "response_counts": response_counts,
-            "analyzed_at": interview.get("analyzed_at")
+            "analyzed_at": counts.get("analyzed_at")
         }
 
     except HTTPException as he:
@@ -343,11 +386,20 @@ async def get_recent_feedback_summary(
     try:
         logger.info(f"Fetching recent feedback summary for user {current_user.id}")
 
-        # Get the user's 5 most recent interviews
+        # Get the user's 5 most recent interviews; responses are served by
+        # the per-interview feedback endpoint
         logger.info("Querying database for recent interviews")
         cursor = db.database.interviews.find(
-            {"user_id": str(current_user.id)}
-        ).sort("created_at", -1).limit(5)
+            {"user_id": str(current_user.id)},
+            {
+                "topic": 1,
+                "knowledge_score": 1,
+                "communication_score": 1,
+                "confidence_score": 1,
+                "analysis_status": 1,
+                "created_at": 1
+            }
+        ).sort([("created_at", -1), ("_id", -1)]).limit(5)
 
         interviews = []
         async for interview in cursor:
@@ -358,7 +410,6 @@ async def get_recent_feedback_summary(
                 "communication_score": interview.get("communication_score"),
                 "confidence_score": interview.get("confidence_score"),
                 "created_at": interview["created_at"],
-                "responses": interview.get("responses", {}),
                 "analysis_status": interview.get("analysis_status", "unknown")
             })
 
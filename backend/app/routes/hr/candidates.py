@@ -1,16 +1,22 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from typing import List, Optional
 import logging
 from app.core.auth import get_current_user
+from app.core.deadline import DeadlineRoute
+from app.core.config import settings
+from app.core.pagination import set_pagination_headers
+from app.core.etag import compute_etag, is_not_modified, not_modified_response, set_etag_headers
 from app.schemas.candidate import Candidate, CandidateCreate, CandidateUpdate
 from app.schemas.user import User
-from app.services.candidate import create_candidate, get_candidates, get_candidate, update_candidate, delete_candidate
+from app.services.candidate import create_candidate, get_candidates, get_candidate, update_candidate, delete_candidate, \
+    search_candidates
+from app.services.hr_stats import get_collection_versions
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-router = APIRouter()
+router = APIRouter(route_class=DeadlineRoute)
 
 
 @router.post("/", response_model=Candidate)
@@ -41,7 +47,14 @@ async def add_candidate(
 
 
 @router.get("/", response_model=List[Candidate])
-async def list_candidates(current_user: User = Depends(get_current_user)):
+async def list_candidates(
+        request: Request,
+        response: Response,
+        limit: Optional[int] = Query(None, ge=1, le=settings.MAX_PAGE_SIZE),
+        cursor: Optional[str] = None,
+        include_total: bool = False,
+        current_user: User = Depends(get_current_user)
+):
     try:
         logger.info(f"Fetching candidates for HR user {current_user.id}")
 
@@ -52,10 +65,23 @@ async def list_candidates(current_user: User = Depends(get_current_user)):
                 detail="Not authorized to access this resource"
             )
 
-        candidates = await get_candidates(str(current_user.id))
-        logger.info(f"Found {len(candidates)} candidates")
+        # Answer conditional requests from the version counter alone
+        versions = await get_collection_versions(str(current_user.id))
+        etag = compute_etag(
+            "candidates", current_user.id, versions.get("candidates", 0),
+            limit, cursor, include_total
+        )
+        if is_not_modified(request, etag):
+            return not_modified_response(etag)
+
+        page = await get_candidates(str(current_user.id), limit, cursor, include_total)
+        logger.info(f"Found {len(page['items'])} candidates")
 
-        return candidates
+        set_etag_headers(response, etag)
+        set_pagination_headers(response, page)
+        return page["items"]
+    except HTTPException as he:
+        raise he
     except Exception as e:
         logger.error(f"Failed to fetch candidates: {str(e)}", exc_info=True)
         raise HTTPException(
@@ -64,6 +90,42 @@ async def list_candidates(current_user: User = Depends(get_current_user)):
         )
 
 
+@router.get("/search", response_model=List[Candidate])
+async def search_candidate_list(
+        response: Response,
+        q: str = Query(..., min_length=1, max_length=100),
+        mode: str = Query("prefix", pattern="^(prefix|text)$"),
+        organization_wide: bool = False,
+        limit: int = Query(settings.DEFAULT_PAGE_SIZE, ge=1, le=settings.MAX_PAGE_SIZE),
+        cursor: Optional[str] = None,
+        current_user: User = Depends(get_current_user)
+):
+    try:
+        logger.info(f"Searching candidates for HR user {current_user.id}")
+
+        # Check if user has HR role
+        if not hasattr(current_user, 'role') or current_user.role not in ['hr', 'admin']:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not authorized to access this resource"
+            )
+
+        # Only admins may search the candidates of every HR in their organization
+        hr_id = None if organization_wide and current_user.role == "admin" else str(current_user.id)
+        page = await search_candidates(hr_id, q, mode, limit, cursor)
+
+        set_pagination_headers(response, page)
+        return page["items"]
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        logger.error(f"Failed to search candidates: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to search candidates: {str(e)}"
+        )
+
+
 @router.get("/{candidate_id}", response_model=Candidate)
 async def get_candidate_details(
         candidate_id: str,
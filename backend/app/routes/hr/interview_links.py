@@ -1,22 +1,32 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from typing import List, Optional
 import logging
+from datetime import datetime
 from app.core.auth import get_current_user
+from app.core.deadline import DeadlineRoute
+from app.core.config import settings
+from app.core.pagination import set_pagination_headers
+from app.core.rate_limit import public_token_shield
+from app.core.etag import compute_etag, is_not_modified, not_modified_response, set_etag_headers
+from app.core.security import LEGACY_LINK_TOKEN_PATTERN, is_signed_interview_link_token, \
+    verify_interview_link_token
 from app.schemas.interview_link import InterviewLink, InterviewLinkCreate, InterviewLinkUpdate, PublicInterviewStart, \
     PublicInterviewComplete
 from app.schemas.user import User
 from app.services.interview_link import (
     create_interview_link, get_interview_links, get_interview_link,
     update_interview_link, delete_interview_link, resend_interview_email,
-    validate_interview_link, start_public_interview, complete_public_interview
+    validate_interview_link, start_public_interview, complete_public_interview, search_interview_links,
+    InterviewLinkNotFound, InterviewLinkClosed
 )
+from app.services.hr_stats import get_collection_versions
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-router = APIRouter()
-public_router = APIRouter()
+router = APIRouter(route_class=DeadlineRoute)
+public_router = APIRouter(route_class=DeadlineRoute, dependencies=[Depends(public_token_shield.check)])
 
 
 @router.post("/", response_model=InterviewLink)
@@ -51,7 +61,14 @@ async def create_link(
 
 
 @router.get("/", response_model=List[InterviewLink])
-async def list_links(current_user: User = Depends(get_current_user)):
+async def list_links(
+        request: Request,
+        response: Response,
+        limit: Optional[int] = Query(None, ge=1, le=settings.MAX_PAGE_SIZE),
+        cursor: Optional[str] = None,
+        include_total: bool = False,
+        current_user: User = Depends(get_current_user)
+):
     try:
         logger.info(f"Fetching interview links for HR user {current_user.id}")
 
@@ -62,15 +79,25 @@ async def list_links(current_user: User = Depends(get_current_user)):
                 detail="Not authorized to access this resource"
             )
 
-        links = await get_interview_links(str(current_user.id))
+        # Answer conditional requests from the version counter alone;
+        # `is_expired` depends on the clock, so the ETag is time-bucketed
+        versions = await get_collection_versions(str(current_user.id))
+        etag = compute_etag(
+            "interview_links", current_user.id, versions.get("interview_links", 0),
+            limit, cursor, include_total,
+            time_sensitive=True
+        )
+        if is_not_modified(request, etag):
+            return not_modified_response(etag)
 
-        # Convert ObjectId to string for each link
-        for link in links:
-            link["_id"] = str(link["_id"])
-            link["hr_id"] = str(link["hr_id"])
+        page = await get_interview_links(str(current_user.id), limit, cursor, include_total)
 
-        logger.info(f"Found {len(links)} interview links")
-        return links
+        logger.info(f"Found {len(page['items'])} interview links")
+        set_etag_headers(response, etag)
+        set_pagination_headers(response, page)
+        return page["items"]
+    except HTTPException as he:
+        raise he
     except Exception as e:
         logger.error(f"Failed to fetch interview links: {str(e)}", exc_info=True)
         raise HTTPException(
@@ -79,6 +106,42 @@ async def list_links(current_user: User = Depends(get_current_user)):
         )
 
 
+@router.get("/search", response_model=List[InterviewLink])
+async def search_links(
+        response: Response,
+        q: str = Query(..., min_length=1, max_length=100),
+        mode: str = Query("prefix", pattern="^(prefix|text)$"),
+        organization_wide: bool = False,
+        limit: int = Query(settings.DEFAULT_PAGE_SIZE, ge=1, le=settings.MAX_PAGE_SIZE),
+        cursor: Optional[str] = None,
+        current_user: User = Depends(get_current_user)
+):
+    try:
+        logger.info(f"Searching interview links for HR user {current_user.id}")
+
+        # Check if user has HR role
+        if not hasattr(current_user, 'role') or current_user.role not in ['hr', 'admin']:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not authorized to access this resource"
+            )
+
+        # Only admins may search the links of every HR in their organization
+        hr_id = None if organization_wide and current_user.role == "admin" else str(current_user.id)
+        page = await search_interview_links(hr_id, q, mode, limit, cursor)
+
+        set_pagination_headers(response, page)
+        return page["items"]
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        logger.error(f"Failed to search interview links: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to search interview links: {str(e)}"
+        )
+
+
 @router.get("/{link_id}", response_model=InterviewLink)
 async def get_link_details(
         link_id: str,
@@ -221,20 +284,58 @@ async def resend_email(
         )
 
 
+def reject_unknown_token(request: Request):
+    public_token_shield.record(request, found=False)
+    raise HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail="Invalid interview link"
+    )
+
+
+def precheck_interview_token(request: Request, token: str) -> bool:
+    """Reject malformed or forged tokens without touching the database.
+
+    Returns True when the token is signed and its embedded expiry has passed.
+    Opaque legacy tokens are only shape-checked and left to the lookup.
+    """
+    if is_signed_interview_link_token(token):
+        verified = verify_interview_link_token(token)
+        if verified is None:
+            logger.error(f"Forged or malformed interview link token: {token}")
+            reject_unknown_token(request)
+        return verified[1] < datetime.utcnow()
+
+    if not LEGACY_LINK_TOKEN_PATTERN.match(token):
+        logger.error(f"Malformed interview link token: {token}")
+        reject_unknown_token(request)
+    return False
+
+
+def reject_expired_token(request: Request, token: str):
+    if precheck_interview_token(request, token):
+        logger.error(f"Expired interview link token: {token}")
+        public_token_shield.record(request, found=True)
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail="This interview link has expired"
+        )
+
+
 # Public interview routes (no authentication required)
 @public_router.get("/{token}/validate")
-async def validate_link(token: str):
+async def validate_link(request: Request, token: str):
     try:
         logger.info(f"Validating interview link with token: {token}")
 
+        # Expired links still get the full response, which only the lookup has
+        precheck_interview_token(request, token)
+
         link_data = await validate_interview_link(token)
         if not link_data:
             logger.error(f"Invalid interview link token: {token}")
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Invalid interview link"
-            )
+            reject_unknown_token(request)
 
+        public_token_shield.record(request, found=True)
         logger.info(f"Successfully validated interview link with token: {token}")
         return link_data
     except HTTPException as he:
@@ -248,14 +349,22 @@ async def validate_link(token: str):
 
 
 @public_router.post("/{token}/start")
-async def start_interview(token: str, candidate_info: PublicInterviewStart):
+async def start_interview(request: Request, token: str, candidate_info: PublicInterviewStart):
     try:
         logger.info(f"Starting public interview with token: {token}")
 
+        reject_expired_token(request, token)
         result = await start_public_interview(token, candidate_info)
+        public_token_shield.record(request, found=True)
         logger.info(f"Successfully started public interview with token: {token}")
 
         return result
+    except InterviewLinkNotFound:
+        logger.error(f"Invalid interview link token: {token}")
+        reject_unknown_token(request)
+    except InterviewLinkClosed as e:
+        public_token_shield.record(request, found=True)
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
     except HTTPException as he:
         raise he
     except Exception as e:
@@ -267,14 +376,22 @@ async def start_interview(token: str, candidate_info: PublicInterviewStart):
 
 
 @public_router.post("/{token}/complete")
-async def complete_interview(token: str, data: PublicInterviewComplete):
+async def complete_interview(request: Request, token: str, data: PublicInterviewComplete):
     try:
         logger.info(f"Completing public interview with token: {token}")
 
+        reject_expired_token(request, token)
         result = await complete_public_interview(token, data)
+        public_token_shield.record(request, found=True)
         logger.info(f"Successfully completed public interview with token: {token}")
 
         return {"message": "Interview completed successfully"}
+    except InterviewLinkNotFound:
+        logger.error(f"Invalid interview link token: {token}")
+        reject_unknown_token(request)
+    except InterviewLinkClosed as e:
+        public_token_shield.record(request, found=True)
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
     except HTTPException as he:
         raise he
     except Exception as e:
@@ -282,4 +399,4 @@ async def complete_interview(token: str, data: PublicInterviewComplete):
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to complete public interview: {str(e)}"
-        )
\ No newline at end of file
+        )
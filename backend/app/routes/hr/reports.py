@@ -1,22 +1,41 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from typing import List, Dict, Any, Optional
 import logging
 from datetime import datetime, timedelta
 from app.core.auth import get_current_user
+from app.core.deadline import DeadlineRoute
+from app.db.tenancy import tenant_fields
+from app.core.etag import compute_etag, is_not_modified, not_modified_response, set_etag_headers
 from app.schemas.user import User
-from app.services.reports import get_hr_reports, get_report_stats
-from app.db.mongodb import db
+from app.services.hr_stats import get_collection_versions
+from app.services.analytics import run_analytics, DEGRADED_ERRORS
+from app.services.archive import QUESTION_STATS_FIELD
+from app.services.interview import responses_array_expression
+from app.services.export import csv_chunks, gzip_chunks, json_chunks
+from app.services.reports import get_hr_reports, get_report_stats, stream_hr_reports
 from bson import ObjectId
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-router = APIRouter()
+router = APIRouter(route_class=DeadlineRoute)
+
+
+async def get_reports_etag(hr_id: str, *parts) -> str:
+    """Reports join interview links with interviews, so both versions count"""
+    versions = await get_collection_versions(hr_id)
+    return compute_etag(
+        hr_id, versions.get("interview_links", 0), versions.get("interviews", 0), *parts,
+        time_sensitive=True
+    )
 
 
 @router.get("/")
 async def get_reports(
+        request: Request,
+        response: Response,
         date_range: Optional[str] = Query("30days", description="Filter by date range: 7days, 30days, 90days, all"),
         position: Optional[str] = Query("all", description="Filter by position"),
         status: Optional[str] = Query("all", description="Filter by status: completed, pending, expired"),
@@ -33,10 +52,17 @@ async def get_reports(
                 detail="Not authorized to access this resource"
             )
 
+        etag = await get_reports_etag(str(current_user.id), "reports", date_range, position, status)
+        if is_not_modified(request, etag):
+            return not_modified_response(etag)
+
         reports = await get_hr_reports(str(current_user.id), date_range, position, status)
         logger.info(f"Found {len(reports)} reports")
 
+        set_etag_headers(response, etag)
         return reports
+    except HTTPException as he:
+        raise he
     except Exception as e:
         logger.error(f"Failed to fetch reports: {str(e)}", exc_info=True)
         raise HTTPException(
@@ -47,6 +73,8 @@ async def get_reports(
 
 @router.get("/stats")
 async def get_stats(
+        request: Request,
+        response: Response,
         date_range: Optional[str] = Query("30days", description="Filter by date range: 7days, 30days, 90days, all"),
         position: Optional[str] = Query("all", description="Filter by position"),
         status: Optional[str] = Query("all", description="Filter by status: completed, pending, expired"),
@@ -63,10 +91,17 @@ async def get_stats(
                 detail="Not authorized to access this resource"
             )
 
+        etag = await get_reports_etag(str(current_user.id), "stats", date_range, position, status)
+        if is_not_modified(request, etag):
+            return not_modified_response(etag)
+
         stats = await get_report_stats(str(current_user.id), date_range, position, status)
         logger.info(f"Successfully retrieved report stats")
 
+        set_etag_headers(response, etag)
         return stats
+    except HTTPException as he:
+        raise he
     except Exception as e:
         logger.error(f"Failed to fetch report stats: {str(e)}", exc_info=True)
         raise HTTPException(
@@ -101,20 +136,31 @@ async def get_question_analytics(
         pipeline = [
             {
                 "$match": {
+                    **tenant_fields(),
                     "hr_id": ObjectId(current_user.id),
                     **({"created_at": {"$gte": date_filter}} if date_filter else {})
                 }
             },
+            {
+                # Archived stubs only keep question stats; legacy documents keep
+                # responses in an index-keyed object
+                "$project": {"responses": {"$ifNull": [f"${QUESTION_STATS_FIELD}", responses_array_expression()]}}
+            },
             {
                 "$unwind": "$responses"
             },
+            {
+                "$match": {"responses": {"$ne": None}}
+            },
             {
                 "$group": {
                     "_id": "$responses.question",
                     "avg_score": {"$avg": "$responses.analysis.knowledge_score"},
                     "response_count": {"$sum": 1},
                     "completion_rate": {
-                        "$avg": {"$cond": [{"$gt": ["$responses.response", ""]}, 1, 0]}
+                        "$avg": {"$cond": [
+                            {"$or": ["$responses.answered", {"$gt": ["$responses.response", ""]}]}, 1, 0
+                        ]}
                     }
                 }
             },
@@ -137,7 +183,10 @@ async def get_question_analytics(
             }
         ]
 
-        results = await db.database.interviews.aggregate(pipeline).to_list(length=None)
+        analytics = await run_analytics(
+            "interviews", pipeline, f"questions:{current_user.id}:{date_range}"
+        )
+        results = analytics["results"]
 
         return {
             "questions": results,
@@ -146,9 +195,13 @@ async def get_question_analytics(
                 "avg_effectiveness": sum(r["effectiveness"] for r in results) / len(results) if results else 0,
                 "most_effective": results[0] if results else None,
                 "least_effective": results[-1] if results else None
-            }
+            },
+            "source": analytics["source"],
+            "generated_at": analytics["generated_at"]
         }
 
+    except HTTPException as he:
+        raise he
     except Exception as e:
         logger.error(f"Failed to fetch question analytics: {str(e)}", exc_info=True)
         raise HTTPException(
@@ -183,6 +236,7 @@ async def get_candidate_analytics(
         pipeline = [
             {
                 "$match": {
+                    **tenant_fields(),
                     "hr_id": ObjectId(current_user.id),
                     **({"created_at": {"$gte": date_filter}} if date_filter else {})
                 }
@@ -235,7 +289,10 @@ async def get_candidate_analytics(
             }
         ]
 
-        results = await db.database.candidates.aggregate(pipeline).to_list(length=None)
+        analytics = await run_analytics(
+            "candidates", pipeline, f"candidates:{current_user.id}:{date_range}"
+        )
+        results = analytics["results"]
 
         # Calculate summary statistics
         total_candidates = len(results)
@@ -255,9 +312,13 @@ async def get_candidate_analytics(
                     position: len([r for r in results if r["position"] == position])
                     for position in set(r["position"] for r in results)
                 }
-            }
+            },
+            "source": analytics["source"],
+            "generated_at": analytics["generated_at"]
         }
 
+    except HTTPException as he:
+        raise he
     except Exception as e:
         logger.error(f"Failed to fetch candidate analytics: {str(e)}", exc_info=True)
         raise HTTPException(
@@ -272,9 +333,10 @@ async def export_reports(
         date_range: Optional[str] = Query("30days"),
         position: Optional[str] = Query("all"),
         status: Optional[str] = Query("all"),
+        compress: bool = Query(False, description="Download as a gzip file"),
         current_user: User = Depends(get_current_user)
 ):
-    """Export reports in specified format"""
+    """Export reports in specified format, streamed row by row"""
     try:
         logger.info(f"Exporting reports for HR user {current_user.id}")
 
@@ -284,54 +346,46 @@ async def export_reports(
                 detail="Not authorized to access this resource"
             )
 
-        # Get reports data
-        reports = await get_hr_reports(str(current_user.id), date_range, position, status)
+        # Open the report cursor; an export is all or nothing, so a timeout is not degraded
+        try:
+            reports = await stream_hr_reports(str(current_user.id), date_range, position, status, analytics=True)
+        except DEGRADED_ERRORS:
+            raise HTTPException(
+                status_code=503,
+                detail="The export took too long; try a shorter date range",
+                headers={"Retry-After": "60"}
+            )
 
+        filename = f"interview_reports_{datetime.now().strftime('%Y%m%d')}"
         if format == "csv":
-            # Convert to CSV format
-            import csv
-            import io
-
-            output = io.StringIO()
-            writer = csv.DictWriter(output, fieldnames=[
-                "candidate_name", "position", "date", "status",
-                "knowledge_score", "communication_score", "confidence_score"
-            ])
-
-            writer.writeheader()
-            for report in reports:
-                writer.writerow({
-                    "candidate_name": report["candidateName"],
-                    "position": report["position"],
-                    "date": report["date"],
-                    "status": report["status"],
-                    "knowledge_score": report["scores"]["knowledge"] if report["scores"] else None,
-                    "communication_score": report["scores"]["communication"] if report["scores"] else None,
-                    "confidence_score": report["scores"]["confidence"] if report["scores"] else None
-                })
-
-            return Response(
-                content=output.getvalue(),
-                media_type="text/csv",
-                headers={
-                    "Content-Disposition": f"attachment; filename=interview_reports_{datetime.now().strftime('%Y%m%d')}.csv"
-                }
-            )
+            chunks = csv_chunks(reports)
+            filename, media_type = f"{filename}.csv", "text/csv"
         else:
-            # Return JSON format
-            return {
-                "reports": reports,
+            chunks = json_chunks(reports, {
                 "generated_at": datetime.utcnow(),
                 "filters": {
                     "date_range": date_range,
                     "position": position,
                     "status": status
                 }
-            }
+            })
+            filename, media_type = f"{filename}.json", "application/json"
+
+        if compress:
+            chunks = gzip_chunks(chunks)
+            filename, media_type = f"{filename}.gz", "application/gzip"
 
+        return StreamingResponse(
+            chunks,
+            media_type=media_type,
+            headers={"Content-Disposition": f"attachment; filename={filename}"}
+        )
+
+    except HTTPException as he:
+        raise he
     except Exception as e:
         logger.error(f"Failed to export reports: {str(e)}", exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to export reports: {str(e)}"
-        )
\ No newline at end of file
+        )
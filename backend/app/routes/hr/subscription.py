@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 import logging
 from app.core.auth import get_current_user
+from app.core.deadline import DeadlineRoute
 from app.schemas.user import User
 from app.schemas.subscription import Subscription, SubscriptionCreate, SubscriptionUpdate, PaymentMethodUpdate
 from app.services.subscription import (
@@ -12,7 +13,7 @@ from app.services.subscription import (
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-router = APIRouter()
+router = APIRouter(route_class=DeadlineRoute)
 
 
 @router.get("/", response_model=Subscription)
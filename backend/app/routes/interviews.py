@@ -1,7 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Query, Response
+from typing import List, Optional
 import logging
 from app.core.auth import get_current_user
+from app.core.deadline import DeadlineRoute
+from app.core.config import settings
+from app.core.pagination import set_pagination_headers
 from app.schemas.interview import Interview, InterviewCreate
 from app.services.interview import create_interview, get_user_interviews, get_interview
 from app.services.openai import generate_questions, analyze_response
@@ -12,7 +15,7 @@ from bson import ObjectId
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-router = APIRouter()
+router = APIRouter(route_class=DeadlineRoute)
 
 
 @router.post("/start")
@@ -45,12 +48,21 @@ async def start_interview(
 
 
 @router.get("/history")
-async def get_interview_history(current_user: User = Depends(get_current_user)):
+async def get_interview_history(
+        response: Response,
+        limit: Optional[int] = Query(None, ge=1, le=settings.MAX_PAGE_SIZE),
+        cursor: Optional[str] = None,
+        include_total: bool = False,
+        current_user: User = Depends(get_current_user)
+):
     try:
         logger.info(f"Fetching interview history for user {current_user.id}")
-        interviews = await get_user_interviews(str(current_user.id))
-        logger.info(f"Found {len(interviews)} interviews")
-        return interviews
+        page = await get_user_interviews(str(current_user.id), limit, cursor, include_total)
+        logger.info(f"Found {len(page['items'])} interviews")
+        set_pagination_headers(response, page)
+        return page["items"]
+    except HTTPException as he:
+        raise he
     except Exception as e:
         logger.error(f"Failed to fetch interview history: {str(e)}", exc_info=True)
         raise HTTPException(
@@ -5,6 +5,7 @@ from app.models.subscription_plan import SubscriptionPlan
 from bson import ObjectId
 from datetime import datetime
 from app.core.auth import get_current_user
+from app.core.deadline import DeadlineRoute
 from app.schemas.user import User
 from app.services.subscription import get_user_subscription
 
@@ -12,7 +13,7 @@ from app.services.subscription import get_user_subscription
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-router = APIRouter()
+router = APIRouter(route_class=DeadlineRoute)
 
 
 @router.get("/")
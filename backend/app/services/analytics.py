@@ -0,0 +1,66 @@
+import logging
+from datetime import datetime
+import pymongo
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+from pymongo import ReadPreference
+from pymongo.errors import ConnectionFailure, ExecutionTimeout
+from pymongo.read_preferences import SecondaryPreferred
+from app.core.cache import cache
+from app.core.config import settings
+from app.db.mongodb import db
+
+logger = logging.getLogger(__name__)
+
+# Errors after which an analytics query serves its last complete result instead
+DEGRADED_ERRORS = (ExecutionTimeout, ConnectionFailure)
+
+
+def analytics_read_preference():
+    if not settings.ANALYTICS_READ_FROM_SECONDARIES:
+        return ReadPreference.PRIMARY
+    return SecondaryPreferred(max_staleness=settings.ANALYTICS_MAX_STALENESS_SECONDS)
+
+
+def analytics_collection(collection_name: str):
+    """A collection handle that reads from secondaries within the staleness bound"""
+    return db.database.get_collection(collection_name, read_preference=analytics_read_preference())
+
+
+def _encode(results: list) -> list:
+    return jsonable_encoder(results, custom_encoder={ObjectId: str})
+
+
+def _cache_key(key: str) -> str:
+    return f"analytics:{key}"
+
+
+async def run_analytics(collection_name: str, pipeline: list, cache_key: str, max_time_ms: int = None) -> dict:
+    """Run an aggregation under the analytics profile and remember the result.
+
+    Returns {"results", "generated_at", "source"}. The source is "live" when
+    the query completed, "cached" for the last complete result when the query
+    ran out of time or no member was reachable, and "partial" for whatever
+    had arrived by then when nothing was cached.
+    """
+    results = []
+    try:
+        # Nested in a request the shorter of this budget and the request deadline applies
+        with pymongo.timeout((max_time_ms or settings.ANALYTICS_MAX_TIME_MS) / 1000):
+            cursor = analytics_collection(collection_name).aggregate(
+                pipeline,
+                allowDiskUse=True,
+                batchSize=settings.ANALYTICS_BATCH_SIZE
+            )
+            async for doc in cursor:
+                results.append(doc)
+    except DEGRADED_ERRORS as e:
+        logger.warning(f"Analytics query {cache_key} degraded: {str(e)}")
+        cached = await cache.get(_cache_key(cache_key))
+        if cached is not None:
+            return {**cached, "source": "cached"}
+        return {"results": _encode(results), "generated_at": datetime.utcnow().isoformat(), "source": "partial"}
+
+    outcome = {"results": _encode(results), "generated_at": datetime.utcnow().isoformat()}
+    await cache.set(_cache_key(cache_key), outcome, expire=settings.ANALYTICS_CACHE_TTL)
+    return {**outcome, "source": "live"}
@@ -0,0 +1,194 @@
+import zlib
+from datetime import datetime, timedelta
+from typing import Optional
+import bson
+from bson import Binary, ObjectId
+from pymongo import ReplaceOne
+from app.db.mongodb import db
+from app.core.config import settings
+
+# Cold documents are copied whole into "<collection>_archive" and replaced in
+# the hot collection by a stub that keeps only the fields listings, counters,
+# rollups, token lookups and question analytics read, plus `archived_at`. Detail reads of a stub
+# merge the archived copy back in, so callers never see the difference.
+ARCHIVE_SUFFIX = "_archive"
+ARCHIVED_FIELD = "archived_at"
+
+# Question analytics aggregate interviews server-side, where the archived copy
+# cannot be read; interview stubs keep what they need from `responses` here
+QUESTION_STATS_FIELD = "question_stats"
+
+
+def question_stats(responses) -> list:
+    """Per answered slot: the question, its knowledge score and whether it got an answer"""
+    if isinstance(responses, dict):
+        responses = list(responses.values())
+    return [
+        {
+            "question": response.get("question"),
+            "analysis": {"knowledge_score": (response.get("analysis") or {}).get("knowledge_score")},
+            "answered": bool(response.get("response"))
+        }
+        for response in responses or [] if isinstance(response, dict)
+    ]
+
+
+# Per collection: which documents are cold, which fields the stub keeps (plus
+# any it derives), and which fields must be unchanged since the read for the
+# stub to replace it
+ARCHIVE_POLICIES = {
+    "interview_links": {
+        "description": "expired links that were never completed",
+        "query": lambda now: {
+            "completed": {"$ne": True},
+            "expires_at": {"$lt": now - timedelta(days=settings.ARCHIVE_EXPIRED_LINKS_AFTER_DAYS)}
+        },
+        "stub_fields": (
+            "hr_id", "organization_id", "candidate_name", "candidate_email", "position", "topic", "token", "expires_at",
+            "completed", "sent_count", "started_at", "search_prefixes", "created_at", "updated_at"
+        ),
+        "guard_fields": ("completed", "updated_at")
+    },
+    "interviews": {
+        "description": "interviews older than the retention period",
+        "query": lambda now: {
+            "created_at": {"$lt": now - timedelta(days=settings.ARCHIVE_INTERVIEWS_AFTER_DAYS)}
+        },
+        # schema_version describes `responses`, which only the archived copy has
+        "stub_fields": (
+            "user_id", "hr_id", "organization_id", "link_id", "candidate_id", "candidate_name", "candidate_email",
+            "position", "topic", "duration", "completed", "status", "knowledge_score", "communication_score",
+            "confidence_score", "analysis_status", "analyzed_at", "completed_at", "created_at", "updated_at"
+        ),
+        "derived_fields": lambda doc: {QUESTION_STATS_FIELD: question_stats(doc.get("responses"))},
+        "guard_fields": ("analysis_status", "analyzed_at", "updated_at")
+    }
+}
+
+
+def archive_collection_name(collection_name: str) -> str:
+    return f"{collection_name}{ARCHIVE_SUFFIX}"
+
+
+def _pack(doc: dict, archived_at: datetime, compress: bool) -> dict:
+    packed = {"_id": doc["_id"], "hr_id": doc.get("hr_id"), "organization_id": doc.get("organization_id"),
+              ARCHIVED_FIELD: archived_at}
+    if compress:
+        packed["zlib"] = Binary(zlib.compress(bson.encode(doc)))
+    else:
+        packed["document"] = doc
+    return packed
+
+
+def _unpack(packed: dict) -> dict:
+    if "zlib" in packed:
+        return bson.decode(zlib.decompress(packed["zlib"]))
+    return packed["document"]
+
+
+def _stub(doc: dict, policy: dict, archived_at: datetime) -> dict:
+    stub = {field: doc[field] for field in policy["stub_fields"] if field in doc}
+    if "derived_fields" in policy:
+        stub.update(policy["derived_fields"](doc))
+    stub[ARCHIVED_FIELD] = archived_at
+    return stub
+
+
+async def archive_batch(database, collection_name: str, batch_size: int,
+                        compress: bool = True, now: Optional[datetime] = None) -> int:
+    """Move the next batch of cold documents of a collection to its archive.
+
+    The archive copy is written first and the stub only replaces the hot
+    document if none of the policy's guard fields changed in between, so a
+    concurrent write is never lost; that document is picked up again on a
+    later run. Returns the number of documents stubbed.
+    """
+    policy = ARCHIVE_POLICIES[collection_name]
+    now = now or datetime.utcnow()
+    query = {ARCHIVED_FIELD: None, **policy["query"](now)}
+    docs = await database[collection_name].find(query).limit(batch_size).to_list(length=batch_size)
+    if not docs:
+        return 0
+
+    await database[archive_collection_name(collection_name)].bulk_write(
+        [ReplaceOne({"_id": doc["_id"]}, _pack(doc, now, compress), upsert=True) for doc in docs],
+        ordered=False
+    )
+
+    stubs = []
+    for doc in docs:
+        guard = {field: doc.get(field) for field in policy["guard_fields"]}
+        stubs.append(ReplaceOne({"_id": doc["_id"], ARCHIVED_FIELD: None, **guard}, _stub(doc, policy, now)))
+    result = await database[collection_name].bulk_write(stubs, ordered=False)
+    return result.modified_count
+
+
+async def backfill_question_stats(database) -> int:
+    """Derive question_stats for interview stubs archived before stubs kept them"""
+    updated = 0
+    archive = database[archive_collection_name("interviews")]
+    async for stub in database.interviews.find(
+        {ARCHIVED_FIELD: {"$ne": None}, QUESTION_STATS_FIELD: None}, {"_id": 1}
+    ):
+        packed = await archive.find_one({"_id": stub["_id"]})
+        if not packed:
+            continue
+        archived = _unpack(packed)
+        result = await database.interviews.update_one(
+            {"_id": stub["_id"], ARCHIVED_FIELD: {"$ne": None}},
+            {"$set": {QUESTION_STATS_FIELD: question_stats(archived.get("responses"))}}
+        )
+        updated += result.modified_count
+    return updated
+
+
+async def count_cold_documents(database, collection_name: str, now: Optional[datetime] = None) -> int:
+    policy = ARCHIVE_POLICIES[collection_name]
+    return await database[collection_name].count_documents(
+        {ARCHIVED_FIELD: None, **policy["query"](now or datetime.utcnow())}
+    )
+
+
+async def read_through(collection_name: str, doc: Optional[dict]) -> Optional[dict]:
+    """Complete an archived stub with its archived copy; other documents pass through"""
+    if not doc or not doc.get(ARCHIVED_FIELD):
+        return doc
+    packed = await db.database[archive_collection_name(collection_name)].find_one({"_id": ObjectId(doc["_id"])})
+    if not packed:
+        return doc
+    return merge_stub(collection_name, _unpack(packed), doc)
+
+
+def merge_stub(collection_name: str, archived: dict, stub: dict) -> dict:
+    """The archived copy with the stub's fields applied.
+
+    Only fields the policy keeps on stubs may have changed after archival, so
+    only those win; anything else on the stub (such as a value a migration
+    derived from a field the stub never had) cannot mask the archived data.
+    """
+    kept = {field: stub[field] for field in ARCHIVE_POLICIES[collection_name]["stub_fields"] if field in stub}
+    return {**archived, **kept, "_id": stub["_id"], ARCHIVED_FIELD: stub[ARCHIVED_FIELD]}
+
+
+async def restore_archived(collection_name: str, object_id) -> Optional[dict]:
+    """Move an archived document back into the hot collection before it is modified.
+
+    Returns the restored document, or None when it is not archived.
+    """
+    object_id = ObjectId(object_id)
+    stub = await db.database[collection_name].find_one({"_id": object_id, ARCHIVED_FIELD: {"$ne": None}})
+    doc = await read_through(collection_name, stub)
+    if not doc:
+        return None
+    doc.pop(ARCHIVED_FIELD, None)
+    result = await db.database[collection_name].replace_one(
+        {"_id": object_id, ARCHIVED_FIELD: stub[ARCHIVED_FIELD]}, doc
+    )
+    if result.modified_count:
+        await db.database[archive_collection_name(collection_name)].delete_one({"_id": object_id})
+    return doc
+
+
+async def discard_archived(collection_name: str, object_id):
+    """Delete the archived copy of a document whose stub was deleted"""
+    await db.database[archive_collection_name(collection_name)].delete_one({"_id": ObjectId(object_id)})
@@ -1,7 +1,14 @@
 from datetime import datetime
+from typing import Optional
 from bson import ObjectId
+from fastapi import HTTPException
 from app.db.mongodb import db
+from app.db.loader import load_by_id, forget_loaded
+from app.db.tenancy import tenant_fields, tenant_filter
+from app.core.pagination import paginate
 from app.schemas.candidate import CandidateCreate, CandidateUpdate
+from app.services.hr_stats import bump_collection_versions, CANDIDATES_COUNTER
+from app.services.search import SEARCH_FIELDS, search_fields, search_filter, touches_search_fields
 
 
 async def create_candidate(candidate_in: CandidateCreate, hr_id: str):
@@ -14,12 +21,15 @@ async def create_candidate(candidate_in: CandidateCreate, hr_id: str):
             "interview_count": 0,
             "last_activity": None,
             "hr_id": ObjectId(hr_id),
+            **tenant_fields(),
             "created_at": datetime.utcnow(),
             "updated_at": datetime.utcnow()
         }
+        candidate_data.update(search_fields("candidates", candidate_data))
 
         result = await db.database.candidates.insert_one(candidate_data)
         candidate_data["_id"] = result.inserted_id
+        await bump_collection_versions(hr_id, "candidates", counters={CANDIDATES_COUNTER: 1})
 
         # Convert ObjectId to string for response
         candidate_data["_id"] = str(candidate_data["_id"])
@@ -30,23 +40,64 @@ async def create_candidate(candidate_in: CandidateCreate, hr_id: str):
         raise Exception(f"Failed to create candidate: {str(e)}")
 
 
-async def get_candidates(hr_id: str):
+# Fields shown in candidate lists; search_prefixes is only read by the index
+CANDIDATE_LIST_PROJECTION = {
+    "name": 1,
+    "email": 1,
+    "position": 1,
+    "status": 1,
+    "interview_count": 1,
+    "last_activity": 1,
+    "hr_id": 1,
+    "created_at": 1,
+    "updated_at": 1
+}
+
+
+async def get_candidates(hr_id: str, limit: Optional[int], cursor: Optional[str] = None, include_total: bool = False):
     try:
-        cursor = db.database.candidates.find({"hr_id": ObjectId(hr_id)}).sort("created_at", -1)
-        candidates = []
-        async for doc in cursor:
+        page = await paginate(
+            db.database.candidates,
+            tenant_filter({"hr_id": ObjectId(hr_id)}),
+            limit,
+            cursor,
+            projection=CANDIDATE_LIST_PROJECTION,
+            include_total=include_total
+        )
+        for doc in page["items"]:
             # Convert ObjectId to string
             doc["_id"] = str(doc["_id"])
             doc["hr_id"] = str(doc["hr_id"])
-            candidates.append(doc)
-        return candidates
+        return page
+    except HTTPException:
+        raise
     except Exception as e:
         raise Exception(f"Failed to fetch candidates: {str(e)}")
 
 
+async def search_candidates(hr_id: Optional[str], q: str, mode: str, limit: int, cursor: Optional[str] = None):
+    """Candidates matching `q`, newest first; organization-wide when `hr_id` is None"""
+    try:
+        page = await paginate(
+            db.database.candidates,
+            search_filter(q, mode, hr_id),
+            limit,
+            cursor,
+            projection=CANDIDATE_LIST_PROJECTION
+        )
+        for doc in page["items"]:
+            doc["_id"] = str(doc["_id"])
+            doc["hr_id"] = str(doc["hr_id"])
+        return page
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise Exception(f"Failed to search candidates: {str(e)}")
+
+
 async def get_candidate(candidate_id: str):
     try:
-        candidate = await db.database.candidates.find_one({"_id": ObjectId(candidate_id)})
+        candidate = await load_by_id("candidates", candidate_id)
         if candidate:
             # Convert ObjectId to string
             candidate["_id"] = str(candidate["_id"])
@@ -65,10 +116,22 @@ async def update_candidate(candidate_id: str, candidate_in: CandidateUpdate):
             # No fields to update
             return await get_candidate(candidate_id)
 
-        await db.database.candidates.update_one(
+        # Renames re-derive the search prefixes from the merged fields
+        if touches_search_fields("candidates", update_data):
+            current = await db.database.candidates.find_one(
+                {"_id": ObjectId(candidate_id)},
+                {field: 1 for field in SEARCH_FIELDS["candidates"]}
+            ) or {}
+            update_data.update(search_fields("candidates", {**current, **update_data}))
+
+        candidate = await db.database.candidates.find_one_and_update(
             {"_id": ObjectId(candidate_id)},
-            {"$set": update_data}
+            {"$set": update_data},
+            projection={"hr_id": 1}
         )
+        forget_loaded("candidates", candidate_id)
+        if candidate:
+            await bump_collection_versions(str(candidate["hr_id"]), "candidates")
 
         return await get_candidate(candidate_id)
     except Exception as e:
@@ -77,7 +140,13 @@ async def update_candidate(candidate_id: str, candidate_in: CandidateUpdate):
 
 async def delete_candidate(candidate_id: str):
     try:
-        await db.database.candidates.delete_one({"_id": ObjectId(candidate_id)})
+        candidate = await db.database.candidates.find_one_and_delete(
+            {"_id": ObjectId(candidate_id)},
+            projection={"hr_id": 1}
+        )
+        forget_loaded("candidates", candidate_id)
+        if candidate:
+            await bump_collection_versions(str(candidate["hr_id"]), "candidates", counters={CANDIDATES_COUNTER: -1})
         return True
     except Exception as e:
         raise Exception(f"Failed to delete candidate: {str(e)}")
@@ -85,13 +154,17 @@ async def delete_candidate(candidate_id: str):
 
 async def update_candidate_activity(candidate_id: str):
     try:
-        await db.database.candidates.update_one(
+        candidate = await db.database.candidates.find_one_and_update(
             {"_id": ObjectId(candidate_id)},
             {
                 "$set": {"last_activity": datetime.utcnow()},
                 "$inc": {"interview_count": 1}
-            }
+            },
+            projection={"hr_id": 1}
         )
+        forget_loaded("candidates", candidate_id)
+        if candidate:
+            await bump_collection_versions(str(candidate["hr_id"]), "candidates")
         return True
     except Exception as e:
         raise Exception(f"Failed to update candidate activity: {str(e)}")
\ No newline at end of file
@@ -0,0 +1,235 @@
+import math
+from datetime import datetime, timedelta
+from typing import Optional
+from bson import ObjectId
+from pymongo import ReplaceOne
+from app.db.mongodb import db
+
+# One hr_daily_stats document per HR and UTC day, with _id "<hr_id>:<YYYY-MM-DD>"
+# so a date window is a single range read on _id. Each document holds the
+# day's totals and the same metrics per position:
+#
+#   links, completed_links       links created that day, and how many completed
+#   interviews, duration_ms      interviews started that day, and their total duration
+#   scored, <score>_sum/_sq      analyzed interviews, score sums and sums of squares
+#
+# Link metrics are keyed by the link's creation day and interview metrics by
+# the interview's start day, matching how the windowed reports filter them.
+DAY_FORMAT = "%Y-%m-%d"
+SCORE_FIELDS = ("knowledge", "communication", "confidence")
+MAX_WINDOW_DAYS = 90
+
+
+def _day_key(hr_id, day: datetime) -> str:
+    return f"{hr_id}:{day.strftime(DAY_FORMAT)}"
+
+
+def _position_key(position: str) -> str:
+    # Field names cannot contain "." or start with "$"
+    return (position or "unknown").replace(".", "．").replace("$", "＄")
+
+
+def _position_name(key: str) -> str:
+    return key.replace("．", ".").replace("＄", "$")
+
+
+async def _increment(hr_id, day: datetime, position: str, metrics: dict):
+    increments = {}
+    for name, delta in metrics.items():
+        increments[f"totals.{name}"] = delta
+        increments[f"positions.{_position_key(position)}.{name}"] = delta
+
+    await db.database.hr_daily_stats.update_one(
+        {"_id": _day_key(hr_id, day)},
+        {
+            "$inc": increments,
+            "$setOnInsert": {
+                "hr_id": ObjectId(hr_id),
+                "day": datetime(day.year, day.month, day.day)
+            }
+        },
+        upsert=True
+    )
+
+
+def _score_metrics(scores: dict, sign: int = 1) -> dict:
+    metrics = {"scored": sign}
+    for field in SCORE_FIELDS:
+        value = scores[f"{field}_score"]
+        metrics[f"{field}_sum"] = sign * value
+        metrics[f"{field}_sq"] = sign * value * value
+    return metrics
+
+
+def _has_scores(doc: Optional[dict]) -> bool:
+    return bool(doc) and all(isinstance(doc.get(f"{field}_score"), (int, float)) for field in SCORE_FIELDS)
+
+
+async def record_link_created(hr_id, position: str, created_at: datetime):
+    await _increment(hr_id, created_at, position, {"links": 1})
+
+
+async def record_link_deleted(hr_id, position: str, created_at: datetime, completed: bool):
+    await _increment(hr_id, created_at, position, {"links": -1, "completed_links": -1 if completed else 0})
+
+
+async def record_link_position_changed(hr_id, old_position: str, new_position: str,
+                                       created_at: datetime, completed: bool):
+    await record_link_deleted(hr_id, old_position, created_at, completed)
+    await _increment(hr_id, created_at, new_position, {"links": 1, "completed_links": 1 if completed else 0})
+
+
+async def record_interview_completed(hr_id, position: str, link_created_at: datetime,
+                                     started_at: datetime, completed_at: datetime):
+    await _increment(hr_id, link_created_at, position, {"completed_links": 1})
+    await _increment(hr_id, started_at, position, {
+        "interviews": 1,
+        "duration_ms": (completed_at - started_at) // timedelta(milliseconds=1)
+    })
+
+
+async def record_interview_analyzed(previous: dict, scores: dict):
+    """Add an analyzed interview's scores; `previous` is the pre-update document.
+
+    Re-analysis replaces the scores recorded earlier instead of adding to them.
+    Interviews that do not belong to an HR are ignored.
+    """
+    if not previous or not previous.get("hr_id"):
+        return
+    metrics = _score_metrics(scores)
+    if _has_scores(previous):
+        for name, delta in _score_metrics(previous, sign=-1).items():
+            metrics[name] += delta
+    await _increment(previous["hr_id"], previous["created_at"], previous.get("position"), metrics)
+
+
+async def get_daily_stats(hr_id: str, start: datetime, end: datetime) -> list:
+    """The rollup documents of the days in [start, end], at most MAX_WINDOW_DAYS of them"""
+    start = max(start, end - timedelta(days=MAX_WINDOW_DAYS - 1))
+    cursor = db.database.hr_daily_stats.find(
+        {"_id": {"$gte": _day_key(hr_id, start), "$lte": _day_key(hr_id, end)}}
+    )
+    return await cursor.to_list(length=MAX_WINDOW_DAYS)
+
+
+def merge_daily_stats(days: list, position: Optional[str] = None) -> dict:
+    """Sum the metrics of several days, optionally for one position only"""
+    merged = {}
+    for day in days:
+        if position is None:
+            metrics = day.get("totals", {})
+        else:
+            metrics = day.get("positions", {}).get(_position_key(position), {})
+        for name, value in metrics.items():
+            merged[name] = merged.get(name, 0) + value
+    return merged
+
+
+def merge_positions(days: list) -> dict:
+    """Sum the metrics of several days per position"""
+    positions = {}
+    for day in days:
+        for key, metrics in day.get("positions", {}).items():
+            merged = positions.setdefault(_position_name(key), {})
+            for name, value in metrics.items():
+                merged[name] = merged.get(name, 0) + value
+    return positions
+
+
+def score_summary(metrics: dict) -> dict:
+    """Mean and standard deviation of each score from summed metrics"""
+    scored = metrics.get("scored", 0)
+    summary = {}
+    for field in SCORE_FIELDS:
+        if not scored:
+            summary[field] = {"avg": None, "stddev": None}
+            continue
+        mean = metrics.get(f"{field}_sum", 0) / scored
+        variance = max(metrics.get(f"{field}_sq", 0) / scored - mean * mean, 0)
+        summary[field] = {"avg": mean, "stddev": math.sqrt(variance)}
+    return summary
+
+
+async def rebuild_daily_stats(database, hr_id: Optional[ObjectId] = None) -> int:
+    """Recompute the rollup from interview_links and interviews.
+
+    Rebuilds every HR, or only `hr_id`. Documents are replaced whole, so
+    increments that land while a day is being rebuilt may be lost; run the
+    rebuild when write traffic is low. Returns the number of day documents written.
+    """
+    started = datetime.utcnow()
+    scope = {"hr_id": {"$in": [hr_id, str(hr_id)]}} if hr_id else {"hr_id": {"$exists": True}}
+    dated = {**scope, "created_at": {"$type": "date"}}
+    day_of = {"$dateToString": {"format": DAY_FORMAT, "date": "$created_at"}}
+    days = {}
+
+    def add(group_id: dict, metrics: dict):
+        # Older interviews store hr_id as a string
+        day = days.setdefault((str(group_id["hr_id"]), group_id["day"]), {"totals": {}, "positions": {}})
+        position = day["positions"].setdefault(_position_key(group_id.get("position")), {})
+        for name, value in metrics.items():
+            day["totals"][name] = day["totals"].get(name, 0) + value
+            position[name] = position.get(name, 0) + value
+
+    links = database.interview_links.aggregate([
+        {"$match": dated},
+        {
+            "$group": {
+                "_id": {"hr_id": "$hr_id", "day": day_of, "position": "$position"},
+                "links": {"$sum": 1},
+                "completed_links": {"$sum": {"$cond": [{"$eq": ["$completed", True]}, 1, 0]}}
+            }
+        }
+    ], allowDiskUse=True)
+    async for group in links:
+        add(group["_id"], {"links": group["links"], "completed_links": group["completed_links"]})
+
+    has_scores = {"$and": [{"$isNumber": f"${field}_score"} for field in SCORE_FIELDS]}
+    score_sums = {}
+    for field in SCORE_FIELDS:
+        score_sums[f"{field}_sum"] = {"$sum": {"$cond": [has_scores, f"${field}_score", 0]}}
+        score_sums[f"{field}_sq"] = {"$sum": {"$cond": [
+            has_scores, {"$multiply": [f"${field}_score", f"${field}_score"]}, 0
+        ]}}
+    interviews = database.interviews.aggregate([
+        {"$match": dated},
+        {
+            "$group": {
+                "_id": {"hr_id": "$hr_id", "day": day_of, "position": "$position"},
+                "interviews": {"$sum": {"$cond": [{"$eq": [{"$type": "$completed_at"}, "date"]}, 1, 0]}},
+                "duration_ms": {"$sum": {"$cond": [
+                    {"$eq": [{"$type": "$completed_at"}, "date"]},
+                    {"$subtract": ["$completed_at", "$created_at"]},
+                    0
+                ]}},
+                "scored": {"$sum": {"$cond": [has_scores, 1, 0]}},
+                **score_sums
+            }
+        }
+    ], allowDiskUse=True)
+    async for group in interviews:
+        add(group["_id"], {name: value for name, value in group.items() if name != "_id"})
+
+    requests = [
+        ReplaceOne(
+            {"_id": f"{hr}:{day}"},
+            {"hr_id": ObjectId(hr), "day": datetime.strptime(day, DAY_FORMAT), "rebuilt_at": started, **metrics},
+            upsert=True
+        )
+        for (hr, day), metrics in days.items()
+    ]
+    for start in range(0, len(requests), 1000):
+        await database.hr_daily_stats.bulk_write(requests[start:start + 1000], ordered=False)
+
+    # Days rebuilt earlier that no longer have any source documents
+    await database.hr_daily_stats.delete_many({
+        "hr_id": hr_id if hr_id else {"$exists": True},
+        "rebuilt_at": {"$lt": started}
+    })
+
+    # Report stats are served from the rollup, so their ETags must change with it
+    await database.hr_stats.update_many(
+        {"_id": hr_id} if hr_id else {},
+        {"$inc": {"versions.interviews": 1}}
+    )
+    return len(requests)
@@ -0,0 +1,78 @@
+import asyncio
+from datetime import datetime, timedelta
+from app.services.daily_stats import get_daily_stats, merge_daily_stats, merge_positions, score_summary
+from app.services.hr_stats import get_headline_stats
+
+TREND_WEEKS = 4
+
+
+def _trends(days: list, now: datetime) -> list:
+    """Completed links per week, week 0 being the most recent seven days"""
+    today = datetime(now.year, now.month, now.day)
+    weekly = {}
+    for day in days:
+        week = (today - day["day"]).days // 7
+        weekly[week] = weekly.get(week, 0) + day.get("totals", {}).get("completed_links", 0)
+
+    return [
+        {
+            "period": f"Week {TREND_WEEKS - i}",
+            "completed": weekly.get(i, 0),
+            "start_date": now - timedelta(days=7 * (i + 1)),
+            "end_date": now - timedelta(days=7 * i)
+        }
+        for i in range(TREND_WEEKS)
+    ]
+
+
+async def get_hr_dashboard_stats(hr_id: str):
+    try:
+        now = datetime.utcnow()
+        thirty_days_ago = now - timedelta(days=30)
+
+        # Headline counts come from one point read and windowed figures from
+        # at most 30 daily rollup documents
+        headline, days = await asyncio.gather(
+            get_headline_stats(hr_id),
+            get_daily_stats(hr_id, thirty_days_ago, now)
+        )
+
+        recent = merge_daily_stats(days)
+
+        average_score = 0
+        if recent.get("scored"):
+            score_sum = recent["knowledge_sum"] + recent["communication_sum"] + recent["confidence_sum"]
+            average_score = round(score_sum / (3 * recent["scored"]), 1)
+
+        completion_rate = 0
+        if recent.get("links"):
+            completion_rate = round((recent.get("completed_links", 0) / recent["links"]) * 100, 1)
+
+        average_response_time = 0
+        if recent.get("interviews"):
+            average_response_time = round(recent["duration_ms"] / recent["interviews"] / 60000)
+
+        position_stats = [
+            {
+                "_id": position,
+                "count": metrics.get("links", 0),
+                "completed": metrics.get("completed_links", 0),
+                "avg_score": score_summary(metrics)["knowledge"]["avg"]
+            }
+            for position, metrics in merge_positions(days).items()
+            if metrics.get("links", 0) > 0
+        ]
+
+        return {
+            "total_candidates": headline["total_candidates"],
+            "active_interviews": headline["active_interviews"],
+            "completed_interviews": headline["completed_interviews"],
+            "links_this_month": headline["links_this_month"],
+            "average_score": average_score,
+            "completion_rate": completion_rate,
+            "position_stats": position_stats,
+            "average_response_time": average_response_time,
+            "trends": _trends(days, now)
+        }
+    except Exception as e:
+        raise Exception(f"Failed to fetch dashboard stats: {str(e)}")
@@ -0,0 +1,77 @@
+import csv
+import io
+import json
+import zlib
+from datetime import datetime
+from typing import AsyncIterator
+
+# Encoded rows are sent in chunks of about this many bytes, so memory stays
+# flat however many rows an export has
+EXPORT_CHUNK_BYTES = 64 * 1024
+
+REPORT_CSV_FIELDS = [
+    "candidate_name", "position", "date", "status",
+    "knowledge_score", "communication_score", "confidence_score"
+]
+
+
+def report_csv_row(report: dict) -> dict:
+    scores = report["scores"]
+    return {
+        "candidate_name": report["candidateName"],
+        "position": report["position"],
+        "date": report["date"],
+        "status": report["status"],
+        "knowledge_score": scores["knowledge"] if scores else None,
+        "communication_score": scores["communication"] if scores else None,
+        "confidence_score": scores["confidence"] if scores else None
+    }
+
+
+async def csv_chunks(reports: AsyncIterator[dict]) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=REPORT_CSV_FIELDS)
+    writer.writeheader()
+    async for report in reports:
+        writer.writerow(report_csv_row(report))
+        if buffer.tell() >= EXPORT_CHUNK_BYTES:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode()
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+async def json_chunks(reports: AsyncIterator[dict], envelope: dict) -> AsyncIterator[bytes]:
+    """`envelope` as a JSON object whose "reports" array is filled row by row"""
+    head = json.dumps({**envelope, "reports": []}, default=_json_default)
+    # Everything up to the empty array's closing bracket opens the document
+    opening, closing = head[:-2], head[-2:]
+    parts = [opening]
+    size = len(opening)
+    separator = ""
+    async for report in reports:
+        encoded = separator + json.dumps(report, default=_json_default)
+        separator = ","
+        parts.append(encoded)
+        size += len(encoded)
+        if size >= EXPORT_CHUNK_BYTES:
+            yield "".join(parts).encode()
+            parts, size = [], 0
+    parts.append(closing)
+    yield "".join(parts).encode()
+
+
+async def gzip_chunks(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Gzip a byte stream on the fly, as a downloadable .gz file"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    async for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
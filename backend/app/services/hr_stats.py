@@ -0,0 +1,144 @@
+from datetime import datetime
+from typing import Optional
+from bson import ObjectId
+from app.db.mongodb import db
+
+# Headline counters live next to the version counters in each HR's hr_stats
+# document. Open links are bucketed by the hour they expire in, so the number
+# of active links is the sum of the buckets that have not expired yet.
+COUNTERS_FIELD = "counters"
+EXPIRY_BUCKET_FORMAT = "%Y%m%d%H"
+MONTH_BUCKET_FORMAT = "%Y-%m"
+CANDIDATES_COUNTER = f"{COUNTERS_FIELD}.candidates"
+COMPLETED_LINKS_COUNTER = f"{COUNTERS_FIELD}.completed_links"
+
+
+def open_link_counter(expires_at: datetime) -> str:
+    return f"{COUNTERS_FIELD}.open_links_by_expiry.{expires_at.strftime(EXPIRY_BUCKET_FORMAT)}"
+
+
+def monthly_link_counter(created_at: datetime) -> str:
+    return f"{COUNTERS_FIELD}.links_by_month.{created_at.strftime(MONTH_BUCKET_FORMAT)}"
+
+
+async def bump_collection_versions(hr_id: str, *collections: str, counters: Optional[dict] = None):
+    """Increment the per-HR version counters of the given collections.
+
+    `counters` maps counter paths to deltas; they are applied in the same
+    atomic update as the version bump.
+    """
+    try:
+        increments = {f"versions.{name}": 1 for name in collections}
+        increments.update(counters or {})
+        # $inc is not idempotent, so it is only retried when nothing was written
+        await db.execute_with_retry(lambda: db.database.hr_stats.update_one(
+            {"_id": ObjectId(hr_id)},
+            {"$inc": increments},
+            upsert=True
+        ), idempotent=False)
+        return True
+    except Exception as e:
+        raise Exception(f"Failed to bump collection versions: {str(e)}")
+
+
+async def get_collection_versions(hr_id: str) -> dict:
+    """Get the per-HR version counters, keyed by collection name."""
+    try:
+        stats = await db.database.hr_stats.find_one(
+            {"_id": ObjectId(hr_id)},
+            {"versions": 1}
+        )
+        return (stats or {}).get("versions", {})
+    except Exception as e:
+        raise Exception(f"Failed to fetch collection versions: {str(e)}")
+
+
+async def get_headline_stats(hr_id: str) -> dict:
+    """Dashboard headline numbers from one point read of the HR's stats document."""
+    try:
+        stats = await db.execute_with_retry(lambda: db.database.hr_stats.find_one(
+            {"_id": ObjectId(hr_id)},
+            {COUNTERS_FIELD: 1}
+        ))
+        counters = (stats or {}).get(COUNTERS_FIELD, {})
+        now = datetime.utcnow()
+        current_hour = now.strftime(EXPIRY_BUCKET_FORMAT)
+
+        # Links expiring during the current hour still count as active
+        active_links = sum(
+            count for hour, count in counters.get("open_links_by_expiry", {}).items()
+            if hour >= current_hour
+        )
+
+        return {
+            "total_candidates": counters.get("candidates", 0),
+            "active_interviews": max(active_links, 0),
+            "completed_interviews": counters.get("completed_links", 0),
+            "links_this_month": counters.get("links_by_month", {}).get(now.strftime(MONTH_BUCKET_FORMAT), 0)
+        }
+    except Exception as e:
+        raise Exception(f"Failed to fetch headline stats: {str(e)}")
+
+
+async def compute_hr_counters(database, hr_id: ObjectId) -> dict:
+    """Recompute an HR's counters from the source collections"""
+    now = datetime.utcnow()
+    candidates = await database.candidates.count_documents({"hr_id": hr_id})
+    pipeline = [
+        {"$match": {"hr_id": hr_id}},
+        {
+            "$facet": {
+                "completed": [
+                    {"$match": {"completed": True}},
+                    {"$count": "count"}
+                ],
+                "open": [
+                    {"$match": {"completed": {"$ne": True}, "expires_at": {"$gte": now}}},
+                    {
+                        "$group": {
+                            "_id": {"$dateToString": {"format": EXPIRY_BUCKET_FORMAT, "date": "$expires_at"}},
+                            "count": {"$sum": 1}
+                        }
+                    }
+                ],
+                "monthly": [
+                    {
+                        "$group": {
+                            "_id": {"$dateToString": {"format": MONTH_BUCKET_FORMAT, "date": "$created_at"}},
+                            "count": {"$sum": 1}
+                        }
+                    }
+                ]
+            }
+        }
+    ]
+    links = (await database.interview_links.aggregate(pipeline).to_list(length=1))[0]
+
+    return {
+        "candidates": candidates,
+        "completed_links": links["completed"][0]["count"] if links["completed"] else 0,
+        "open_links_by_expiry": {bucket["_id"]: bucket["count"] for bucket in links["open"]},
+        "links_by_month": {bucket["_id"]: bucket["count"] for bucket in links["monthly"]}
+    }
+
+
+async def reconcile_hr_counters(database, user_filter: Optional[dict] = None) -> int:
+    """Overwrite every HR's counters with freshly computed values.
+
+    Repairs drift from failed or interleaved writes and prunes expired
+    buckets. `user_filter` limits it to the HRs whose data is in `database`.
+    Returns the number of HR stats documents whose counters changed.
+    """
+    repaired = 0
+    query = {**(user_filter or {}), "role": {"$in": ["hr", "admin"]}}
+    async for user in database.users.find(query, {"_id": 1}):
+        counters = await compute_hr_counters(database, user["_id"])
+        previous = await database.hr_stats.find_one_and_update(
+            {"_id": user["_id"]},
+            {"$set": {COUNTERS_FIELD: counters, "counters_reconciled_at": datetime.utcnow()}},
+            projection={COUNTERS_FIELD: 1},
+            upsert=True
+        )
+        if (previous or {}).get(COUNTERS_FIELD) != counters:
+            repaired += 1
+    return repaired
@@ -1,19 +1,92 @@
 from datetime import datetime
+from typing import Optional
 from bson import ObjectId
+from fastapi import HTTPException
 from app.db.mongodb import db
+from app.db.loader import load_by_id
+from app.db.tenancy import tenant_fields, tenant_filter
+from app.services.archive import ARCHIVED_FIELD, read_through
+from app.core.pagination import paginate
 from app.schemas.interview import InterviewCreate
 
+# Version 2 stores `responses` as an array indexed by question number.
+# Version 1 documents (no schema_version) store an object keyed by the index
+# as a string; readers accept both until `python -m app.migrate_responses`
+# has converted every document.
+INTERVIEW_SCHEMA_VERSION = 2
+
+
+def responses_array_expression(field: str = "$responses") -> dict:
+    """Aggregation expression evaluating `field` as a version 2 responses array.
+
+    Arrays pass through, index-keyed objects become arrays ordered by index
+    with null in unanswered slots, and a missing field becomes [].
+    """
+    entries = {"$map": {
+        "input": {"$objectToArray": field},
+        "in": {"index": {"$toInt": "$$this.k"}, "value": "$$this.v"}
+    }}
+    from_object = {"$let": {
+        "vars": {"entries": entries},
+        "in": {"$cond": [
+            {"$eq": [{"$size": "$$entries"}, 0]},
+            [],
+            {"$map": {
+                "input": {"$range": [0, {"$add": [{"$max": "$$entries.index"}, 1]}]},
+                "as": "slot",
+                "in": {"$first": {"$map": {
+                    "input": {"$filter": {"input": "$$entries", "cond": {"$eq": ["$$this.index", "$$slot"]}}},
+                    "in": "$$this.value"
+                }}}
+            }}
+        ]}
+    }}
+    return {"$switch": {
+        "branches": [
+            {"case": {"$isArray": field}, "then": field},
+            {"case": {"$eq": [{"$type": field}, "object"]}, "then": from_object}
+        ],
+        "default": []
+    }}
+
+
+def normalize_responses(responses) -> list:
+    """Python counterpart of `responses_array_expression` for loaded documents"""
+    if isinstance(responses, list):
+        return responses
+    if not responses:
+        return []
+    indexed = {int(index): response for index, response in responses.items()}
+    return [indexed.get(index) for index in range(max(indexed) + 1)]
+
+
+# Fields shown in interview lists; questions, responses and the feedback
+# markdown are only loaded by the detail endpoints
+INTERVIEW_LIST_PROJECTION = {
+    "topic": 1,
+    "duration": 1,
+    "knowledge_score": 1,
+    "communication_score": 1,
+    "confidence_score": 1,
+    "analysis_status": 1,
+    "analyzed_at": 1,
+    "created_at": 1
+}
+
 
 async def create_interview(interview_in: InterviewCreate, user_id: str):
     try:
         interview_data = {
             "user_id": user_id,
+            **tenant_fields(),
             "topic": interview_in.topic,
             "duration": interview_in.duration,
             "knowledge_score": interview_in.knowledge_score,
             "communication_score": interview_in.communication_score,
             "confidence_score": interview_in.confidence_score,
             "feedback": interview_in.feedback,
+            "responses": [],
+            "schema_version": INTERVIEW_SCHEMA_VERSION,
             "created_at": datetime.utcnow()
         }
 
@@ -28,25 +101,103 @@ async def create_interview(interview_in: InterviewCreate, user_id: str):
         raise Exception(f"Failed to create interview: {str(e)}")
 
 
-async def get_user_interviews(user_id: str):
+async def get_user_interviews(user_id: str, limit: Optional[int], cursor: Optional[str] = None, include_total: bool = False):
     try:
-        cursor = db.database.interviews.find({"user_id": user_id}).sort("created_at", -1)
-        interviews = []
-        async for doc in cursor:
+        page = await paginate(
+            db.database.interviews,
+            tenant_filter({"user_id": user_id}),
+            limit,
+            cursor,
+            projection=INTERVIEW_LIST_PROJECTION,
+            include_total=include_total
+        )
+        for doc in page["items"]:
             doc["id"] = str(doc["_id"])
             del doc["_id"]
-            interviews.append(doc)
-        return interviews
+        return page
+    except HTTPException:
+        raise
     except Exception as e:
         raise Exception(f"Failed to fetch user interviews: {str(e)}")
 
 
-async def get_interview(interview_id: str):
+async def get_interview(interview_id: str, projection: Optional[dict] = None):
     try:
-        interview = await db.database.interviews.find_one({"_id": ObjectId(interview_id)})
+        # Projected reads bypass the request loader, which holds whole documents,
+        # and return archived stubs as they are
+        if projection:
+            interview = await db.database.interviews.find_one({"_id": ObjectId(interview_id)}, projection)
+        else:
+            interview = await read_through("interviews", await load_by_id("interviews", interview_id))
         if interview:
             interview["id"] = str(interview["_id"])
             interview["_id"] = str(interview["_id"])  # Convert ObjectId to string
         return interview
     except Exception as e:
-        raise Exception(f"Failed to fetch interview: {str(e)}")
\ No newline at end of file
+        raise Exception(f"Failed to fetch interview: {str(e)}")
+
+
+async def get_response_status_counts(interview_id: str) -> Optional[dict]:
+    """Count an interview's responses by analysis status without loading them"""
+    try:
+        statuses = {"$map": {
+            "input": {"$filter": {"input": responses_array_expression(), "cond": {"$ne": ["$$this", None]}}},
+            "in": "$$this.analysis_status"
+        }}
+        pipeline = [
+            {"$match": {"_id": ObjectId(interview_id)}},
+            {"$project": {"user_id": 1, "analysis_status": 1, "analyzed_at": 1, "statuses": statuses}},
+            {
+                "$project": {
+                    "user_id": 1,
+                    "analysis_status": 1,
+                    "analyzed_at": 1,
+                    "total": {"$size": "$statuses"},
+                    "pending": {"$size": {"$filter": {
+                        "input": "$statuses", "cond": {"$eq": ["$$this", "pending"]}
+                    }}},
+                    "completed": {"$size": {"$filter": {
+                        "input": "$statuses", "cond": {"$eq": ["$$this", "completed"]}
+                    }}},
+                    "failed": {"$size": {"$filter": {
+                        "input": "$statuses", "cond": {"$in": ["$$this", ["failed", "timeout"]]}
+                    }}}
+                }
+            }
+        ]
+        result = await db.database.interviews.aggregate(pipeline).to_list(length=1)
+        return result[0] if result else None
+    except Exception as e:
+        raise Exception(f"Failed to count interview responses: {str(e)}")
+
+
+def unmigrated_interviews_query() -> dict:
+    """Version 1 interviews still in the hot collection.
+
+    Archived stubs carry no responses; they are converted on read and by a
+    later run once restored, never from the stub itself.
+    """
+    return {"schema_version": {"$ne": INTERVIEW_SCHEMA_VERSION}, ARCHIVED_FIELD: None}
+
+
+async def migrate_responses_batch(database, after_id: Optional[ObjectId], batch_size: int) -> tuple:
+    """Convert the next batch of version 1 interviews to version 2.
+
+    Each document is rewritten by a single pipeline update, so answers
+    submitted concurrently are never lost. Returns the number of documents
+    converted and the last _id examined, or None when no documents remain.
+    """
+    query = unmigrated_interviews_query()
+    if after_id is not None:
+        query["_id"] = {"$gt": after_id}
+
+    batch = await database.interviews.find(query, {"_id": 1}).sort("_id", 1).limit(batch_size) \
+        .to_list(length=batch_size)
+    if not batch:
+        return 0, None
+
+    result = await database.interviews.update_many(
+        {"_id": {"$in": [doc["_id"] for doc in batch]}, **unmigrated_interviews_query()},
+        [{"$set": {"responses": responses_array_expression(), "schema_version": INTERVIEW_SCHEMA_VERSION}}]
+    )
+    return result.modified_count, batch[-1]["_id"]
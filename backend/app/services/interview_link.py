@@ -1,10 +1,39 @@
+import secrets
 from datetime import datetime, timedelta
+from typing import Optional
 from bson import ObjectId
+from fastapi import HTTPException
 from app.db.mongodb import db
+from app.db.loader import load_by_id, forget_loaded
+from app.db.tenancy import bind_tenant, tenant_fields, tenant_filter
+from app.core.pagination import paginate
+from app.core.cache import cache, NegativeCache
+from app.core.config import settings
+from app.core.security import create_interview_link_token, is_signed_interview_link_token, \
+    verify_interview_link_token
 from app.schemas.interview_link import InterviewLinkCreate, InterviewLinkUpdate, PublicInterviewStart, \
     PublicInterviewComplete
 from app.services.openai import generate_questions
+from app.services.interview import INTERVIEW_SCHEMA_VERSION
+from app.services.archive import read_through, discard_archived
+from app.services.link_routes import add_link_route, find_routed_link, remove_link_route
+from app.services.search import SEARCH_FIELDS, search_fields, search_filter, touches_search_fields
 from app.services.email import send_interview_email
+from app.services.daily_stats import record_link_created, record_link_deleted, record_link_position_changed, \
+    record_interview_completed
+from app.services.hr_stats import bump_collection_versions, open_link_counter, monthly_link_counter, \
+    COMPLETED_LINKS_COUNTER
+
+# Tokens recently looked up and not found, so repeated probes skip Mongo
+unknown_link_tokens = NegativeCache(settings.NEGATIVE_TOKEN_CACHE_SIZE, settings.NEGATIVE_TOKEN_CACHE_TTL)
+
+
+class InterviewLinkNotFound(Exception):
+    """Raised when no interview link matches a public token"""
+
+
+class InterviewLinkClosed(Exception):
+    """Raised when a public interview link has expired or was already completed"""
 
 
 async def create_interview_link(link_in: InterviewLinkCreate, hr_id: str):
@@ -12,16 +41,21 @@ async def create_interview_link(link_in: InterviewLinkCreate, hr_id: str):
         # Calculate expiry date
         expires_at = datetime.utcnow() + timedelta(days=link_in.expires_in)
 
-        # Generate unique token
-        import secrets
-        token = secrets.token_urlsafe(16)
+        # Generate unique token; signed tokens embed the link id, so the id is allocated up front
+        link_id = ObjectId()
+        if settings.SIGNED_INTERVIEW_TOKENS:
+            token = create_interview_link_token(str(link_id), expires_at)
+        else:
+            token = secrets.token_urlsafe(16)
 
         link_data = {
+            "_id": link_id,
             "candidate_name": link_in.candidate_name,
             "candidate_email": link_in.candidate_email,
             "position": link_in.position,
             "topic": link_in.topic,
             "hr_id": ObjectId(hr_id),
+            **tenant_fields(),
             "token": token,
             "expires_at": expires_at,
             "completed": False,
@@ -29,10 +63,18 @@ async def create_interview_link(link_in: InterviewLinkCreate, hr_id: str):
             "created_at": datetime.utcnow(),
             "updated_at": datetime.utcnow()
         }
+        link_data.update(search_fields("interview_links", link_data))
 
         result = await db.database.interview_links.insert_one(link_data)
         link_data["id"] = str(result.inserted_id)
         link_data["_id"] = result.inserted_id
+        unknown_link_tokens.discard(token)
+        await add_link_route(token)
+        await bump_collection_versions(hr_id, "interview_links", counters={
+            open_link_counter(expires_at): 1,
+            monthly_link_counter(link_data["created_at"]): 1
+        })
+        await record_link_created(hr_id, link_in.position, link_data["created_at"])
 
         # Add URL to response
         link_data["url"] = f"https://hiresphere-pi.vercel.app/i/{token}"
@@ -51,29 +93,79 @@ async def create_interview_link(link_in: InterviewLinkCreate, hr_id: str):
         raise Exception(f"Failed to create interview link: {str(e)}")
 
 
-async def get_interview_links(hr_id: str):
+# Fields shown in the HR link list; the generated questions and the
+# candidate info of started interviews are left out
+LINK_LIST_PROJECTION = {
+    "candidate_name": 1,
+    "candidate_email": 1,
+    "position": 1,
+    "topic": 1,
+    "token": 1,
+    "expires_at": 1,
+    "completed": 1,
+    "sent_count": 1,
+    "hr_id": 1,
+    "created_at": 1,
+    "updated_at": 1
+}
+
+
+async def get_interview_links(hr_id: str, limit: Optional[int], cursor: Optional[str] = None, include_total: bool = False):
     try:
-        cursor = db.database.interview_links.find({"hr_id": ObjectId(hr_id)}).sort("created_at", -1)
-        links = []
+        page = await paginate(
+            db.database.interview_links,
+            tenant_filter({"hr_id": ObjectId(hr_id)}),
+            limit,
+            cursor,
+            projection=LINK_LIST_PROJECTION,
+            include_total=include_total
+        )
         now = datetime.utcnow()
 
-        async for doc in cursor:
+        for doc in page["items"]:
             # Convert ObjectId to string
             doc["id"] = str(doc["_id"])  # Add string ID for API response
             doc["_id"] = str(doc["_id"])
             doc["hr_id"] = str(doc["hr_id"])
             doc["url"] = f"https://hiresphere-pi.vercel.app/i/{doc['token']}"
             doc["is_expired"] = doc["expires_at"] < now
-            links.append(doc)
 
-        return links
+        return page
+    except HTTPException:
+        raise
     except Exception as e:
         raise Exception(f"Failed to fetch interview links: {str(e)}")
 
 
+async def search_interview_links(hr_id: Optional[str], q: str, mode: str, limit: int, cursor: Optional[str] = None):
+    """Interview links matching `q`, newest first; organization-wide when `hr_id` is None"""
+    try:
+        page = await paginate(
+            db.database.interview_links,
+            search_filter(q, mode, hr_id),
+            limit,
+            cursor,
+            projection=LINK_LIST_PROJECTION
+        )
+        now = datetime.utcnow()
+
+        for doc in page["items"]:
+            doc["id"] = str(doc["_id"])
+            doc["_id"] = str(doc["_id"])
+            doc["hr_id"] = str(doc["hr_id"])
+            doc["url"] = f"https://hiresphere-pi.vercel.app/i/{doc['token']}"
+            doc["is_expired"] = doc["expires_at"] < now
+
+        return page
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise Exception(f"Failed to search interview links: {str(e)}")
+
+
 async def get_interview_link(link_id: str):
     try:
-        link = await db.database.interview_links.find_one({"_id": ObjectId(link_id)})
+        link = await read_through("interview_links", await load_by_id("interview_links", link_id))
         if link:
             link["id"] = str(link["_id"])
             link["url"] = f"https://hiresphere-pi.vercel.app/i/{link['token']}"
@@ -98,6 +190,76 @@ async def get_interview_link_by_token(token: str):
         raise Exception(f"Failed to fetch interview link by token: {str(e)}")
 
 
+def _link_cache_key(token: str) -> str:
+    return f"interview_link:{token}"
+
+
+def _to_link_metadata(link: dict) -> dict:
+    """Reduce a link document to the cacheable fields: immutable ones plus status"""
+    return {
+        "id": str(link["_id"]),
+        "hr_id": str(link["hr_id"]),
+        "organization_id": str(link["organization_id"]) if link.get("organization_id") else None,
+        "candidate_name": link["candidate_name"],
+        "position": link["position"],
+        "topic": link["topic"],
+        "expires_at": link["expires_at"].isoformat(),
+        "completed": link.get("completed", False),
+        "started_at": link["started_at"].isoformat() if link.get("started_at") else None
+    }
+
+
+def _from_link_metadata(metadata: dict) -> dict:
+    link = dict(metadata)
+    link["expires_at"] = datetime.fromisoformat(metadata["expires_at"])
+    if metadata.get("started_at"):
+        link["started_at"] = datetime.fromisoformat(metadata["started_at"])
+    return link
+
+
+async def get_interview_link_metadata(token: str):
+    """Read-through cached lookup of link metadata by token.
+
+    Populating the cache uses SET NX while state transitions overwrite the
+    entry with the post-update document, so a slow reader can never put a
+    stale status back over a newer one.
+    """
+    try:
+        if unknown_link_tokens.contains(token):
+            return None
+        if is_signed_interview_link_token(token) and verify_interview_link_token(token) is None:
+            # Forged: no database can hold it
+            unknown_link_tokens.add(token)
+            return None
+
+        cached = await cache.get(_link_cache_key(token))
+        if cached is not None:
+            return _from_link_metadata(cached)
+
+        projection = {"hr_id": 1, "organization_id": 1, "candidate_name": 1, "position": 1, "topic": 1,
+                      "expires_at": 1, "completed": 1, "started_at": 1}
+        link = await db.execute_with_retry(
+            lambda: db.database.interview_links.find_one({"token": token}, projection)
+        )
+        # Tokens do not name their tenant; links of dedicated tenants are found through their route
+        if not link:
+            link = await find_routed_link(token, projection)
+        if not link:
+            unknown_link_tokens.add(token)
+            return None
+
+        metadata = _to_link_metadata(link)
+        await cache.set(_link_cache_key(token), metadata, expire=settings.LINK_CACHE_TTL, nx=True)
+        return _from_link_metadata(metadata)
+    except Exception as e:
+        raise Exception(f"Failed to fetch interview link metadata: {str(e)}")
+
+
+async def refresh_interview_link_cache(token: str, link: dict):
+    """Overwrite the cached metadata with the state a transition just wrote"""
+    await cache.set(_link_cache_key(token), _to_link_metadata(link), expire=settings.LINK_CACHE_TTL)
+
+
 async def update_interview_link(link_id: str, link_in: InterviewLinkUpdate):
     try:
         update_data = {k: v for k, v in link_in.model_dump().items() if v is not None}
@@ -107,10 +269,54 @@ async def update_interview_link(link_id: str, link_in: InterviewLinkUpdate):
             # No fields to update
             return await get_interview_link(link_id)
 
-        await db.database.interview_links.update_one(
+        # A signed token embeds the expiry, so changing it re-issues the token
+        # and the candidate is sent the new URL below
+        reissued = False
+        if "expires_at" in update_data and settings.SIGNED_INTERVIEW_TOKENS:
+            existing = await db.database.interview_links.find_one({"_id": ObjectId(link_id)}, {"token": 1})
+            if existing and is_signed_interview_link_token(existing["token"]):
+                update_data["token"] = create_interview_link_token(link_id, update_data["expires_at"])
+                reissued = True
+
+        # Renames re-derive the search prefixes from the merged fields
+        if touches_search_fields("interview_links", update_data):
+            current = await db.database.interview_links.find_one(
+                {"_id": ObjectId(link_id)},
+                {field: 1 for field in SEARCH_FIELDS["interview_links"]}
+            ) or {}
+            update_data.update(search_fields("interview_links", {**current, **update_data}))
+
+        link = await db.database.interview_links.find_one_and_update(
             {"_id": ObjectId(link_id)},
-            {"$set": update_data}
+            {"$set": update_data},
+            projection={"hr_id": 1, "token": 1, "expires_at": 1, "completed": 1, "position": 1, "created_at": 1}
         )
+        forget_loaded("interview_links", link_id)
+        if link:
+            # Move an open link to the bucket of its new expiry
+            counters = {}
+            new_expiry = update_data.get("expires_at")
+            if new_expiry and not link.get("completed"):
+                counters[open_link_counter(link["expires_at"])] = -1
+                new_bucket = open_link_counter(new_expiry)
+                counters[new_bucket] = counters.get(new_bucket, 0) + 1
+
+            await cache.delete(_link_cache_key(link["token"]))
+            await bump_collection_versions(str(link["hr_id"]), "interview_links", counters=counters)
+
+            if update_data.get("position", link["position"]) != link["position"]:
+                await record_link_position_changed(
+                    link["hr_id"], link["position"], update_data["position"], link["created_at"],
+                    bool(link.get("completed"))
+                )
+
+            # The emailed URL carries the old token, which no longer matches
+            if reissued:
+                await add_link_route(update_data["token"])
+                await remove_link_route(link["token"])
+            if reissued and not link.get("completed"):
+                unknown_link_tokens.discard(update_data["token"])
+                return await resend_interview_email(link_id)
 
         return await get_interview_link(link_id)
     except Exception as e:
@@ -119,7 +325,26 @@ async def update_interview_link(link_id: str, link_in: InterviewLinkUpdate):
 
 async def delete_interview_link(link_id: str):
     try:
-        await db.database.interview_links.delete_one({"_id": ObjectId(link_id)})
+        link = await db.database.interview_links.find_one_and_delete(
+            {"_id": ObjectId(link_id)},
+            projection={"hr_id": 1, "token": 1, "expires_at": 1, "completed": 1, "created_at": 1, "position": 1,
+                        "archived_at": 1}
+        )
+        forget_loaded("interview_links", link_id)
+        if link:
+            if link.get("archived_at"):
+                await discard_archived("interview_links", link_id)
+            counters = {monthly_link_counter(link["created_at"]): -1}
+            if link.get("completed"):
+                counters[COMPLETED_LINKS_COUNTER] = -1
+            elif link["expires_at"] >= datetime.utcnow():
+                # Expired buckets are pruned by the reconciler
+                counters[open_link_counter(link["expires_at"])] = -1
+
+            await cache.delete(_link_cache_key(link["token"]))
+            await remove_link_route(link["token"])
+            await bump_collection_versions(str(link["hr_id"]), "interview_links", counters=counters)
+            await record_link_deleted(link["hr_id"], link["position"], link["created_at"], bool(link.get("completed")))
         return True
     except Exception as e:
         raise Exception(f"Failed to delete interview link: {str(e)}")
@@ -148,6 +373,8 @@ async def resend_interview_email(link_id: str):
                 "$set": {"updated_at": datetime.utcnow()}
             }
         )
+        forget_loaded("interview_links", link_id)
+        await bump_collection_versions(str(link["hr_id"]), "interview_links")
 
         return await get_interview_link(link_id)
     except Exception as e:
@@ -156,7 +383,7 @@ async def resend_interview_email(link_id: str):
 
 async def validate_interview_link(token: str):
     try:
-        link = await get_interview_link_by_token(token)
+        link = await get_interview_link_metadata(token)
         if not link:
             return None
 
@@ -174,18 +401,36 @@ async def validate_interview_link(token: str):
         raise Exception(f"Failed to validate interview link: {str(e)}")
 
 
+def _open_link_filter(token: str) -> dict:
+    """Matches a link only while it can still be started or completed"""
+    return {"token": token, "completed": {"$ne": True}, "expires_at": {"$gte": datetime.utcnow()}}
+
+
+async def _raise_closed_link(token: str):
+    """Explain why a guarded transition matched nothing; only runs on failure"""
+    link = await db.database.interview_links.find_one({"token": token}, {"completed": 1, "expires_at": 1})
+    if not link:
+        raise InterviewLinkNotFound("Invalid interview link")
+    if link.get("completed"):
+        raise InterviewLinkClosed("This interview has already been completed")
+    raise InterviewLinkClosed("This interview link has expired")
+
+
 async def start_public_interview(token: str, candidate_info: PublicInterviewStart):
     try:
-        # Validate the token
-        link = await get_interview_link_by_token(token)
+        # The cached metadata rejects unknown and closed links before the LLM call
+        link = await get_interview_link_metadata(token)
         if not link:
-            raise Exception("Invalid interview link")
+            raise InterviewLinkNotFound("Invalid interview link")
 
         if link["expires_at"] < datetime.utcnow():
-            raise Exception("This interview link has expired")
+            raise InterviewLinkClosed("This interview link has expired")
 
         if link["completed"]:
-            raise Exception("This interview has already been completed")
+            raise InterviewLinkClosed("This interview has already been completed")
+
+        # Public requests are not authenticated, so the link decides the tenant
+        await bind_tenant(link.get("organization_id"))
 
         # Generate dynamic questions based on the topic and position
         questions = await generate_questions(
@@ -194,9 +439,9 @@ async def start_public_interview(token: str, candidate_info: PublicInterviewStar
             seniority="mid-level"  # This could be made configurable
         )
 
-        # Store the questions in the database for this interview
-        await db.database.interview_links.update_one(
-            {"token": token},
+        # Store the questions, guarded on the link still being open
+        updated_link = await db.database.interview_links.find_one_and_update(
+            _open_link_filter(token),
             {
                 "$set": {
                     "questions": questions,
@@ -207,58 +452,91 @@ async def start_public_interview(token: str, candidate_info: PublicInterviewStar
                     "started_at": datetime.utcnow(),
                     "updated_at": datetime.utcnow()
                 }
-            }
+            },
+            projection={"questions": 0, "candidate_info": 0},
+            return_document=True
         )
+        if not updated_link:
+            await _raise_closed_link(token)
+
+        forget_loaded("interview_links", updated_link["_id"])
+        await refresh_interview_link_cache(token, updated_link)
+        await bump_collection_versions(link["hr_id"], "interview_links")
 
         return {
-            "questions": [q["question"] for q in questions]
+            "questions": [q["question"] if isinstance(q, dict) else q for q in questions]
         }
+    except (InterviewLinkNotFound, InterviewLinkClosed):
+        raise
     except Exception as e:
         raise Exception(f"Failed to start public interview: {str(e)}")
 
 
 async def complete_public_interview(token: str, data: PublicInterviewComplete):
     try:
-        # Validate the token
-        link = await get_interview_link_by_token(token)
+        link = await get_interview_link_metadata(token)
         if not link:
-            raise Exception("Invalid interview link")
+            raise InterviewLinkNotFound("Invalid interview link")
 
         if link["expires_at"] < datetime.utcnow():
-            raise Exception("This interview link has expired")
+            raise InterviewLinkClosed("This interview link has expired")
 
         if link["completed"]:
-            raise Exception("This interview has already been completed")
-
-        # Create an interview record with the responses
-        interview_data = {
-            "link_id": link["_id"],
-            "hr_id": link["hr_id"],
-            "candidate_name": data.candidateInfo["name"],
-            "candidate_email": data.candidateInfo["email"],
-            "position": link["position"],
-            "topic": link["topic"],
-            "questions": link.get("questions", []),
-            "responses": data.responses,
-            "completed_at": datetime.utcnow(),
-            "created_at": link.get("started_at") or datetime.utcnow(),
-            "updated_at": datetime.utcnow()
-        }
-
-        await db.database.interviews.insert_one(interview_data)
-
-        # Mark the link as completed
-        await db.database.interview_links.update_one(
-            {"token": token},
-            {
-                "$set": {
-                    "completed": True,
-                    "completed_at": datetime.utcnow(),
-                    "updated_at": datetime.utcnow()
-                }
+            raise InterviewLinkClosed("This interview has already been completed")
+
+        # Public requests are not authenticated, so the link decides the tenant
+        await bind_tenant(link.get("organization_id"))
+
+        async def complete(session):
+            # Closing the link is the guard: of concurrent completions only one
+            # matches, and the others conflict, retry and find it completed
+            now = datetime.utcnow()
+            updated = await db.database.interview_links.find_one_and_update(
+                _open_link_filter(token),
+                {"$set": {"completed": True, "completed_at": now, "updated_at": now}},
+                projection={"candidate_info": 0},
+                return_document=True,
+                session=session
+            )
+            if not updated:
+                return None
+
+            interview_data = {
+                "link_id": updated["_id"],
+                "hr_id": updated["hr_id"],
+                **({"organization_id": updated["organization_id"]} if updated.get("organization_id") else {}),
+                "candidate_name": data.candidateInfo["name"],
+                "candidate_email": data.candidateInfo["email"],
+                "position": updated["position"],
+                "topic": updated["topic"],
+                "questions": updated.pop("questions", []),
+                "responses": data.responses,
+                "schema_version": INTERVIEW_SCHEMA_VERSION,
+                "completed_at": now,
+                "created_at": updated.get("started_at") or now,
+                "updated_at": now
             }
+            await db.database.interviews.insert_one(interview_data, session=session)
+            return updated, interview_data
+
+        completed = await db.run_in_transaction(complete)
+        if not completed:
+            await _raise_closed_link(token)
+        updated_link, interview_data = completed
+
+        forget_loaded("interview_links", updated_link["_id"])
+        await refresh_interview_link_cache(token, updated_link)
+        await bump_collection_versions(link["hr_id"], "interview_links", "interviews", counters={
+            COMPLETED_LINKS_COUNTER: 1,
+            open_link_counter(updated_link["expires_at"]): -1
+        })
+        await record_interview_completed(
+            link["hr_id"], link["position"], updated_link["created_at"],
+            interview_data["created_at"], interview_data["completed_at"]
         )
 
         return True
+    except (InterviewLinkNotFound, InterviewLinkClosed):
+        raise
     except Exception as e:
-        raise Exception(f"Failed to complete public interview: {str(e)}")
\ No newline at end of file
+        raise Exception(f"Failed to complete public interview: {str(e)}")
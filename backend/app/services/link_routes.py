@@ -0,0 +1,48 @@
+from typing import Optional
+from pymongo import ReplaceOne
+from app.db.mongodb import db, routed_database
+
+# Public link requests only carry a token, which does not name its tenant.
+# Links of tenants on a dedicated database get a {_id: token, database: name}
+# entry in this shared collection, so a token that misses the shared links
+# costs one more read rather than one per dedicated database.
+LINK_ROUTES_COLLECTION = "interview_link_routes"
+
+
+async def add_link_route(token: str):
+    """Route `token` to the database of the current request, if it is a dedicated one"""
+    name = routed_database.get()
+    if name:
+        await db.database[LINK_ROUTES_COLLECTION].replace_one(
+            {"_id": token}, {"_id": token, "database": name}, upsert=True
+        )
+
+
+async def remove_link_route(token: str):
+    if routed_database.get():
+        await db.database[LINK_ROUTES_COLLECTION].delete_one({"_id": token})
+
+
+async def find_routed_link(token: str, projection: Optional[dict] = None) -> Optional[dict]:
+    """The link of `token` in the dedicated database its route names, if any"""
+    route = await db.database[LINK_ROUTES_COLLECTION].find_one({"_id": token})
+    if not route:
+        return None
+    return await db.client[route["database"]].interview_links.find_one({"token": token}, projection)
+
+
+async def route_database_links(shared, dedicated, database_name: str, query: Optional[dict] = None) -> int:
+    """Write the routes of every link in a dedicated database matching `query`"""
+    routed = 0
+    batch = []
+    async for link in dedicated.interview_links.find(query or {}, {"token": 1}):
+        batch.append(ReplaceOne({"_id": link["token"]}, {"_id": link["token"], "database": database_name},
+                                upsert=True))
+        if len(batch) >= 1000:
+            await shared[LINK_ROUTES_COLLECTION].bulk_write(batch, ordered=False)
+            routed += len(batch)
+            batch = []
+    if batch:
+        await shared[LINK_ROUTES_COLLECTION].bulk_write(batch, ordered=False)
+        routed += len(batch)
+    return routed
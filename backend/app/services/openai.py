@@ -1,7 +1,8 @@
 import logging
 import json
-from openai import OpenAI
+from openai import AsyncOpenAI
 from app.core.config import settings
+from app.core.deadline import remaining_seconds
 import re
 from typing import List, Dict, Any
 
@@ -9,8 +10,8 @@ from typing import List, Dict, Any
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Initialize OpenAI client
-client = OpenAI(
+# Initialize OpenAI client; calls are awaited so a cancelled request aborts them
+client = AsyncOpenAI(
     base_url=settings.OPENAI_API_BASE_URL,
     api_key=settings.OPENAI_API_KEY
 )
@@ -77,8 +78,9 @@ Ensure questions are:
 
     try:
         logger.info("Making API call to OpenAI for question generation")
-        response = client.chat.completions.create(
+        response = await client.chat.completions.create(
             model=settings.OPENAI_MODEL_NAME,
+            timeout=remaining_seconds(settings.LLM_REQUEST_TIMEOUT),
             messages=[
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": user_prompt}
@@ -176,8 +178,9 @@ Return the analysis in valid JSON format.
 
     try:
         logger.info("Making API call to OpenAI for response analysis")
-        completion = client.chat.completions.create(
+        completion = await client.chat.completions.create(
             model=settings.OPENAI_MODEL_NAME,
+            timeout=remaining_seconds(settings.LLM_REQUEST_TIMEOUT),
             messages=[
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": user_prompt}
@@ -0,0 +1,121 @@
+import logging
+from datetime import datetime
+from app.db.tenancy import TENANT_COLLECTIONS
+
+logger = logging.getLogger(__name__)
+
+# Field of each tenant collection naming the user that owns a document.
+# Interviews started by the user themselves only carry the user_id string.
+OWNER_EXPRESSIONS = {
+    "candidates": "$hr_id",
+    "interview_links": "$hr_id",
+    "interviews": {"$ifNull": [
+        "$hr_id",
+        {"$convert": {"input": "$user_id", "to": "objectId", "onError": None, "onNull": None}}
+    ]},
+    "subscriptions": "$user_id",
+}
+
+ORGANIZATION_VALIDATOR = {"organization_id": {"$type": "objectId"}}
+
+
+async def backfill_user_organizations(database) -> int:
+    """Give every user an organization: the creator's, or else their own _id"""
+    updated = 0
+    async for user in database.users.find(
+        {"organization_id": None, "created_by": {"$ne": None}}, {"created_by": 1}
+    ):
+        creator = await database.users.find_one({"_id": user["created_by"]}, {"organization_id": 1})
+        if not creator:
+            continue
+        organization_id = creator.get("organization_id") or creator["_id"]
+        result = await database.users.update_one(
+            {"_id": user["_id"], "organization_id": None},
+            {"$set": {"organization_id": organization_id}}
+        )
+        updated += result.modified_count
+
+    result = await database.users.update_many(
+        {"organization_id": None},
+        [{"$set": {"organization_id": "$_id"}}]
+    )
+    updated += result.modified_count
+
+    # Organizations a user belongs to get a document, which later holds their routing
+    async for organization_id in _distinct_cursor(database.users, "organization_id"):
+        await database.organizations.update_one(
+            {"_id": organization_id},
+            {"$setOnInsert": {"created_at": datetime.utcnow()}},
+            upsert=True
+        )
+    return updated
+
+
+async def _distinct_cursor(collection, field: str):
+    cursor = collection.aggregate([
+        {"$match": {field: {"$type": "objectId"}}},
+        {"$group": {"_id": f"${field}"}}
+    ])
+    async for doc in cursor:
+        yield doc["_id"]
+
+
+async def backfill_collection_organizations(database, collection_name: str) -> int:
+    """Copy the owner's organization_id onto the documents of a tenant collection.
+
+    Runs as a single server-side $merge; documents whose owner is gone are
+    left without one and reported by `count_missing_organizations`.
+    """
+    await database[collection_name].aggregate([
+        {"$match": {"organization_id": None}},
+        {"$lookup": {
+            "from": "users",
+            "let": {"owner": OWNER_EXPRESSIONS[collection_name]},
+            "pipeline": [
+                {"$match": {"$expr": {"$eq": ["$_id", "$$owner"]}}},
+                {"$project": {"organization_id": 1}}
+            ],
+            "as": "owner"
+        }},
+        {"$unwind": "$owner"},
+        {"$match": {"owner.organization_id": {"$type": "objectId"}}},
+        {"$project": {"organization_id": "$owner.organization_id"}},
+        {"$merge": {
+            "into": collection_name,
+            "on": "_id",
+            "whenMatched": "merge",
+            "whenNotMatched": "discard"
+        }}
+    ]).to_list(None)
+    return await count_missing_organizations(database, collection_name)
+
+
+async def count_missing_organizations(database, collection_name: str) -> int:
+    return await database[collection_name].count_documents({"organization_id": None})
+
+
+async def set_organization_validators(database, action: str = "warn"):
+    """Require organization_id on tenant collections; "warn" only logs violations"""
+    existing = set(await database.list_collection_names())
+    for collection_name in TENANT_COLLECTIONS:
+        if collection_name not in existing:
+            await database.create_collection(collection_name)
+        await database.command({
+            "collMod": collection_name,
+            "validator": ORGANIZATION_VALIDATOR,
+            "validationLevel": "strict",
+            "validationAction": action
+        })
+
+
+async def backfill_organization_ids(database) -> dict:
+    """Backfill organization_id everywhere; returns the documents still missing one per collection"""
+    users = await backfill_user_organizations(database)
+    logger.info(f"Assigned an organization to {users} user(s)")
+
+    missing = {}
+    for collection_name in TENANT_COLLECTIONS:
+        missing[collection_name] = await backfill_collection_organizations(database, collection_name)
+        if missing[collection_name]:
+            logger.warning(f"{collection_name}: {missing[collection_name]} document(s) without an owner organization")
+    return missing
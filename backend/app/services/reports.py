@@ -1,75 +1,215 @@
+from contextlib import nullcontext
 from datetime import datetime, timedelta
+import pymongo
 from bson import ObjectId
 from app.db.mongodb import db
-from typing import List, Dict, Any
-
-
-async def get_hr_reports(hr_id: str, date_range: str, position: str, status: str):
+from app.db.tenancy import tenant_filter
+from app.core.config import settings
+from app.services.analytics import analytics_collection, DEGRADED_ERRORS
+from app.services.daily_stats import get_daily_stats, merge_daily_stats, merge_positions, score_summary
+from typing import List, Dict, Any, AsyncIterator
+
+# Windows answered from the hr_daily_stats rollup instead of the raw collections
+ROLLUP_WINDOW_DAYS = {"7days": 7, "30days": 30, "90days": 90}
+
+
+def _report_query(hr_id: str, date_range: str, position: str, status: str, now: datetime) -> dict:
+    # Calculate date filter based on date_range
+    date_filter = None
+
+    if date_range == "7days":
+        date_filter = now - timedelta(days=7)
+    elif date_range == "30days":
+        date_filter = now - timedelta(days=30)
+    elif date_range == "90days":
+        date_filter = now - timedelta(days=90)
+
+    # Build query
+    query = tenant_filter({"hr_id": ObjectId(hr_id)})
+
+    if date_filter:
+        query["created_at"] = {"$gte": date_filter}
+
+    if position != "all":
+        query["position"] = position
+
+    if status != "all":
+        if status == "completed":
+            query["completed"] = True
+        elif status == "pending":
+            query["completed"] = False
+            query["expires_at"] = {"$gte": now}
+        elif status == "expired":
+            query["completed"] = False
+            query["expires_at"] = {"$lt": now}
+
+    return query
+
+
+def _report_cursor(query: dict, analytics: bool) -> tuple:
+    """Aggregation cursor over the report rows of `query`, and the time budget to read it under"""
+    # Join each link with its interview in one round trip. The sub-pipeline
+    # runs against the interviews.link_id index and only returns the
+    # fields the report shows
+    pipeline = [
+        {"$match": query},
+        {"$sort": {"created_at": -1}},
+        {
+            "$project": {
+                "candidate_name": 1,
+                "position": 1,
+                "created_at": 1,
+                "completed": 1,
+                "expires_at": 1
+            }
+        },
+        {
+            "$lookup": {
+                "from": "interviews",
+                "localField": "_id",
+                "foreignField": "link_id",
+                "pipeline": [
+                    {"$limit": 1},
+                    {
+                        "$project": {
+                            "_id": 0,
+                            "duration": 1,
+                            "knowledge_score": 1,
+                            "communication_score": 1,
+                            "confidence_score": 1
+                        }
+                    }
+                ],
+                "as": "interview"
+            }
+        }
+    ]
+    if analytics:
+        budget = pymongo.timeout(settings.ANALYTICS_EXPORT_MAX_TIME_MS / 1000)
+        cursor = analytics_collection("interview_links").aggregate(
+            pipeline,
+            allowDiskUse=True,
+            batchSize=settings.ANALYTICS_BATCH_SIZE
+        )
+    else:
+        budget = nullcontext()
+        cursor = db.database.interview_links.aggregate(pipeline, batchSize=1000)
+    return cursor, budget
+
+
+def _format_report(link: dict, now: datetime) -> dict:
+    # Interviews only exist for completed links
+    interview = link["interview"][0] if link.get("completed") and link["interview"] else None
+
+    return {
+        "id": str(link["_id"]),
+        "candidateName": link["candidate_name"],
+        "position": link["position"],
+        "date": link["created_at"],
+        "duration": interview.get("duration") if interview else None,
+        "scores": {
+            "knowledge": interview.get("knowledge_score") if interview else None,
+            "communication": interview.get("communication_score") if interview else None,
+            "confidence": interview.get("confidence_score") if interview else None
+        } if interview else None,
+        "status": "completed" if link.get("completed") else "expired" if link["expires_at"] < now else "pending"
+    }
+
+
+async def get_hr_reports(hr_id: str, date_range: str, position: str, status: str, analytics: bool = False):
+    """Report rows for an HR's links.
+
+    With `analytics` the query uses the analytics read profile and the export
+    time budget; running out of time raises the pymongo error unchanged.
+    """
     try:
-        # Calculate date filter based on date_range
-        date_filter = None
         now = datetime.utcnow()
-
-        if date_range == "7days":
-            date_filter = now - timedelta(days=7)
-        elif date_range == "30days":
-            date_filter = now - timedelta(days=30)
-        elif date_range == "90days":
-            date_filter = now - timedelta(days=90)
-
-        # Build query
-        query = {"hr_id": ObjectId(hr_id)}
-
-        if date_filter:
-            query["created_at"] = {"$gte": date_filter}
-
-        if position != "all":
-            query["position"] = position
-
-        if status != "all":
-            if status == "completed":
-                query["completed"] = True
-            elif status == "pending":
-                query["completed"] = False
-                query["expires_at"] = {"$gte": now}
-            elif status == "expired":
-                query["completed"] = False
-                query["expires_at"] = {"$lt": now}
-
-        # Get interview links
-        cursor = db.database.interview_links.find(query).sort("created_at", -1)
+        cursor, budget = _report_cursor(_report_query(hr_id, date_range, position, status, now), analytics)
         links = []
 
-        async for link in cursor:
-            # For each link, get the associated interview if it exists
-            interview = None
-            if link.get("completed"):
-                interview = await db.database.interviews.find_one({"link_id": link["_id"]})
-
-            # Format the report data
-            report = {
-                "id": str(link["_id"]),
-                "candidateName": link["candidate_name"],
-                "position": link["position"],
-                "date": link["created_at"],
-                "duration": interview.get("duration") if interview else None,
-                "scores": {
-                    "knowledge": interview.get("knowledge_score") if interview else None,
-                    "communication": interview.get("communication_score") if interview else None,
-                    "confidence": interview.get("confidence_score") if interview else None
-                } if interview else None,
-                "status": "completed" if link.get("completed") else "expired" if link["expires_at"] < now else "pending"
-            }
-
-            links.append(report)
+        with budget:
+            async for link in cursor:
+                links.append(_format_report(link, now))
 
         return links
+    except DEGRADED_ERRORS:
+        raise
     except Exception as e:
         raise Exception(f"Failed to fetch HR reports: {str(e)}")
 
 
+async def stream_hr_reports(hr_id: str, date_range: str, position: str, status: str,
+                            analytics: bool = False) -> AsyncIterator[dict]:
+    """Report rows for an HR's links, read from the cursor as they are consumed.
+
+    The first batch is fetched before this returns, so a query that fails or
+    runs out of its time budget raises here, while an error response can
+    still be sent. Only that first batch, which includes the sort, runs under
+    the analytics budget; the rest streams at the consumer's pace.
+    """
+    try:
+        now = datetime.utcnow()
+        cursor, budget = _report_cursor(_report_query(hr_id, date_range, position, status, now), analytics)
+        try:
+            with budget:
+                first = await cursor.__anext__()
+        except StopAsyncIteration:
+            first = None
+    except DEGRADED_ERRORS:
+        raise
+    except Exception as e:
+        raise Exception(f"Failed to fetch HR reports: {str(e)}")
+
+    async def rows():
+        try:
+            if first is None:
+                return
+            yield _format_report(first, now)
+            async for link in cursor:
+                yield _format_report(link, now)
+        finally:
+            await cursor.close()
+
+    return rows()
+
+
+async def get_rollup_report_stats(hr_id: str, date_range: str, position: str, status: str):
+    """Report stats from at most 90 daily rollup documents.
+
+    Only the "all" and "completed" statuses can be answered this way; pending
+    and expired depend on each link's expiry relative to now.
+    """
+    now = datetime.utcnow()
+    days = await get_daily_stats(hr_id, now - timedelta(days=ROLLUP_WINDOW_DAYS[date_range]), now)
+    count_field = "completed_links" if status == "completed" else "links"
+
+    metrics = merge_daily_stats(days, None if position == "all" else position)
+    total_interviews = metrics.get(count_field, 0)
+    completed_interviews = metrics.get("completed_links", 0)
+    scores = score_summary(metrics)
+
+    position_breakdown = [
+        {"position": pos, "count": pos_metrics.get(count_field, 0)}
+        for pos, pos_metrics in merge_positions(days).items()
+        if pos_metrics.get(count_field, 0) > 0 and position in ("all", pos)
+    ]
+
+    return {
+        "totalInterviews": total_interviews,
+        "averageScores": {
+            field: round(scores[field]["avg"] or 0, 1)
+            for field in ("knowledge", "communication", "confidence")
+        },
+        "completionRate": round(completed_interviews / total_interviews * 100, 1) if total_interviews > 0 else 0,
+        "positionBreakdown": position_breakdown
+    }
+
+
 async def get_report_stats(hr_id: str, date_range: str, position: str, status: str):
     try:
+        if date_range in ROLLUP_WINDOW_DAYS and status in ("all", "completed"):
+            return await get_rollup_report_stats(hr_id, date_range, position, status)
+
         # Get the reports first
         reports = await get_hr_reports(hr_id, date_range, position, status)
 
@@ -0,0 +1,112 @@
+import re
+import unicodedata
+from typing import Optional
+from bson import ObjectId
+from fastapi import HTTPException, status
+from pymongo import IndexModel, UpdateOne
+from app.core.config import settings
+from app.db.tenancy import current_organization_id
+
+# Searchable fields per collection. Each word of them is stored in
+# search_prefixes by every prefix (case- and accent-folded) for autocomplete,
+# and the fields themselves are covered by a text index for whole words.
+SEARCH_FIELDS = {
+    "candidates": ("name", "email", "position"),
+    "interview_links": ("candidate_name", "candidate_email", "position"),
+}
+PREFIXES_FIELD = "search_prefixes"
+
+_WORD = re.compile(r"\w+")
+
+
+def normalize(text: str) -> str:
+    """Lowercase `text` and strip its accents, so "Émile" and "emile" match"""
+    decomposed = unicodedata.normalize("NFKD", text or "")
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+
+def search_words(text: str) -> list:
+    # Emails split into their parts: "jo.smith@acme.io" -> jo, smith, acme, io
+    return _WORD.findall(normalize(text))
+
+
+def word_prefixes(word: str) -> list:
+    prefixes = [word[:length] for length in range(1, min(len(word), settings.SEARCH_PREFIX_MAX_LENGTH) + 1)]
+    if len(word) > settings.SEARCH_PREFIX_MAX_LENGTH:
+        prefixes.append(word)
+    return prefixes
+
+
+def search_fields(collection_name: str, doc: dict) -> dict:
+    """The search_prefixes value to store with `doc`"""
+    prefixes = set()
+    for field in SEARCH_FIELDS[collection_name]:
+        for word in search_words(doc.get(field)):
+            prefixes.update(word_prefixes(word))
+    return {PREFIXES_FIELD: sorted(prefixes)}
+
+
+def touches_search_fields(collection_name: str, update_data: dict) -> bool:
+    return any(field in update_data for field in SEARCH_FIELDS[collection_name])
+
+
+def search_filter(q: str, mode: str, hr_id: Optional[str] = None) -> dict:
+    """Filter matching `q` within the current organization, and `hr_id` when given.
+
+    In prefix mode every query word must prefix a word of the document; the
+    equality on search_prefixes keeps the newest-first order index-backed.
+    Text mode matches whole words through the text index.
+    """
+    words = search_words(q)
+    if not words:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Search query must contain a letter or digit"
+        )
+
+    # Both indexes lead with organization_id, so a search never leaves its tenant
+    query = {"organization_id": current_organization_id()}
+    if hr_id:
+        query["hr_id"] = ObjectId(hr_id)
+
+    if mode == "text":
+        query["$text"] = {"$search": " ".join(words)}
+        return query
+
+    terms = []
+    for word in dict.fromkeys(words):
+        if len(word) > settings.SEARCH_PREFIX_MAX_LENGTH:
+            # Long words are only stored whole; the indexed prefix narrows the scan
+            terms.append(word[:settings.SEARCH_PREFIX_MAX_LENGTH])
+            terms.append(re.compile(f"^{re.escape(word)}$"))
+        else:
+            terms.append(word)
+    query[PREFIXES_FIELD] = terms[0] if len(terms) == 1 else {"$all": terms}
+    return query
+
+
+def search_indexes(collection_name: str) -> list:
+    fields = SEARCH_FIELDS[collection_name]
+    return [
+        IndexModel([("organization_id", 1), (PREFIXES_FIELD, 1), ("created_at", -1), ("_id", -1)]),
+        # No stop words or stemming language: names like "Will" or "May" must stay searchable
+        IndexModel([("organization_id", 1), *((field, "text") for field in fields)],
+                   default_language="none", name=f"{collection_name}_search_text"),
+    ]
+
+
+async def backfill_search_prefixes(database, collection_name: str, batch_size: int = 1000) -> int:
+    """Compute search_prefixes for documents written before search existed"""
+    projection = {field: 1 for field in SEARCH_FIELDS[collection_name]}
+    updated = 0
+    batch = []
+    async for doc in database[collection_name].find({PREFIXES_FIELD: {"$exists": False}}, projection):
+        batch.append(UpdateOne({"_id": doc["_id"]}, {"$set": search_fields(collection_name, doc)}))
+        if len(batch) >= batch_size:
+            await database[collection_name].bulk_write(batch, ordered=False)
+            updated += len(batch)
+            batch = []
+    if batch:
+        await database[collection_name].bulk_write(batch, ordered=False)
+        updated += len(batch)
+    return updated
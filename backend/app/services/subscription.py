@@ -1,13 +1,14 @@
 from datetime import datetime, timedelta
 from bson import ObjectId
 from app.db.mongodb import db
+from app.db.tenancy import tenant_fields, tenant_filter
 from app.schemas.subscription import SubscriptionCreate, SubscriptionUpdate, PaymentMethodUpdate
 from app.schemas.subscription import SubscriptionStatus, SubscriptionPlan
 
 
 async def get_user_subscription(user_id: str):
     try:
-        subscription = await db.database.subscriptions.find_one({"user_id": ObjectId(user_id)})
+        subscription = await db.database.subscriptions.find_one(tenant_filter({"user_id": ObjectId(user_id)}))
         if subscription:
             subscription["id"] = str(subscription["_id"])
 
@@ -40,6 +41,7 @@ async def create_subscription(subscription_in: SubscriptionCreate, user_id: str)
 
         subscription_data = {
             "user_id": ObjectId(user_id),
+            **tenant_fields(),
             "plan": subscription_in.plan,
             "status": SubscriptionStatus.ACTIVE,
             "start_date": now,
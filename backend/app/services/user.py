@@ -2,6 +2,7 @@ from typing import Optional
 from datetime import datetime
 from bson import ObjectId
 from app.db.mongodb import db
+from app.db.loader import load_by_id, forget_loaded
 from app.schemas.user import User, UserCreate, UserUpdate
 from app.core.security import get_password_hash
 
@@ -25,13 +26,24 @@ async def create_user(user_in: UserCreate) -> User:
         if existing_user:
             raise ValueError("Email already registered")
 
+        # Every user belongs to an organization: the one given, the creator's,
+        # or a new one of their own whose id is the user's id
+        user_id = ObjectId()
+        organization_id = ObjectId(user_in.organization_id) if user_in.organization_id else None
+        if not organization_id and user_in.created_by:
+            creator = await get_user_by_id(user_in.created_by)
+            if creator:
+                organization_id = ObjectId(creator.organization_id or creator.id)
+        organization_id = organization_id or user_id
+
         # Create user data
         user_data = {
+            "_id": user_id,
             "email": user_in.email,
             "hashed_password": get_password_hash(user_in.password),
             "full_name": user_in.full_name,
             "role": user_in.role,
-            "organization_id": ObjectId(user_in.organization_id) if user_in.organization_id else None,
+            "organization_id": organization_id,
             "created_by": ObjectId(user_in.created_by) if user_in.created_by else None,
             "status": "active",
             "company_name": user_in.company_name,
@@ -40,8 +52,12 @@ async def create_user(user_in: UserCreate) -> User:
         }
 
         # Insert into database
-        result = await db.database.users.insert_one(user_data)
-        user_data["_id"] = result.inserted_id
+        await db.database.users.insert_one(user_data)
+        await db.database.organizations.update_one(
+            {"_id": organization_id},
+            {"$setOnInsert": {"name": user_in.company_name, "created_at": datetime.utcnow()}},
+            upsert=True
+        )
 
         return User.from_db(user_data)
     except Exception as e:
@@ -63,6 +79,7 @@ async def update_user(user_id: str, user_data: dict) -> Optional[User]:
             {"$set": user_data},
             return_document=True
         )
+        forget_loaded("users", user_id)
 
         if result:
             return User.from_db(result)
@@ -74,7 +91,7 @@ async def update_user(user_id: str, user_data: dict) -> Optional[User]:
 async def get_user_by_id(user_id: str) -> Optional[User]:
     """Get a user by their ID."""
     try:
-        user_data = await db.database.users.find_one({"_id": ObjectId(user_id)})
+        user_data = await load_by_id("users", user_id)
         if user_data:
             return User.from_db(user_data)
         return None
@@ -86,6 +103,7 @@ async def delete_user(user_id: str) -> bool:
     """Delete a user."""
     try:
         result = await db.database.users.delete_one({"_id": ObjectId(user_id)})
+        forget_loaded("users", user_id)
         return result.deleted_count > 0
     except Exception as e:
         raise Exception(f"Failed to delete user: {str(e)}")
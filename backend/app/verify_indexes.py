@@ -0,0 +1,35 @@
+"""Fail when a registered query shape is not fully served by an index, in the
+shared or any dedicated tenant database.
+
+Usage: python -m app.verify_indexes
+"""
+import asyncio
+import logging
+import sys
+from app.db.mongodb import MongoDB
+from app.db.tenancy import tenant_databases
+from app.db.query_shapes import verify_query_shapes
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def main() -> int:
+    await MongoDB.connect_to_mongo()
+    try:
+        failures = []
+        for name, database, _ in await tenant_databases():
+            logger.info(f"Explaining query shapes against {name}")
+            failures += await verify_query_shapes(database)
+    finally:
+        await MongoDB.close_mongo_connection()
+
+    if failures:
+        logger.error(f"{len(failures)} query shape(s) need an index")
+        return 1
+    logger.info("All query shapes are served by indexes")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -3,6 +3,10 @@ from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
 from app.db.mongodb import MongoDB
+from app.db.migrations import check_schema_version
+from app.db.loader import DataLoaderMiddleware
+from app.db.profiler import CommandProfilerMiddleware
+from app.core.cache import cache
 from app.routes import auth, interviews, feedback, subscription_plans
 from app.routes.hr import candidates, interview_links, reports, dashboard
 from app.core.config import settings
@@ -37,12 +41,24 @@ async def rate_limit_exceeded_handler(request: Request, exc: RateLimitExceeded)
 async def lifespan(app_instance: FastAPI):  # Fixed: Renamed parameter to avoid shadowing
     # Startup
     logger.info("Connecting to MongoDB...")
-    await MongoDB.connect_to_mongo()
+    await MongoDB.connect_to_mongo(verify=False)
     logger.info("Connected to MongoDB")
 
+    # Migrations run once per deploy (`python -m app.migrate`); workers only compare versions
+    if settings.SCHEMA_CHECK_ON_STARTUP:
+        try:
+            await check_schema_version(MongoDB.database)
+        except Exception as e:
+            logger.warning(f"Schema version check failed: {str(e)}")
+
+    if settings.CACHE_ENABLED:
+        await cache.init_redis()
+
     yield
 
     # Shutdown
+    await cache.close()
+
     logger.info("Closing MongoDB connection...")
     await MongoDB.close_mongo_connection()
     logger.info("MongoDB connection closed")
@@ -65,11 +81,19 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor", "X-Total-Count", "Server-Timing", "X-DB-Commands",
+                    "X-DB-Repeated-Commands"],
 )
 
 # Compression middleware
 app.add_middleware(GZipMiddleware, minimum_size=1000)
 
+# Request-scoped batching of by-id lookups
+app.add_middleware(DataLoaderMiddleware)
+
+# Per-request Mongo command counts, to catch N+1 query loops
+app.add_middleware(CommandProfilerMiddleware)
+
 # Include routers with rate limiting
 app.include_router(
     auth.router,
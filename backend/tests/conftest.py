@@ -0,0 +1,45 @@
+from datetime import datetime
+import pytest
+import mongomock.aggregate
+from bson import Binary, ObjectId
+from mongomock_motor import AsyncMongoMockClient
+from app.db.mongodb import MongoDB, connection_health
+
+
+def _bson_type(value) -> str:
+    for python_type, name in ((bool, "bool"), (int, "int"), (float, "double"), (str, "string"),
+                              (dict, "object"), (list, "array"), (datetime, "date"),
+                              (ObjectId, "objectId"), (bytes, "binData"), (Binary, "binData")):
+        if isinstance(value, python_type):
+            return name
+    return "null" if value is None else type(value).__name__
+
+
+def _handle_type_operator(handle):
+    """mongomock lacks the $type expression, which the rollup rebuild uses"""
+    def handler(self, operator, values):
+        if operator != "$type":
+            return handle(self, operator, values)
+        try:
+            return _bson_type(self.parse(values))
+        except KeyError:
+            return "missing"
+    return handler
+
+
+if "$type" not in mongomock.aggregate.type_operators:
+    mongomock.aggregate.type_operators.append("$type")
+    mongomock.aggregate._Parser._handle_type_operator = _handle_type_operator(
+        mongomock.aggregate._Parser._handle_type_operator
+    )
+
+
+@pytest.fixture
+def database(monkeypatch):
+    """An in-memory shared database behind `db.database`"""
+    client = AsyncMongoMockClient()
+    monkeypatch.setattr(MongoDB, "client", client)
+    monkeypatch.setattr(MongoDB, "shared_database", client["test"])
+    # Skip the ping execute_with_retry sends when no server was seen
+    monkeypatch.setattr(connection_health, "healthy", True)
+    return client["test"]
@@ -0,0 +1,85 @@
+import asyncio
+from datetime import datetime, timedelta
+import pytest
+from bson import ObjectId
+from app.services.archive import ARCHIVED_FIELD, QUESTION_STATS_FIELD, archive_batch, archive_collection_name, \
+    backfill_question_stats, merge_stub, read_through, restore_archived
+
+NOW = datetime(2025, 6, 1)
+
+
+def _old_interview():
+    return {
+        "_id": ObjectId(),
+        "user_id": "u1",
+        "topic": "python",
+        "schema_version": 2,
+        "responses": [
+            {"question": "q1", "response": "a", "analysis": {"knowledge_score": 7}},
+            None,
+            {"question": "q3", "response": ""},
+        ],
+        "analysis_status": "completed",
+        "created_at": NOW - timedelta(days=3650),
+        "updated_at": NOW - timedelta(days=3650),
+    }
+
+
+@pytest.mark.parametrize("compress", [True, False])
+def test_archived_interview_reads_back_whole(database, compress):
+    doc = _old_interview()
+    asyncio.run(database.interviews.insert_one(dict(doc)))
+    assert asyncio.run(archive_batch(database, "interviews", 10, compress=compress, now=NOW)) == 1
+
+    stub = asyncio.run(database.interviews.find_one({"_id": doc["_id"]}))
+    assert "responses" not in stub and "schema_version" not in stub
+    assert asyncio.run(read_through("interviews", stub)) == {**doc, ARCHIVED_FIELD: NOW}
+
+
+def test_stub_fields_win_but_others_cannot_mask_the_archive():
+    archived = _old_interview()
+    stub = {"_id": archived["_id"], "topic": "renamed", "responses": [], "schema_version": 3, ARCHIVED_FIELD: NOW}
+    merged = merge_stub("interviews", archived, stub)
+    assert merged["topic"] == "renamed"
+    assert merged["responses"] == archived["responses"]
+    assert merged["schema_version"] == archived["schema_version"]
+
+
+def test_restore_moves_the_document_back(database):
+    doc = _old_interview()
+    asyncio.run(database.interviews.insert_one(dict(doc)))
+    asyncio.run(archive_batch(database, "interviews", 10, now=NOW))
+
+    assert asyncio.run(restore_archived("interviews", doc["_id"])) == doc
+    assert asyncio.run(database.interviews.find_one({"_id": doc["_id"]})) == doc
+    assert asyncio.run(database[archive_collection_name("interviews")].count_documents({})) == 0
+    assert asyncio.run(restore_archived("interviews", doc["_id"])) is None
+
+
+
+QUESTION_STATS = [
+    {"question": "q1", "analysis": {"knowledge_score": 7}, "answered": True},
+    {"question": "q3", "analysis": {"knowledge_score": None}, "answered": False},
+]
+
+
+def test_stubs_keep_the_question_stats_analytics_read(database):
+    doc = _old_interview()
+    asyncio.run(database.interviews.insert_one(dict(doc)))
+    asyncio.run(archive_batch(database, "interviews", 10, now=NOW))
+
+    stub = asyncio.run(database.interviews.find_one({"_id": doc["_id"]}))
+    assert stub[QUESTION_STATS_FIELD] == QUESTION_STATS
+    # Derived for analytics only: reads and restores return the original document
+    assert QUESTION_STATS_FIELD not in asyncio.run(read_through("interviews", stub))
+
+
+def test_stubs_archived_earlier_get_their_question_stats_backfilled(database):
+    doc = _old_interview()
+    asyncio.run(database.interviews.insert_one(dict(doc)))
+    asyncio.run(archive_batch(database, "interviews", 10, now=NOW))
+    asyncio.run(database.interviews.update_one({"_id": doc["_id"]}, {"$unset": {QUESTION_STATS_FIELD: ""}}))
+
+    assert asyncio.run(backfill_question_stats(database)) == 1
+    stub = asyncio.run(database.interviews.find_one({"_id": doc["_id"]}))
+    assert stub[QUESTION_STATS_FIELD] == QUESTION_STATS
@@ -0,0 +1,85 @@
+import asyncio
+from datetime import datetime, timedelta
+from bson import ObjectId
+from app.services.daily_stats import rebuild_daily_stats, record_interview_analyzed, record_interview_completed, \
+    record_link_created, record_link_deleted, record_link_position_changed
+
+DAY = datetime(2025, 3, 10, 9, 0)
+
+
+def _snapshot(database) -> dict:
+    """The rollup without zero metrics, which only the increments leave behind"""
+    def nonzero(metrics):
+        return {name: value for name, value in metrics.items() if value}
+
+    snapshot = {}
+    for doc in asyncio.run(database.hr_daily_stats.find().to_list(None)):
+        positions = {key: nonzero(metrics) for key, metrics in doc.get("positions", {}).items()}
+        totals = nonzero(doc.get("totals", {}))
+        if totals:
+            snapshot[doc["_id"]] = {"totals": totals, "positions": {k: v for k, v in positions.items() if v}}
+    return snapshot
+
+
+async def _create_link(database, hr_id, position, created_at):
+    link = {"_id": ObjectId(), "hr_id": hr_id, "position": position, "completed": False, "created_at": created_at}
+    await database.interview_links.insert_one(link)
+    await record_link_created(hr_id, position, created_at)
+    return link
+
+
+async def _change_position(database, link, position):
+    await database.interview_links.update_one({"_id": link["_id"]}, {"$set": {"position": position}})
+    await record_link_position_changed(link["hr_id"], link["position"], position, link["created_at"],
+                                       link["completed"])
+    link["position"] = position
+
+
+async def _complete(database, link, started_at, completed_at):
+    await database.interview_links.update_one({"_id": link["_id"]}, {"$set": {"completed": True}})
+    link["completed"] = True
+    interview = {"_id": ObjectId(), "hr_id": link["hr_id"], "position": link["position"],
+                 "created_at": started_at, "completed_at": completed_at}
+    await database.interviews.insert_one(interview)
+    await record_interview_completed(link["hr_id"], link["position"], link["created_at"], started_at, completed_at)
+    return interview
+
+
+async def _analyze(database, interview_id, knowledge, communication, confidence):
+    scores = {"knowledge_score": knowledge, "communication_score": communication, "confidence_score": confidence}
+    previous = await database.interviews.find_one_and_update({"_id": interview_id}, {"$set": scores})
+    await record_interview_analyzed(previous, scores)
+
+
+async def _history(database):
+    hr_id, other_hr = ObjectId(), ObjectId()
+    engineer = await _create_link(database, hr_id, "Engineer", DAY)
+    designer = await _create_link(database, hr_id, "Designer", DAY + timedelta(hours=2))
+    lead = await _create_link(database, hr_id, "Engineer", DAY + timedelta(days=1))
+    other = await _create_link(database, other_hr, "Engineer", DAY)
+
+    # Deleting the document and recording it, as delete_interview_link does
+    await database.interview_links.delete_one({"_id": designer["_id"]})
+    await record_link_deleted(hr_id, designer["position"], designer["created_at"], designer["completed"])
+
+    await _change_position(database, lead, "Eng. Lead $2")
+
+    interview = await _complete(database, engineer, DAY + timedelta(days=2), DAY + timedelta(days=2, minutes=45))
+    await _analyze(database, interview["_id"], 6, 7, 8)
+    # Re-analysis replaces the scores recorded earlier
+    await _analyze(database, interview["_id"], 9, 5, 4)
+    # A completed link moving position takes its completion along
+    await _change_position(database, engineer, "Staff")
+
+    other_interview = await _complete(database, other, DAY, DAY + timedelta(minutes=30))
+    await _analyze(database, other_interview["_id"], 3, 3, 3)
+
+
+def test_incremental_rollup_matches_a_full_rebuild(database):
+    asyncio.run(_history(database))
+    incremental = _snapshot(database)
+    assert incremental
+
+    asyncio.run(database.hr_daily_stats.delete_many({}))
+    asyncio.run(rebuild_daily_stats(database))
+    assert _snapshot(database) == incremental
@@ -0,0 +1,119 @@
+"""`normalize_responses` must agree with `responses_array_expression`.
+
+mongomock cannot run the expression, so it is evaluated here by a small
+interpreter of just the operators it uses, with Mongo's semantics for them.
+"""
+import pytest
+from app.services.interview import normalize_responses, responses_array_expression
+
+MISSING = object()
+
+
+def _path(value, fields):
+    for field in fields:
+        if isinstance(value, list):
+            value = [item.get(field, MISSING) for item in value if isinstance(item, dict)]
+            value = [item for item in value if item is not MISSING]
+        elif isinstance(value, dict):
+            value = value.get(field, MISSING)
+        else:
+            return MISSING
+    return value
+
+
+def _type(value):
+    if value is MISSING:
+        return "missing"
+    if value is None:
+        return "null"
+    if isinstance(value, list):
+        return "array"
+    if isinstance(value, dict):
+        return "object"
+    return type(value).__name__
+
+
+def evaluate(expression, doc, variables=None):
+    variables = variables or {}
+    if isinstance(expression, str) and expression.startswith("$$"):
+        name, *fields = expression[2:].split(".")
+        return _path(variables[name], fields)
+    if isinstance(expression, str) and expression.startswith("$"):
+        return _path(doc, expression[1:].split("."))
+    if isinstance(expression, list):
+        return [evaluate(item, doc, variables) for item in expression]
+    if not isinstance(expression, dict):
+        return expression
+    if not next(iter(expression), "").startswith("$"):
+        return {field: evaluate(item, doc, variables) for field, item in expression.items()}
+
+    (operator, args), = expression.items()
+
+    def value(item, **bound):
+        return evaluate(item, doc, {**variables, **bound})
+
+    if operator == "$switch":
+        for branch in args["branches"]:
+            if value(branch["case"]):
+                return value(branch["then"])
+        return value(args["default"])
+    if operator == "$cond":
+        condition, then, otherwise = args
+        return value(then) if value(condition) else value(otherwise)
+    if operator == "$let":
+        bound = {name: value(item) for name, item in args["vars"].items()}
+        return value(args["in"], **bound)
+    if operator == "$map":
+        name = args.get("as", "this")
+        return [value(args["in"], **{name: item}) for item in value(args["input"])]
+    if operator == "$filter":
+        name = args.get("as", "this")
+        return [item for item in value(args["input"]) if value(args["cond"], **{name: item})]
+    if operator == "$objectToArray":
+        return [{"k": key, "v": item} for key, item in value(args).items()]
+    if operator == "$isArray":
+        return isinstance(value(args), list)
+    if operator == "$type":
+        return _type(value(args))
+    if operator == "$toInt":
+        return int(value(args))
+    if operator == "$size":
+        return len(value(args))
+    if operator == "$first":
+        items = value(args)
+        return items[0] if items else MISSING
+    if operator == "$max":
+        return max(value(args))
+    if operator == "$eq":
+        left, right = value(args)
+        return left == right
+    if operator == "$add":
+        return sum(value(args))
+    if operator == "$range":
+        start, end = value(args)
+        return list(range(start, end))
+    raise NotImplementedError(operator)
+
+
+def _as_stored(result):
+    # A missing $first result is stored as null
+    return [None if item is MISSING else item for item in result]
+
+
+@pytest.mark.parametrize("doc", [
+    {"responses": [{"answer": "a"}, None, {"answer": "c"}]},
+    {"responses": []},
+    {"responses": {"0": {"answer": "a"}, "1": {"answer": "b"}}},
+    {"responses": {"2": {"answer": "c"}, "0": {"answer": "a"}}},
+    {"responses": {"10": {"answer": "k"}, "9": {"answer": "j"}}},
+    {"responses": {}},
+    {"responses": None},
+    {},
+])
+def test_python_and_aggregation_normalization_agree(doc):
+    expected = normalize_responses(doc.get("responses"))
+    assert _as_stored(evaluate(responses_array_expression(), doc)) == expected
+
+
+def test_object_responses_become_an_array_ordered_by_index():
+    assert normalize_responses({"2": "c", "0": "a"}) == ["a", None, "c"]
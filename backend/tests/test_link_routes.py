@@ -0,0 +1,40 @@
+import asyncio
+from datetime import datetime, timedelta
+from bson import ObjectId
+from app.db.mongodb import MongoDB, routed_database
+from app.services.interview_link import get_interview_link_metadata, unknown_link_tokens
+from app.services.link_routes import LINK_ROUTES_COLLECTION, add_link_route, route_database_links
+
+
+def _link(token):
+    return {"_id": ObjectId(), "hr_id": ObjectId(), "organization_id": ObjectId(), "token": token,
+            "candidate_name": "Ada", "position": "Engineer", "topic": "python", "completed": False,
+            "expires_at": datetime.utcnow() + timedelta(days=1), "created_at": datetime.utcnow()}
+
+
+def test_link_in_a_dedicated_database_is_found_through_its_route(database):
+    link = _link("AbCdEfGhIjKlMnOpQrStUa")
+    asyncio.run(MongoDB.client["tenant_a"].interview_links.insert_one(link))
+    asyncio.run(route_database_links(database, MongoDB.client["tenant_a"], "tenant_a"))
+
+    metadata = asyncio.run(get_interview_link_metadata(link["token"]))
+    assert metadata["id"] == str(link["_id"])
+
+
+def test_links_without_a_route_are_not_searched_for(database):
+    token = "AbCdEfGhIjKlMnOpQrStUb"
+    asyncio.run(MongoDB.client["tenant_a"].interview_links.insert_one(_link(token)))
+
+    # Without a route no dedicated database is asked
+    assert asyncio.run(get_interview_link_metadata(token)) is None
+    unknown_link_tokens.discard(token)
+
+
+def test_links_created_in_a_dedicated_request_are_routed(database):
+    token = "AbCdEfGhIjKlMnOpQrStUc"
+    reset = routed_database.set("tenant_b")
+    try:
+        asyncio.run(add_link_route(token))
+    finally:
+        routed_database.reset(reset)
+    assert asyncio.run(database[LINK_ROUTES_COLLECTION].find_one({"_id": token}))["database"] == "tenant_b"
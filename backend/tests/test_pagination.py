@@ -0,0 +1,64 @@
+import asyncio
+from datetime import datetime, timedelta
+import pytest
+from bson import ObjectId
+from fastapi import HTTPException
+from app.core.pagination import decode_cursor, encode_cursor, paginate
+
+
+def test_cursor_round_trip():
+    doc = {"_id": ObjectId(), "created_at": datetime(2024, 5, 17, 9, 30, 12, 345000)}
+    assert decode_cursor(encode_cursor(doc)) == (doc["created_at"], doc["_id"])
+
+
+def test_cursor_truncates_to_stored_millisecond_precision():
+    doc = {"_id": ObjectId(), "created_at": datetime(2024, 5, 17, 9, 30, 12, 345678)}
+    assert decode_cursor(encode_cursor(doc))[0] == datetime(2024, 5, 17, 9, 30, 12, 345000)
+
+
+@pytest.mark.parametrize("cursor", ["", "not a cursor", "MTIzOm5vdC1hbi1pZA", "//"])
+def test_invalid_cursor_is_a_bad_request(cursor):
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(cursor)
+    assert error.value.status_code == 400
+
+
+def _seed(database, count):
+    # Pairs share a timestamp so pages must break ties on _id
+    start = datetime(2024, 1, 1)
+    docs = [{"_id": ObjectId(), "hr_id": 1, "created_at": start + timedelta(seconds=index // 2)}
+            for index in range(count)]
+    asyncio.run(database.candidates.insert_many(docs))
+    return sorted(docs, key=lambda doc: (doc["created_at"], doc["_id"]), reverse=True)
+
+
+def test_pages_follow_their_cursors_without_gaps_or_repeats(database):
+    expected = _seed(database, 7)
+    seen, cursor = [], None
+    while True:
+        page = asyncio.run(paginate(database.candidates, {"hr_id": 1}, 3, cursor, include_total=True))
+        assert page["total"] == 7
+        seen += [doc["_id"] for doc in page["items"]]
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+    assert seen == [doc["_id"] for doc in expected]
+
+
+def test_without_limit_or_cursor_the_whole_list_is_one_page(database):
+    expected = _seed(database, 60)
+    page = asyncio.run(paginate(database.candidates, {"hr_id": 1}, None))
+    assert [doc["_id"] for doc in page["items"]] == [doc["_id"] for doc in expected]
+    assert page["next_cursor"] is None
+
+
+def test_candidate_lists_leave_out_search_prefixes(database):
+    from app.services.candidate import get_candidates
+    hr_id = ObjectId()
+    asyncio.run(database.candidates.insert_one({
+        "hr_id": hr_id, "name": "Ada", "email": "ada@example.com", "position": "Engineer",
+        "search_prefixes": ["a", "ad", "ada"], "created_at": datetime(2024, 1, 1), "updated_at": datetime(2024, 1, 1)
+    }))
+    page = asyncio.run(get_candidates(str(hr_id), None))
+    assert [doc["name"] for doc in page["items"]] == ["Ada"]
+    assert "search_prefixes" not in page["items"][0]
@@ -0,0 +1,66 @@
+import asyncio
+from datetime import datetime, timedelta
+import pytest
+from bson import ObjectId
+from fastapi import HTTPException
+from app.core.security import create_interview_link_token
+from app.db.mongodb import MongoDB
+from app.routes.hr.interview_links import complete_interview
+from app.schemas.interview_link import PublicInterviewComplete
+from app.services import interview_link
+
+
+class Client:
+    host = "203.0.113.9"
+
+
+class Request:
+    client = Client()
+
+
+COMPLETION = PublicInterviewComplete(
+    candidateInfo={"name": "Ada", "email": "ada@example.com"},
+    responses=[{"question": "q1", "response": "a"}]
+)
+
+
+@pytest.fixture
+def open_link(database, monkeypatch):
+    # mongomock has no sessions, so completions take the standalone path
+    monkeypatch.setattr(MongoDB, "_transactions_supported", False)
+    link_id, expires_at = ObjectId(), datetime.utcnow() + timedelta(days=1)
+    token = create_interview_link_token(str(link_id), expires_at)
+    asyncio.run(database.interview_links.insert_one({
+        "_id": link_id, "hr_id": ObjectId(), "organization_id": ObjectId(), "token": token,
+        "candidate_name": "Ada", "position": "Engineer", "topic": "python", "questions": ["q1"],
+        "completed": False, "expires_at": expires_at, "started_at": datetime.utcnow(),
+        "created_at": datetime.utcnow()
+    }))
+    return token
+
+
+def _complete(token):
+    return asyncio.run(complete_interview(Request(), token, COMPLETION))
+
+
+def test_completing_a_link_twice_conflicts(database, open_link):
+    assert _complete(open_link) == {"message": "Interview completed successfully"}
+    with pytest.raises(HTTPException) as error:
+        _complete(open_link)
+    assert error.value.status_code == 409
+    assert asyncio.run(database.interviews.count_documents({})) == 1
+
+
+def test_stale_open_metadata_is_stopped_by_the_guarded_update(database, open_link, monkeypatch):
+    # Both requests read the link while it was open, as a cached entry would serve it
+    stale = asyncio.run(interview_link.get_interview_link_metadata(open_link))
+    _complete(open_link)
+
+    async def stale_metadata(token):
+        return stale
+
+    monkeypatch.setattr(interview_link, "get_interview_link_metadata", stale_metadata)
+    with pytest.raises(HTTPException) as error:
+        _complete(open_link)
+    assert error.value.status_code == 409
+    assert asyncio.run(database.interviews.count_documents({})) == 1
@@ -0,0 +1,29 @@
+import asyncio
+from mongomock_motor import AsyncMongoMockClient
+from app.db.mongodb import GLOBAL_COLLECTIONS, TenantRoutedDatabase
+from app.db.query_shapes import QUERY_SHAPES, explain_query_shape
+
+WINNING_PLAN = {"queryPlanner": {"winningPlan": {"stage": "FETCH", "inputStage": {"stage": "IXSCAN"}}}}
+
+
+def _recording(database, calls, monkeypatch):
+    async def command(spec):
+        calls.append((database.name, spec["explain"]["find"]))
+        return WINNING_PLAN
+    monkeypatch.setattr(database, "command", command)
+
+
+def test_tenant_collections_are_explained_in_the_dedicated_database(monkeypatch):
+    client = AsyncMongoMockClient()
+    shared, dedicated = client["shared"], client["tenant"]
+    calls = []
+    _recording(shared, calls, monkeypatch)
+    _recording(dedicated, calls, monkeypatch)
+
+    routed = TenantRoutedDatabase(shared, dedicated)
+    for shape in QUERY_SHAPES:
+        asyncio.run(explain_query_shape(routed, shape))
+
+    expected = [("shared" if shape["collection"] in GLOBAL_COLLECTIONS else "tenant", shape["collection"])
+                for shape in QUERY_SHAPES]
+    assert calls == expected
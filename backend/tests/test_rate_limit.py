@@ -0,0 +1,44 @@
+import asyncio
+import pytest
+from fastapi import HTTPException
+from app.core.config import settings
+from app.core.rate_limit import PublicTokenShield
+
+
+class Client:
+    def __init__(self, host):
+        self.host = host
+
+
+class Request:
+    def __init__(self, host=None):
+        self.client = Client(host) if host else None
+
+
+def _exhaust(shield, request):
+    while True:
+        try:
+            asyncio.run(shield.check(request))
+        except HTTPException as error:
+            return error.status_code
+
+
+def test_misses_penalize_only_their_client(monkeypatch):
+    monkeypatch.setattr(settings, "PUBLIC_TOKEN_MIN_MISSES", 3)
+    shield = PublicTokenShield(100)
+    bot, candidate = Request("198.51.100.1"), Request("198.51.100.2")
+    for _ in range(3):
+        shield.record(bot, found=False)
+
+    assert _exhaust(shield, bot) == 429
+    assert shield.clients["198.51.100.1"]["requests"] == settings.PUBLIC_TOKEN_PENALTY_PER_MINUTE
+    asyncio.run(shield.check(candidate))
+    assert shield.clients["198.51.100.2"]["penalty_level"] == 0
+
+
+@pytest.mark.parametrize("found", [True, False])
+def test_requests_without_a_client_address_share_a_bucket(found):
+    shield = PublicTokenShield(100)
+    asyncio.run(shield.check(Request()))
+    shield.record(Request(), found=found)
+    assert list(shield.clients) == ["unknown"]
@@ -0,0 +1,68 @@
+from datetime import datetime, timedelta, timezone
+import pytest
+from bson import ObjectId
+from app.core.config import settings
+from app.core.security import _sign_link_token, create_interview_link_token, is_signed_interview_link_token, \
+    verify_interview_link_token
+
+EXPIRES_AT = datetime(2030, 1, 1, 12, 0, 0)
+
+
+@pytest.fixture(autouse=True)
+def token_secret(monkeypatch):
+    monkeypatch.setattr(settings, "INTERVIEW_TOKEN_SECRET", "test-secret")
+
+
+def test_signed_token_round_trip():
+    link_id = str(ObjectId())
+    token = create_interview_link_token(link_id, EXPIRES_AT)
+    assert is_signed_interview_link_token(token)
+    assert verify_interview_link_token(token) == (link_id, EXPIRES_AT)
+
+
+def test_aware_expiry_is_embedded_at_its_utc_instant():
+    link_id = str(ObjectId())
+    aware = EXPIRES_AT.replace(tzinfo=timezone.utc).astimezone(timezone(timedelta(hours=5, minutes=30)))
+    assert verify_interview_link_token(create_interview_link_token(link_id, aware)) == (link_id, EXPIRES_AT)
+
+
+def test_opaque_legacy_token_is_not_signed():
+    assert not is_signed_interview_link_token("AbCdEfGhIjKlMnOpQrStUv")
+
+
+@pytest.mark.parametrize("forge", [
+    lambda link_id, token: token[:-1] + ("A" if token[-1] != "A" else "B"),
+    lambda link_id, token: f"{ObjectId()}.{token.split('.', 1)[1]}",
+    lambda link_id, token: token.replace(f"{int(EXPIRES_AT.replace(tzinfo=timezone.utc).timestamp()):x}", "ffffffff"),
+    lambda link_id, token: f"{link_id}.{token.split('.')[2]}",
+    lambda link_id, token: f"{link_id}.{_sign_link_token(link_id)}",
+    lambda link_id, token: f"{token}.extra",
+    lambda link_id, token: f"{link_id}.zz.{_sign_link_token(f'{link_id}.zz')}",
+    lambda link_id, token: f"not-an-id.1.{_sign_link_token('not-an-id.1')}",
+])
+def test_forged_or_malformed_tokens_are_rejected(forge):
+    link_id = str(ObjectId())
+    assert verify_interview_link_token(forge(link_id, create_interview_link_token(link_id, EXPIRES_AT))) is None
+
+
+def test_tokens_signed_with_another_secret_are_rejected(monkeypatch):
+    token = create_interview_link_token(str(ObjectId()), EXPIRES_AT)
+    monkeypatch.setattr(settings, "INTERVIEW_TOKEN_SECRET", "rotated-secret")
+    assert verify_interview_link_token(token) is None
+
+
+def test_expired_tokens_are_refused_before_any_lookup():
+    from fastapi import HTTPException
+    from app.routes.hr.interview_links import reject_expired_token
+
+    class Client:
+        host = "203.0.113.7"
+
+    class Request:
+        client = Client()
+
+    token = create_interview_link_token(str(ObjectId()), datetime.utcnow() - timedelta(minutes=1))
+    # No database is configured here, so any lookup would fail the test
+    with pytest.raises(HTTPException) as error:
+        reject_expired_token(Request(), token)
+    assert error.value.status_code == 410
@@ -93,8 +93,10 @@ const Dashboard = () => {
     try {
       const data = await interviewApi.getAnalysis(interviewId);
 
-      // Update the selected interview with fresh data
-      setSelectedInterview(data);
+      // Merge the detail fields (feedback, responses) into the selected interview
+      setSelectedInterview((prev) =>
+        prev?.id === interviewId ? { ...prev, ...data } : prev
+      );
 
       // Also update the interview in the list
       setInterviews((prev) =>
@@ -242,7 +244,11 @@ const Dashboard = () => {
                     }`}
                     onClick={() => {
                       setSelectedInterview(interview);
-                      checkAnalysisStatus(interview.id);
+                      // The history list is slim; load feedback and responses
+                      refreshInterviewData(interview.id);
+                      if (interview.analysis_status !== "completed") {
+                        checkAnalysisStatus(interview.id);
+                      }
                     }}
                   >
                     <p className="font-semibold">
@@ -364,8 +370,9 @@ const Dashboard = () => {
                         Individual Responses
                       </h3>
                       <div className="space-y-4">
-                        {Object.entries(selectedInterview.responses).map(
-                          ([index, response]) => (
+                        {Object.entries(selectedInterview.responses)
+                          .filter(([, response]) => response)
+                          .map(([index, response]) => (
                             <div
                               key={index}
                               className="border border-gray-200 rounded-lg p-4"